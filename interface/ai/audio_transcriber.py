@@ -73,7 +73,7 @@ class AudioTranscriber:
 
     def handle_transcription(self, output_file_path):
         print(f"Transcription completed and saved to: {output_file_path}")
-        self.app.update_view()
+        self.app.refresh_entries([output_file_path])
         self.close_msg()
 
     def handle_transcription_error(self, error_message):
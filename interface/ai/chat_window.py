@@ -1,4 +1,3 @@
-import os
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -13,6 +12,7 @@ from interface.ai.computer_agent import ComputerAgent
 from interface.ai.openai_client import OpenAIClient
 from interface.ai.controller_agent_react import ControllerAgent  # Add this import
 from interface.constants import settings
+from interface.search.parallel_walker import ParallelWalker
 
 from typing import TYPE_CHECKING, Dict, List
 
@@ -149,40 +149,35 @@ class ChatWindow(QWidget):
 
         for root_path in self.get_favorite_directories()[::-1]:
             print("ROOT PATH: ", root_path)
-            folder_results = []
-            for root, dirs, _ in os.walk(root_path):
-                # Check if this path or any parent path has been searched
-
+            matches = []
+            # Paths already searched from an earlier favorite are not walked again
+            walker = ParallelWalker(
+                [root_path],
+                should_prune=lambda _, entry: entry.path in searched_paths,
+            )
+            for root, dirs, _ in walker.walk():
                 if root in searched_paths:
-                    # print("SKIPPING: ", root)
                     continue
 
                 searched_paths.add(root)
 
-                for dir_name in dirs:
-                    if search_value.lower() in dir_name.lower() and os.path.isdir(
-                        os.path.join(root, dir_name)
-                    ):
-                        full_path = os.path.join(root, dir_name)
-                        file_info = QFileInfo(full_path)
-                        date_modified = file_info.lastModified().toString(
-                            "yyyy-MM-dd HH:mm:ss"
-                        )
-                        folder_results.append(
-                            {
-                                "name": dir_name,
-                                "path": full_path,
-                                "date_modified": date_modified,
-                            }
-                        )
-
-                        if len(folder_results) >= 10:
-                            break
-
-                if len(folder_results) >= 10:
-                    break
-
-            results.extend(folder_results)
+                for entry in dirs:
+                    if search_value.lower() in entry.name.lower():
+                        matches.append(entry)
+
+            # Directories arrive in the order the walker threads list them,
+            # so the matches are sorted by path before truncating
+            matches.sort(key=lambda entry: entry.path)
+            for entry in matches[: 10 - len(results)]:
+                file_info = QFileInfo(entry.path)
+                date_modified = file_info.lastModified().toString("yyyy-MM-dd HH:mm:ss")
+                results.append(
+                    {
+                        "name": entry.name,
+                        "path": entry.path,
+                        "date_modified": date_modified,
+                    }
+                )
             if len(results) >= 10:
                 break
         return results
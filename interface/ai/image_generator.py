@@ -154,7 +154,7 @@ class ImageGenerator:
             file_path = os.path.join(self.current_path, f"{self.name_input.text()}.png")
             self.generated_image.save(file_path, "PNG")
             print(f"Image saved as: {file_path}")
-            self.app.update_view()  # Refresh the file explorer view
+            self.app.refresh_entries([file_path])  # Refresh the file explorer view
             self.dialog.accept()
 
     def on_dialog_closed(self):
@@ -72,7 +72,7 @@ class SpeechGenerator:
 
     def handle_generated_speech(self, output_path):
         print(f"Speech saved as: {output_path}")
-        self.app.update_view()
+        self.app.refresh_entries([output_path])
         self.generate_button.setEnabled(True)
         self.generate_button.setText("Generate")
         self.dialog.accept()
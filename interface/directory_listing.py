@@ -0,0 +1,122 @@
+import os
+import stat
+import sys
+import time
+from typing import NamedTuple, Sequence
+
+KIND_PARENT = 0
+KIND_DIR = 1
+KIND_FILE = 2
+
+
+class DirectoryEntry(NamedTuple):
+    """One listing row; every column and sort role of the model derives
+    from these fields."""
+
+    name: str
+    mtime: float
+    size: int
+    kind: int
+
+
+def format_mtime(mtime: float) -> str:
+    # Timestamps outside the platform's time_t range (or before 1970 on
+    # Windows) cannot be converted and are shown without a date
+    try:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
+    except (OverflowError, OSError, ValueError):
+        return ""
+
+
+def sorted_rows(kinds: Sequence[int], keys: Sequence, descending: bool) -> list[int]:
+    """Row numbers in display order: ".." first and folders before files in
+    either order, so the rows of each kind are sorted on their own."""
+    rows_by_kind: dict[int, list[int]] = {}
+    for row, kind in enumerate(kinds):
+        rows_by_kind.setdefault(kind, []).append(row)
+    order = []
+    for kind in sorted(rows_by_kind):
+        order += sorted(rows_by_kind[kind], key=keys.__getitem__, reverse=descending)
+    return order
+
+
+def sorts_before(kind: int, key, other_kind: int, other_key, descending: bool) -> bool:
+    # Kinds keep their order when the column is reversed
+    if kind != other_kind:
+        return kind < other_kind
+    return key > other_key if descending else key < other_key
+
+
+class ListingStats:
+    """Counts the filesystem calls made while producing a listing."""
+
+    def __init__(self):
+        self.scandir_calls = 0
+        self.stat_calls = 0
+        self.entries = 0
+
+    def syscalls_per_entry(self) -> float:
+        if not self.entries:
+            return float(self.scandir_calls + self.stat_calls)
+        return (self.scandir_calls + self.stat_calls) / self.entries
+
+    def __str__(self) -> str:
+        return (
+            f"{self.entries} entries, {self.scandir_calls} scandir, "
+            f"{self.stat_calls} stat ({self.syscalls_per_entry():.2f} per entry)"
+        )
+
+
+def is_hidden_entry(entry: os.DirEntry) -> bool:
+    # On Windows the attributes come with the directory listing, so this
+    # stat() does not touch the disk
+    if sys.platform == "win32":
+        return bool(entry.stat().st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+    return entry.name.startswith(".")
+
+
+def make_entry(name: str, entry_stat: os.stat_result) -> DirectoryEntry:
+    return DirectoryEntry(
+        name,
+        entry_stat.st_mtime,
+        entry_stat.st_size,
+        KIND_DIR if stat.S_ISDIR(entry_stat.st_mode) else KIND_FILE,
+    )
+
+
+def read_entry(entry: os.DirEntry, stats: ListingStats) -> DirectoryEntry:
+    # A single (symlink-following) stat provides the kind as well, so
+    # entry.is_dir() is never needed
+    if sys.platform != "win32" or entry.is_symlink():
+        stats.stat_calls += 1
+    stats.entries += 1
+    return make_entry(entry.name, entry.stat())
+
+
+def stat_entry(path: str, name: str, stats: ListingStats) -> DirectoryEntry:
+    stats.stat_calls += 1
+    entry_stat = os.stat(os.path.join(path, name))
+    stats.entries += 1
+    return make_entry(name, entry_stat)
+
+
+def read_directory(
+    path: str, stats: ListingStats, max_entries: int = None
+) -> list[DirectoryEntry]:
+    """Lists a directory the same way the main view does.
+
+    Raises OverflowError when the listing has more than max_entries rows.
+    """
+    rows = []
+    stats.scandir_calls += 1
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if is_hidden_entry(entry):
+                    continue
+                rows.append(read_entry(entry, stats))
+            except OSError:
+                continue
+            if max_entries is not None and len(rows) > max_entries:
+                raise OverflowError(f"{path} has more than {max_entries} entries")
+    return rows
@@ -0,0 +1,145 @@
+import os
+import time
+import uuid
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from interface.constants import settings
+from interface.directory_listing import (
+    DirectoryEntry,
+    ListingStats,
+    is_hidden_entry,
+    read_entry,
+)
+
+
+class DirectoryLoadThread(QThread):
+    rows_loaded = Signal(list, str)
+    load_finished = Signal(int, bool, object, str)
+
+    BATCH_SIZE = 2000
+    BATCH_INTERVAL = 0.1  # seconds, so slow mounts still show progress
+
+    def __init__(self, path: str, load_id: str):
+        super().__init__()
+        self.path = path
+        self.load_id = load_id
+        self.stop_flag = False
+        self.stats = ListingStats()
+
+    def run(self):
+        batch: list[DirectoryEntry] = []
+        count = 0
+        complete = False
+        last_emit = time.monotonic()
+
+        try:
+            self.stats.scandir_calls += 1
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if self.stop_flag:
+                        break
+
+                    try:
+                        if is_hidden_entry(entry):
+                            continue
+                        batch.append(read_entry(entry, self.stats))
+                    except OSError:
+                        # Broken symlinks and vanished entries are skipped,
+                        # like QDir does without the System filter
+                        continue
+
+                    now = time.monotonic()
+                    if (
+                        len(batch) >= self.BATCH_SIZE
+                        or now - last_emit >= self.BATCH_INTERVAL
+                    ):
+                        count += len(batch)
+                        self.rows_loaded.emit(batch, self.load_id)
+                        batch = []
+                        last_emit = now
+                else:
+                    complete = True
+        except OSError as e:
+            print(f"Error listing {self.path}: {str(e)}")
+
+        if batch and not self.stop_flag:
+            count += len(batch)
+            self.rows_loaded.emit(batch, self.load_id)
+
+        self.load_finished.emit(count, complete, self.stats, self.load_id)
+
+    def stop(self):
+        self.stop_flag = True
+
+
+class DirectoryLoader(QObject):
+    rows_loaded = Signal(list)
+    load_finished = Signal(int, bool)  # count, listing is complete
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.load_thread = None
+        self.current_load_id = None
+        self.loading_path = None
+        self.last_stats = None
+        # Cancelled threads are kept alive until they notice the stop flag
+        self.stopping_threads: list[DirectoryLoadThread] = []
+
+    def load(self, path: str):
+        self.cancel()
+        self.loading_path = path
+
+        self.current_load_id = str(uuid.uuid4())
+        self.load_thread = DirectoryLoadThread(path, self.current_load_id)
+        self.load_thread.rows_loaded.connect(self.on_rows_loaded)
+        self.load_thread.load_finished.connect(self.on_load_finished)
+        self.load_thread.start()
+
+    def cancel(self):
+        self.current_load_id = None
+        if self.load_thread is not None:
+            self.load_thread.stop()
+            self.retire_thread(self.load_thread)
+            self.load_thread = None
+
+    def retire_thread(self, load_thread: DirectoryLoadThread):
+        # Threads are kept alive until run() has returned, so they are never
+        # destroyed while still blocked in scandir on a slow mount
+        self.stopping_threads.append(load_thread)
+        load_thread.finished.connect(self.release_finished_threads)
+        if load_thread.isFinished():
+            self.release_finished_threads()
+
+    def release_finished_threads(self):
+        for load_thread in list(self.stopping_threads):
+            if load_thread.isFinished():
+                self.stopping_threads.remove(load_thread)
+                load_thread.deleteLater()
+
+    def shutdown(self):
+        self.cancel()
+        for load_thread in self.stopping_threads:
+            load_thread.wait()
+        self.release_finished_threads()
+
+    def is_loading(self) -> bool:
+        return self.current_load_id is not None
+
+    def on_rows_loaded(self, rows: list, load_id: str):
+        if load_id != self.current_load_id:
+            return  # Ignore batches from cancelled loads
+        self.rows_loaded.emit(rows)
+
+    def on_load_finished(
+        self, count: int, complete: bool, stats: ListingStats, load_id: str
+    ):
+        if load_id != self.current_load_id:
+            return
+        self.last_stats = stats
+        if settings.value("debug_listing_stats", False, type=bool):
+            print(f"Listed {self.loading_path}: {stats}")
+        self.current_load_id = None
+        self.retire_thread(self.load_thread)
+        self.load_thread = None
+        self.load_finished.emit(count, complete)
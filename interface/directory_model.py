@@ -0,0 +1,562 @@
+from array import array
+import math
+import re
+from typing import NamedTuple, Optional
+
+from PySide6.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    QTimer,
+)
+from PySide6.QtGui import QIcon
+
+from interface.constants import settings
+from interface.directory_listing import (
+    DirectoryEntry,
+    KIND_PARENT,
+    KIND_DIR,
+    KIND_FILE,
+    format_mtime,
+    sorted_rows,
+    sorts_before,
+)
+from interface.icon_mapper import IconMapper
+from interface.name_filter import NameFilter
+
+NUMBER_PATTERN = re.compile(r"(\d+)")
+
+
+def natural_sort_key(name: str) -> tuple:
+    # re.split alternates text and digit runs starting with text, so two keys
+    # always compare str with str and int with int ("file2" < "file10")
+    parts = NUMBER_PATTERN.split(name.casefold())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+def get_file_type(name: str, kind: int) -> str:
+    if kind != KIND_FILE:
+        return "File folder"
+    # Same as QFileInfo.suffix(): everything after the last dot
+    return name.rpartition(".")[2] if "." in name else ""
+
+
+class RowMetadata(NamedTuple):
+    # Field order matches the model columns, with the icon in column 0
+    icon: QIcon
+    date_modified: str
+    file_type: str
+    size: str
+
+
+class DirectoryModel(QAbstractTableModel):
+    """Table model for the current directory backed by parallel arrays.
+
+    Only the raw name, mtime, size and kind of each entry are stored; icons
+    and formatted columns are resolved the first time the view asks for a
+    row, and the remaining rows are backfilled from an idle timer.
+
+    Sorting is done here rather than in the proxy: a sort builds one key list
+    from the precomputed name keys and the mtime/size/kind arrays, sorts the
+    row numbers once and permutes the arrays. ".." stays first and folders
+    stay before files in either order. Filtering is done here too,
+    over the precomputed casefolded names; rows the filter rejects are kept
+    aside in hidden_entries until the filter changes.
+    """
+
+    HEADERS = ["Name", "Date Modified", "Type", "Size"]
+
+    BACKFILL_CHUNK = 256
+    # Huge directories only keep metadata for rows that are actually shown
+    BACKFILL_MAX_ROWS = 50000
+
+    # Appends larger than this are re-sorted as a whole instead of inserted
+    # row by row; re-sorts are coalesced while a listing streams in
+    SORTED_INSERT_MAX_ROWS = 16
+    RESORT_DELAY_MS = 300
+    # Measured folder sizes are applied in batches, one pass over the rows each
+    FOLDER_SIZE_DELAY_MS = 100
+
+    def __init__(self, icon_mapper: IconMapper, parent=None):
+        super().__init__(parent)
+        self.icon_mapper = icon_mapper
+        self.names: list[str] = []
+        self.mtimes = array("d")
+        self.sizes = array("q")
+        self.kinds = array("b")
+        self.metadata: list[Optional[RowMetadata]] = []
+        self.folded_names: list[str] = []
+        self.name_keys: list = []
+
+        self.name_filter: Optional[NameFilter] = None
+        self.hidden_entries: list[DirectoryEntry] = []
+
+        # Folder name -> (recursive bytes, item count), filled in as measured
+        self.folder_sizes: dict[str, tuple[int, int]] = {}
+        self.pending_folder_sizes: dict[str, tuple[int, int]] = {}
+        self.folder_size_timer = QTimer(self)
+        self.folder_size_timer.setSingleShot(True)
+        self.folder_size_timer.setInterval(self.FOLDER_SIZE_DELAY_MS)
+        self.folder_size_timer.timeout.connect(self.apply_folder_sizes)
+
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
+        self.natural_sort = settings.value("natural_sort", False, type=bool)
+        self.resort_timer = QTimer(self)
+        self.resort_timer.setSingleShot(True)
+        self.resort_timer.setInterval(self.RESORT_DELAY_MS)
+        self.resort_timer.timeout.connect(self.resort)
+
+        self.backfill_row = 0
+        self.backfill_timer = QTimer(self)
+        self.backfill_timer.setInterval(0)
+        self.backfill_timer.timeout.connect(self.backfill_metadata)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.names[row]
+            return self.get_metadata(row)[column]
+
+        elif role == Qt.DecorationRole and column == 0:
+            return self.get_metadata(row).icon
+
+        elif role == Qt.UserRole:
+            # Sort keys, matching the roles the old QStandardItem rows carried
+            kind = self.kinds[row]
+            if column == 0:
+                return kind
+            if column == 1:
+                return self.mtimes[row]
+            if column == 2:
+                return self.get_metadata(row).file_type.lower()
+            if column == 3:
+                return self.size_key(self.names[row], self.sizes[row], kind)
+
+        elif role == Qt.ToolTipRole and column == 3:
+            folder_size = self.folder_sizes.get(self.names[row])
+            if folder_size is not None and self.kinds[row] == KIND_DIR:
+                return f"{folder_size[1]} items"
+
+        elif role == Qt.UserRole + 1 and column == 0:
+            return self.names[row].lower()
+
+        return None
+
+    def name_key(self, folded_name: str):
+        if self.natural_sort:
+            return natural_sort_key(folded_name)
+        return folded_name
+
+    def set_natural_sort(self, enabled: bool):
+        self.natural_sort = enabled
+        self.name_keys = list(map(self.name_key, self.folded_names))
+        self.resort()
+
+    def set_name_filter(self, name_filter: Optional[NameFilter]):
+        previous_filter = self.name_filter
+        self.name_filter = name_filter
+
+        self.beginResetModel()
+        needs_sort = self.resort_timer.isActive()
+        self.resort_timer.stop()
+        # A refined filter only needs to rescan the rows that are shown now,
+        # and keeping a subset of sorted rows keeps them sorted
+        if name_filter is None or not name_filter.refines(previous_filter):
+            needs_sort = needs_sort or bool(self.hidden_entries)
+            self.extend_rows(self.hidden_entries)
+            self.hidden_entries = []
+
+        if name_filter is not None:
+            mask = name_filter.mask(self.folded_names)
+            rows = self.get_visible_entries()
+            # The ".." row is never filtered out
+            visible = [
+                entry
+                for entry, keep in zip(rows, mask)
+                if keep or entry.kind == KIND_PARENT
+            ]
+            self.hidden_entries.extend(
+                entry
+                for entry, keep in zip(rows, mask)
+                if not keep and entry.kind != KIND_PARENT
+            )
+            if len(visible) != len(rows):
+                self.clear_rows()
+                self.extend_rows(visible)
+
+        if needs_sort:
+            self.permute(self.sorted_order())
+        self.endResetModel()
+        self.schedule_backfill()
+
+    def accepts(self, entry: DirectoryEntry) -> bool:
+        return self.name_filter is None or self.name_filter.matches(
+            entry.name.casefold()
+        )
+
+    def sort_keys(self, column: int) -> list:
+        name_keys = self.name_keys
+        if column == 0:
+            return list(zip(self.kinds, name_keys))
+        if column == 1:
+            return list(zip(self.mtimes, name_keys))
+        if column == 2:
+            type_keys = [
+                get_file_type(name, kind).lower()
+                for name, kind in zip(self.names, self.kinds)
+            ]
+            return list(zip(type_keys, name_keys))
+        if column == 3:
+            size_keys = list(map(self.size_key, self.names, self.sizes, self.kinds))
+            return list(zip(size_keys, name_keys))
+        return []
+
+    def entry_sort_key(self, entry: DirectoryEntry, name_key):
+        # Same keys as sort_keys(), for a single entry
+        column = self.sort_column
+        if column == 0:
+            return (entry.kind, name_key)
+        if column == 1:
+            return (entry.mtime, name_key)
+        if column == 2:
+            return (get_file_type(entry.name, entry.kind).lower(), name_key)
+        if column == 3:
+            return (self.size_key(entry.name, entry.size, entry.kind), name_key)
+        return None
+
+    def size_key(self, name: str, size: int, kind: int) -> int:
+        if kind == KIND_FILE:
+            return size
+        if kind == KIND_DIR and name in self.folder_sizes:
+            return self.folder_sizes[name][0]
+        return -1
+
+    def row_sort_key(self, row: int):
+        entry = DirectoryEntry(
+            self.names[row], self.mtimes[row], self.sizes[row], self.kinds[row]
+        )
+        return self.entry_sort_key(entry, self.name_keys[row])
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.resort()
+
+    def resort(self):
+        self.resort_timer.stop()
+        new_order = self.sorted_order()
+        if new_order:
+            self.apply_order(new_order)
+
+    def sorted_order(self) -> list[int]:
+        keys = self.sort_keys(self.sort_column)
+        if not keys:
+            return []
+        return sorted_rows(self.kinds, keys, self.sort_order == Qt.DescendingOrder)
+
+    def apply_order(self, new_order: list[int]):
+        # new_order[new_row] is the current row that moves to new_row
+        self.layoutAboutToBeChanged.emit()
+
+        new_rows = array("l", bytes(len(new_order) * array("l").itemsize))
+        for new_row, old_row in enumerate(new_order):
+            new_rows[old_row] = new_row
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            old_indexes,
+            [
+                self.index(new_rows[index.row()], index.column())
+                for index in old_indexes
+            ],
+        )
+
+        self.permute(new_order)
+        self.layoutChanged.emit()
+
+    def permute(self, new_order: list[int]):
+        self.names = [self.names[row] for row in new_order]
+        self.folded_names = [self.folded_names[row] for row in new_order]
+        self.name_keys = [self.name_keys[row] for row in new_order]
+        self.metadata = [self.metadata[row] for row in new_order]
+        self.mtimes = array("d", [self.mtimes[row] for row in new_order])
+        self.sizes = array("q", [self.sizes[row] for row in new_order])
+        self.kinds = array("b", [self.kinds[row] for row in new_order])
+        self.backfill_row = 0
+
+    def get_metadata(self, row: int) -> RowMetadata:
+        metadata = self.metadata[row]
+        if metadata is None:
+            metadata = self.resolve_metadata(row)
+            self.metadata[row] = metadata
+        return metadata
+
+    def resolve_metadata(self, row: int) -> RowMetadata:
+        kind = self.kinds[row]
+        icon = self.icon_mapper.get_icon_for_name(self.names[row], kind != KIND_FILE)
+        if kind == KIND_PARENT:
+            return RowMetadata(icon, "", "File folder", "")
+
+        date_modified = format_mtime(self.mtimes[row])
+        size = self.size_key(self.names[row], self.sizes[row], kind)
+        size = "" if size < 0 else f"{math.ceil(size / 1024)} KB"
+        return RowMetadata(icon, date_modified, self.file_type(row), size)
+
+    def schedule_backfill(self, first_row: int = 0):
+        self.backfill_row = min(self.backfill_row, first_row)
+        if not self.backfill_timer.isActive():
+            self.backfill_timer.start()
+
+    def backfill_metadata(self):
+        end_row = min(len(self.names), self.BACKFILL_MAX_ROWS)
+        resolved = 0
+        row = self.backfill_row
+        while row < end_row and resolved < self.BACKFILL_CHUNK:
+            if self.metadata[row] is None:
+                self.metadata[row] = self.resolve_metadata(row)
+                resolved += 1
+            row += 1
+
+        self.backfill_row = row
+        if row >= end_row:
+            self.backfill_timer.stop()
+
+    def file_type(self, row: int) -> str:
+        return get_file_type(self.names[row], self.kinds[row])
+
+    def file_name(self, row: int) -> str:
+        return self.names[row]
+
+    def is_dir(self, row: int) -> bool:
+        return self.kinds[row] != KIND_FILE
+
+    def set_folder_size(self, name: str, total_bytes: int, item_count: int):
+        self.pending_folder_sizes[name] = (total_bytes, item_count)
+        if not self.folder_size_timer.isActive():
+            self.folder_size_timer.start()
+
+    def apply_folder_sizes(self):
+        # One pass over the rows for every size measured since the last one,
+        # instead of a find_row() per folder
+        sizes = self.pending_folder_sizes
+        self.pending_folder_sizes = {}
+        self.folder_sizes.update(sizes)
+        rows = [
+            row
+            for row, name in enumerate(self.names)
+            if name in sizes and self.kinds[row] == KIND_DIR
+        ]
+        if not rows:
+            return
+
+        for row in rows:
+            self.metadata[row] = None
+        self.dataChanged.emit(self.index(rows[0], 3), self.index(rows[-1], 3))
+        if self.sort_column == 3:
+            self.schedule_resort()
+
+    def clear(self, include_parent: bool = False):
+        self.beginResetModel()
+        self.backfill_timer.stop()
+        self.resort_timer.stop()
+        self.backfill_row = 0
+        self.clear_rows()
+        self.hidden_entries = []
+        self.folder_sizes = {}
+        self.folder_size_timer.stop()
+        self.pending_folder_sizes = {}
+        if include_parent:
+            self.extend_rows([DirectoryEntry("..", 0.0, 0, KIND_PARENT)])
+        self.endResetModel()
+
+    def clear_rows(self):
+        self.names = []
+        self.mtimes = array("d")
+        self.sizes = array("q")
+        self.kinds = array("b")
+        self.metadata = []
+        self.folded_names = []
+        self.name_keys = []
+
+    def extend_rows(self, rows: list[DirectoryEntry]):
+        # Appends to the arrays without notifying views
+        if not rows:
+            return
+        names, mtimes, sizes, kinds = zip(*rows)
+        folded_names = [name.casefold() for name in names]
+        self.names.extend(names)
+        self.mtimes.extend(mtimes)
+        self.sizes.extend(sizes)
+        self.kinds.extend(kinds)
+        self.metadata.extend([None] * len(rows))
+        self.folded_names.extend(folded_names)
+        self.name_keys.extend(map(self.name_key, folded_names))
+
+    def append_entries(self, rows: list[DirectoryEntry]):
+        if self.name_filter is not None:
+            self.hidden_entries.extend(
+                entry for entry in rows if not self.accepts(entry)
+            )
+            rows = [entry for entry in rows if self.accepts(entry)]
+
+        if not rows:
+            return
+
+        if len(rows) <= self.SORTED_INSERT_MAX_ROWS:
+            for row in rows:
+                self.insert_entry(row)
+            return
+
+        first = len(self.names)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.extend_rows(rows)
+        self.endInsertRows()
+        self.schedule_backfill(first)
+        self.schedule_resort()
+
+    def schedule_resort(self):
+        if not self.resort_timer.isActive():
+            self.resort_timer.start()
+
+    def insert_entry(self, entry: DirectoryEntry):
+        # Binary search for the sorted position instead of a full re-sort
+        folded_name = entry.name.casefold()
+        name_key = self.name_key(folded_name)
+        key = self.entry_sort_key(entry, name_key)
+        descending = self.sort_order == Qt.DescendingOrder
+
+        low = 0
+        high = len(self.names)
+        while low < high:
+            middle = (low + high) // 2
+            middle_kind = self.kinds[middle]
+            middle_key = None
+            if entry.kind == middle_kind:
+                middle_key = self.row_sort_key(middle)
+            if sorts_before(entry.kind, key, middle_kind, middle_key, descending):
+                high = middle
+            else:
+                low = middle + 1
+
+        self.beginInsertRows(QModelIndex(), low, low)
+        self.names.insert(low, entry.name)
+        self.mtimes.insert(low, entry.mtime)
+        self.sizes.insert(low, entry.size)
+        self.kinds.insert(low, entry.kind)
+        self.metadata.insert(low, None)
+        self.folded_names.insert(low, folded_name)
+        self.name_keys.insert(low, name_key)
+        self.endInsertRows()
+        self.backfill_row = min(self.backfill_row, low)
+
+    def find_row(self, name: str) -> int:
+        # ".." is never a real entry name, so it cannot shadow one
+        try:
+            return self.names.index(name)
+        except ValueError:
+            return -1
+
+    def get_visible_entries(self) -> list[DirectoryEntry]:
+        return list(
+            map(DirectoryEntry, self.names, self.mtimes, self.sizes, self.kinds)
+        )
+
+    def get_entries(self) -> list[DirectoryEntry]:
+        # All entries of the directory, including those hidden by the filter
+        return [
+            entry
+            for entry in self.get_visible_entries()
+            if entry.kind != KIND_PARENT
+        ] + self.hidden_entries
+
+    def get_all_names(self) -> set[str]:
+        names = set(self.names)
+        names.discard("..")
+        names.update(entry.name for entry in self.hidden_entries)
+        return names
+
+    def remove_entries(self, names: set[str]):
+        if not names:
+            return
+
+        if self.hidden_entries:
+            self.hidden_entries = [
+                entry for entry in self.hidden_entries if entry.name not in names
+            ]
+
+        rows = [row for row, name in enumerate(self.names) if name in names]
+        # Remove contiguous runs from the bottom up so earlier rows keep
+        # their positions
+        while rows:
+            last = rows.pop()
+            first = last
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.names[first : last + 1]
+            del self.mtimes[first : last + 1]
+            del self.sizes[first : last + 1]
+            del self.kinds[first : last + 1]
+            del self.metadata[first : last + 1]
+            del self.folded_names[first : last + 1]
+            del self.name_keys[first : last + 1]
+            self.endRemoveRows()
+            self.backfill_row = min(self.backfill_row, first)
+
+    def update_entries(self, rows: list[DirectoryEntry]):
+        if self.hidden_entries:
+            updated = {entry.name: entry for entry in rows}
+            self.hidden_entries = [
+                updated.get(entry.name, entry) for entry in self.hidden_entries
+            ]
+
+        for name, mtime, size, kind in rows:
+            row = self.find_row(name)
+            if row == -1:
+                continue
+            self.mtimes[row] = mtime
+            self.sizes[row] = size
+            self.kinds[row] = kind
+            self.metadata[row] = None
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(row, self.columnCount() - 1)
+            )
+
+        if rows:
+            # Changed mtimes, sizes or kinds can move rows
+            self.schedule_resort()
+
+
+class DirectorySortProxyModel(QSortFilterProxyModel):
+    """Mirrors the order DirectoryModel sorts itself into.
+
+    Header clicks are forwarded to the source model, so the proxy never calls
+    data() per comparison.
+    """
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
@@ -0,0 +1,183 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer
+
+from interface.constants import settings
+from interface.directory_listing import ListingStats, read_directory
+from interface.listing_cache import ListingCache, ROW_OVERHEAD_BYTES
+
+NETWORK_FILESYSTEMS = {
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smbfs",
+    "smb3",
+    "afpfs",
+    "webdav",
+    "davfs",
+    "9p",
+    "fuse.sshfs",
+    "fuse.rclone",
+}
+
+
+def get_mount_table() -> list[tuple[str, str]]:
+    # (mount point, filesystem type) pairs
+    mounts = []
+    if sys.platform == "darwin":
+        try:
+            output = subprocess.run(
+                ["mount"], capture_output=True, text=True, timeout=2
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return mounts
+        # "//user@host/share on /Volumes/share (smbfs, nodev, ...)"
+        for line in output.splitlines():
+            if " on " not in line or " (" not in line:
+                continue
+            mount_point, _, options = line.split(" on ", 1)[1].rpartition(" (")
+            mounts.append((mount_point, options.split(",")[0].strip()))
+    else:
+        try:
+            with open("/proc/mounts", "r") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3:
+                        mount_point = fields[1].replace("\\040", " ")
+                        mounts.append((mount_point, fields[2]))
+        except OSError:
+            pass
+    return mounts
+
+
+class MountTable:
+    """get_mount_table() kept between calls, since reading it means parsing
+    /proc/mounts or running mount, and it is asked on every hover and
+    navigation from the GUI thread. Mounts rarely change, so it is only read
+    again once REFRESH_SECONDS have passed."""
+
+    REFRESH_SECONDS = 30
+
+    def __init__(self):
+        self.mounts: list[tuple[str, str]] = []
+        self.read_at = None
+        self.lock = threading.Lock()
+
+    def get(self) -> list[tuple[str, str]]:
+        with self.lock:
+            now = time.monotonic()
+            if self.read_at is None or now - self.read_at >= self.REFRESH_SECONDS:
+                self.mounts = get_mount_table()
+                self.read_at = now
+            return self.mounts
+
+
+mount_table = MountTable()
+
+
+def is_network_path(path: str) -> bool:
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):
+            return True
+        import win32file
+
+        drive = os.path.splitdrive(path)[0] + "\\"
+        return win32file.GetDriveType(drive) == win32file.DRIVE_REMOTE
+
+    path = os.path.realpath(path)
+    best_match = ""
+    best_type = ""
+    for mount_point, fs_type in mount_table.get():
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            if len(mount_point) > len(best_match):
+                best_match = mount_point
+                best_type = fs_type
+    return best_type in NETWORK_FILESYSTEMS
+
+
+class PrefetchTask(QRunnable):
+    def __init__(self, prefetcher: "DirectoryPrefetcher", path: str, max_entries: int):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.path = path
+        self.max_entries = max_entries
+
+    def run(self):
+        listing_cache = self.prefetcher.listing_cache
+        try:
+            mtime_ns = listing_cache.get_directory_mtime(self.path)
+            if mtime_ns is None or listing_cache.contains(self.path, mtime_ns):
+                return
+            rows = read_directory(self.path, ListingStats(), self.max_entries)
+            listing_cache.put(self.path, mtime_ns, rows)
+        except OverflowError:
+            pass  # Too large to keep around speculatively
+        except OSError as e:
+            print(f"Error prefetching {self.path}: {str(e)}")
+        finally:
+            self.prefetcher.task_done(self.path)
+
+
+class DirectoryPrefetcher(QObject):
+    """Lists the folder under the cursor into the listing cache before it
+    is opened."""
+
+    HOVER_DELAY_MS = 150
+    MAX_CONCURRENT = 2
+
+    def __init__(self, listing_cache: ListingCache, parent=None):
+        super().__init__(parent)
+        self.listing_cache = listing_cache
+        self.candidate_path = None
+        self.pending_paths: set[str] = set()
+
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(self.MAX_CONCURRENT)
+
+        self.delay_timer = QTimer(self)
+        self.delay_timer.setSingleShot(True)
+        self.delay_timer.setInterval(self.HOVER_DELAY_MS)
+        self.delay_timer.timeout.connect(self.prefetch_candidate)
+
+    def max_entries(self) -> int:
+        max_bytes = settings.value("prefetch_max_mb", 32, type=int) * 1024 * 1024
+        return max_bytes // ROW_OVERHEAD_BYTES
+
+    def schedule(self, path: str):
+        if path == self.candidate_path and self.delay_timer.isActive():
+            return
+        self.candidate_path = path
+        self.delay_timer.start()
+
+    def cancel(self):
+        # Running prefetches still finish into the cache
+        self.delay_timer.stop()
+        self.candidate_path = None
+
+    def prefetch_candidate(self):
+        path = self.candidate_path
+        self.candidate_path = None
+        if not path or path in self.pending_paths:
+            return
+        if self.thread_pool.activeThreadCount() >= self.MAX_CONCURRENT:
+            return
+
+        if not settings.value(
+            "prefetch_network_mounts", False, type=bool
+        ) and is_network_path(path):
+            return
+
+        self.pending_paths.add(path)
+        self.thread_pool.start(PrefetchTask(self, path, self.max_entries()))
+
+    def task_done(self, path: str):
+        # Called from the worker thread; set.discard is atomic
+        self.pending_paths.discard(path)
+
+    def shutdown(self):
+        self.cancel()
+        self.thread_pool.waitForDone()
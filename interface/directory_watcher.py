@@ -0,0 +1,172 @@
+import os
+import uuid
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QThread, QTimer, Signal
+
+from interface.constants import settings
+from interface.directory_listing import (
+    DirectoryEntry,
+    ListingStats,
+    is_hidden_entry,
+    stat_entry,
+)
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from interface.file_explorer_ui import FileExplorerUI
+
+
+class DirectorySyncThread(QThread):
+    # removed names, added rows, updated rows, stats, sync_id
+    changes_found = Signal(object, list, list, object, str)
+
+    def __init__(
+        self, path: str, model_names: set[str], touched_names: set[str], sync_id: str
+    ):
+        super().__init__()
+        self.path = path
+        self.model_names = model_names
+        self.touched_names = touched_names
+        self.sync_id = sync_id
+        self.stats = ListingStats()
+
+    def run(self):
+        current_names = set()
+        try:
+            self.stats.scandir_calls += 1
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    try:
+                        if not is_hidden_entry(entry):
+                            current_names.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error listing {self.path}: {str(e)}")
+            return
+
+        model_names = self.model_names
+        removed_names = model_names - current_names
+        added_rows = self.stat_entries(current_names - model_names)
+        updated_rows = self.stat_entries(self.touched_names & model_names)
+        self.changes_found.emit(
+            removed_names, added_rows, updated_rows, self.stats, self.sync_id
+        )
+
+    def stat_entries(self, names: set[str]) -> list[DirectoryEntry]:
+        rows = []
+        for name in names:
+            try:
+                rows.append(stat_entry(self.path, name, self.stats))
+            except OSError:
+                continue
+        return rows
+
+
+class DirectoryWatcher(QObject):
+    """Keeps the directory model in sync with the disk without full reloads.
+
+    Change notifications are coalesced for a short window, then a
+    DirectorySyncThread diffs the directory's names against a copy of the
+    model's and sends back only the row inserts, removals and updates. Only
+    new or explicitly touched entries are stat'ed.
+    """
+
+    COALESCE_INTERVAL_MS = 200
+
+    def __init__(self, app: "FileExplorerUI"):
+        super().__init__(app)
+        self.app = app
+        self.watched_path = None
+        self.touched_names: set[str] = set()
+        self.sync_thread = None
+        self.current_sync_id = None
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(self.COALESCE_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.sync)
+
+    def watch(self, path: str):
+        self.sync_timer.stop()
+        self.touched_names.clear()
+        self.current_sync_id = None
+
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.watched_path = path
+        if not self.watcher.addPath(path):
+            print(f"Unable to watch {path} for changes")
+
+    def on_directory_changed(self, path: str):
+        if path == self.watched_path:
+            self.schedule_sync()
+
+    def schedule_sync(self, file_paths: list[str] = None):
+        for file_path in file_paths or []:
+            directory, name = os.path.split(os.path.normpath(file_path))
+            if directory == self.watched_path:
+                self.touched_names.add(name)
+
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
+
+    def sync(self):
+        path = self.watched_path
+        if path is None:
+            return
+
+        if self.app.directory_loader.is_loading():
+            # The listing in flight will already include the change
+            self.sync_timer.start()
+            return
+        if self.sync_thread and self.sync_thread.isRunning():
+            # Changes the running sync misses are picked up by the next one
+            self.sync_timer.start()
+            return
+
+        touched_names = self.touched_names
+        self.touched_names = set()
+        if self.sync_thread:
+            self.sync_thread.deleteLater()
+        self.current_sync_id = str(uuid.uuid4())
+        # Copying the names is a single pass in C; listing, diffing and
+        # stat'ing happen on the sync thread
+        self.sync_thread = DirectorySyncThread(
+            path, self.app.model.get_all_names(), touched_names, self.current_sync_id
+        )
+        self.sync_thread.changes_found.connect(self.apply_changes)
+        self.sync_thread.start()
+
+    def apply_changes(
+        self,
+        removed_names: set[str],
+        added_rows: list[DirectoryEntry],
+        updated_rows: list[DirectoryEntry],
+        stats: ListingStats,
+        sync_id: str,
+    ):
+        if sync_id != self.current_sync_id:
+            return  # Ignore changes found for a previous listing
+
+        model = self.app.model
+        model.remove_entries(removed_names)
+        model.append_entries(added_rows)
+        model.update_entries(updated_rows)
+
+        if removed_names or added_rows or updated_rows:
+            # The cached rows predate the change; the next visit lists again
+            self.app.listing_cache.invalidate(self.watched_path)
+
+        if settings.value("debug_listing_stats", False, type=bool):
+            print(f"Synced {self.watched_path}: {stats}")
+
+    def shutdown(self):
+        self.sync_timer.stop()
+        self.current_sync_id = None
+        if self.sync_thread:
+            self.sync_thread.wait()
@@ -105,8 +105,7 @@ class FileActionManager:
         proxy_index = tree_view.indexAt(position)
         if proxy_index.isValid():
             source_index = proxy_model.mapToSource(proxy_index)
-            item = model.itemFromIndex(source_index)
-            file_name = item.text()
+            file_name = model.file_name(source_index.row())
             file_path = os.path.join(current_path, file_name)
 
             if file_name == "..":
@@ -134,7 +133,7 @@ class FileActionManager:
             # Add rename action
             rename_action = QAction("Rename", self.app)
             rename_action.triggered.connect(
-                lambda: self.rename_item(item, current_path)
+                lambda: self.rename_item(file_name, current_path)
             )
             context_menu.addAction(rename_action)
 
@@ -207,7 +206,7 @@ class FileActionManager:
     def handle_special_interaction(self, file_path, action):
         result = action(file_path)
         if result is True:
-            self.app.update_view()
+            self.app.refresh_entries([file_path])
 
     def create_new_file(self, current_path):
         file_name, ok = QInputDialog.getText(self.app, "New File", "Enter file name:")
@@ -216,7 +215,7 @@ class FileActionManager:
             try:
                 with open(file_path, "w") as f:
                     pass  # Create an empty file
-                self.app.update_view()
+                self.app.refresh_entries([file_path])
             except Exception as e:
                 QMessageBox.critical(
                     self.app, "Error", f"Failed to create file: {str(e)}"
@@ -230,7 +229,7 @@ class FileActionManager:
             folder_path = os.path.join(current_path, folder_name)
             try:
                 os.mkdir(folder_path)
-                self.app.update_view()
+                self.app.refresh_entries([folder_path])
             except Exception as e:
                 QMessageBox.critical(
                     self.app, "Error", f"Failed to create folder: {str(e)}"
@@ -268,8 +267,7 @@ class FileActionManager:
 
         context_menu.exec(tree_view.viewport().mapToGlobal(position))
 
-    def rename_item(self, item, current_path):
-        old_name = item.text()
+    def rename_item(self, old_name: str, current_path: str):
         new_name, ok = QInputDialog.getText(
             self.app, "Rename", "Enter new name:", text=old_name
         )
@@ -278,7 +276,7 @@ class FileActionManager:
             new_path = os.path.join(current_path, new_name)
             try:
                 os.rename(old_path, new_path)
-                self.app.update_view()  # Add this line to update the view
+                self.app.refresh_entries([old_path, new_path])
                 return True
             except OSError as e:
                 QMessageBox.critical(self.app, "Error", f"Failed to rename: {str(e)}")
@@ -10,8 +10,6 @@ from PySide6.QtWidgets import (
     QFileSystemModel,
 )
 from PySide6.QtGui import (
-    QStandardItemModel,
-    QStandardItem,
     QIcon,
     QDesktopServices,
     QKeySequence,
@@ -24,16 +22,22 @@ from PySide6.QtCore import (
     QDir,
     QUrl,
     QFileInfo,
-    QSortFilterProxyModel,
-    QRegularExpression,
 )
 
 import os
-import math
 
+from interface.constants import settings
+from interface.directory_listing import KIND_DIR
+from interface.directory_loader import DirectoryLoader
+from interface.directory_model import DirectoryModel, DirectorySortProxyModel
+from interface.directory_prefetcher import DirectoryPrefetcher
+from interface.directory_watcher import DirectoryWatcher
 from interface.file_action_manager import FileActionManager
+from interface.folder_size_service import FolderSizeService
 from interface.custom_widgets import NoHighlightDelegate
 from interface.icon_mapper import IconMapper
+from interface.listing_cache import ListingCache
+from interface.name_filter import compile_name_filter
 from interface.navigation_manager import NavigationManager
 from interface.favorites_manager import FavoritesManager
 from interface.system_menu_manager import SystemMenuManager
@@ -41,6 +45,8 @@ from interface.toolbar_manager import ToolbarManager  # Add this import
 from interface.ai.image_generator import ImageGenerator
 from interface.window.history_window import HistoryWindow
 from interface.window.search_window import SearchWindow
+from interface.window.duplicates_window import DuplicatesWindow
+from interface.window.quick_open_window import QuickOpenWindow
 from interface.ai.chat_window import ChatWindow
 
 
@@ -69,8 +75,8 @@ class FileExplorerUI(QMainWindow):
         self.toolbar_manager.filter_changed.connect(self.apply_filter)
         self.init_interface()
 
-        self.model = QStandardItemModel()
-        self.proxy_model = QSortFilterProxyModel(self)
+        self.model = DirectoryModel(self.icon_mapper, self)
+        self.proxy_model = DirectorySortProxyModel(self)
         self.proxy_model.setSourceModel(self.model)
         self.tree_view.setModel(self.proxy_model)
 
@@ -78,6 +84,25 @@ class FileExplorerUI(QMainWindow):
         self.tree_view.sortByColumn(0, Qt.AscendingOrder)
         self.proxy_model.setSortRole(Qt.UserRole)
 
+        self.listing_cache = ListingCache(
+            settings.value("listing_cache_max_entries", 32, type=int),
+            settings.value("listing_cache_max_mb", 256, type=int) * 1024 * 1024,
+        )
+        self.directory_loader = DirectoryLoader(self)
+        self.directory_loader.rows_loaded.connect(self.on_rows_loaded)
+        self.directory_loader.load_finished.connect(self.on_load_finished)
+        self.directory_watcher = DirectoryWatcher(self)
+
+        # Prefetch the folder under the cursor or selection into the cache
+        self.directory_prefetcher = DirectoryPrefetcher(self.listing_cache, self)
+        self.tree_view.setMouseTracking(True)
+        self.tree_view.entered.connect(self.prefetch_index)
+        self.tree_view.selectionModel().currentChanged.connect(self.prefetch_index)
+
+        # Recursive folder sizes fill the Size column as they are measured
+        self.folder_size_service = FolderSizeService(self)
+        self.folder_size_service.size_measured.connect(self.on_folder_size_measured)
+
         self.update_view()
 
         self.clipboard = []
@@ -85,6 +110,8 @@ class FileExplorerUI(QMainWindow):
 
         self.history_window = None
         self.search_window = None
+        self.duplicates_window = None
+        self.quick_open_window = None
         self.chat_window = None
 
     def init_interface(self):
@@ -156,9 +183,9 @@ class FileExplorerUI(QMainWindow):
         for index in self.tree_view.selectedIndexes():
             if index.column() == 0:  # Only process the first column
                 source_index = self.proxy_model.mapToSource(index)
-                item = self.model.itemFromIndex(source_index)
-                if item:
-                    file_path = os.path.join(self.current_path, item.text())
+                if source_index.isValid():
+                    file_name = self.model.file_name(source_index.row())
+                    file_path = os.path.join(self.current_path, file_name)
                     self.clipboard.append(file_path)
                 else:
                     print(
@@ -190,7 +217,7 @@ class FileExplorerUI(QMainWindow):
         )
 
         if files_copied:
-            self.update_view()
+            self.refresh_entries(files_copied)
             if self.file_action_manager.cut_mode:
                 self.clipboard.clear()  # Clear the clipboard after cutting and pasting
                 self.file_action_manager.cut_mode = False
@@ -202,24 +229,31 @@ class FileExplorerUI(QMainWindow):
             return
 
         # Get unique rows (files/folders) to delete
-        rows_to_delete = set(index.row() for index in selected_indexes)
-        items_to_delete = [self.model.item(row, 0).text() for row in rows_to_delete]
+        rows_to_delete = set(
+            self.proxy_model.mapToSource(index).row() for index in selected_indexes
+        )
+        items_to_delete = [self.model.file_name(row) for row in rows_to_delete]
 
         files_deleted = self.file_action_manager.delete_files(
             items_to_delete, self.current_path
         )
 
         if files_deleted:
-            self.update_view()
+            self.refresh_entries(files_deleted)
 
     def update_view(self):
+        # Drop any listing still streaming in for the previous directory
+        self.directory_loader.cancel()
+        self.directory_prefetcher.cancel()
+        self.folder_size_service.cancel()
+
         # Save current column sizes
         column_sizes = [
             self.tree_view.columnWidth(i) for i in range(self.model.columnCount())
         ]
 
-        self.model.clear()
-        self.model.setHorizontalHeaderLabels(["Name", "Date Modified", "Type", "Size"])
+        # ".." is added only if there's a parent directory
+        self.model.clear(self.navigation_manager.can_go_up())
 
         # Set a larger default width for the Name column
         self.tree_view.setColumnWidth(0, 300)  # Adjust this value as needed
@@ -230,6 +264,7 @@ class FileExplorerUI(QMainWindow):
 
         self.current_path = self.navigation_manager.current_path
         self.toolbar_manager.update_address_bar(self.current_path)
+        self.directory_watcher.watch(self.current_path)
 
         self.load_directory_contents()
 
@@ -237,76 +272,70 @@ class FileExplorerUI(QMainWindow):
 
         self.proxy_model.sort(0, Qt.AscendingOrder)
 
+    def refresh_view(self):
+        self.listing_cache.invalidate(self.navigation_manager.current_path)
+        self.folder_size_service.invalidate(self.navigation_manager.current_path)
+        self.update_view()
+
+    def refresh_entries(self, file_paths: list[str] = None):
+        # Applies changes made to the current directory as row updates
+        # instead of reloading the whole listing
+        self.directory_watcher.schedule_sync(file_paths)
+
     def load_directory_contents(self):
-        directory = QDir(self.current_path)
-        folders = []
-        files = []
-
-        for file_info in directory.entryInfoList():
-            if file_info.fileName() in (".", ".."):
-                continue
-
-            size_kb = math.ceil(file_info.size() / 1024)
-            size_str = f"{size_kb} KB" if file_info.isFile() else ""
-            item_data = [
-                file_info.fileName(),
-                file_info.lastModified().toString("yyyy-MM-dd HH:mm:ss"),
-                "File folder" if file_info.isDir() else file_info.suffix(),
-                size_str,
-                file_info.isDir(),
-            ]
-
-            if file_info.isDir():
-                folders.append(item_data)
-            else:
-                files.append(item_data)
-
-        # Add ".." only if there's a parent directory
-        if self.navigation_manager.can_go_up():
-            parent_data = ["..", "", "File folder", "", True]
-            self.add_file_item(parent_data, True, is_parent=True)
-
-        # Process folders
-        for folder in folders:
-            self.add_file_item(folder, True)
-
-        # Process files
-        for file in files:
-            self.add_file_item(file, False)
-
-    def add_file_item(self, file_data, is_dir, is_parent=False):
-        name, date, file_type, size, _ = file_data
-        name_item = QStandardItem(name)
-        name_item.setIcon(
-            self.icon_mapper.get_icon(os.path.join(self.current_path, name))
-        )
-        name_item = QStandardItem(name)
-        name_item.setIcon(
-            self.icon_mapper.get_icon(os.path.join(self.current_path, name))
-        )
-        # Set custom sort role data
-        name_item.setData(0 if is_parent else (1 if is_dir else 2), Qt.UserRole)
-        name_item.setData(name.lower(), Qt.UserRole + 1)
+        self.loaded_rows = []
+        self.loading_mtime = self.listing_cache.get_directory_mtime(self.current_path)
+
+        cached_rows = self.listing_cache.get(self.current_path, self.loading_mtime)
+        if cached_rows is not None:
+            self.model.append_entries(cached_rows)
+            self.statusBar().showMessage(f"{len(cached_rows)} items")
+            self.measure_folder_sizes(cached_rows)
+            return
 
-        date_item = QStandardItem(date)
-        date_item.setData(
-            QFileInfo(os.path.join(self.current_path, name)).lastModified(), Qt.UserRole
-        )
+        self.statusBar().showMessage("Loading...")
+        self.directory_loader.load(self.current_path)
+
+    def on_rows_loaded(self, rows: list):
+        self.model.append_entries(rows)
+        self.loaded_rows.extend(rows)
+        self.statusBar().showMessage(f"Loading {len(self.loaded_rows)} items…")
 
-        type_item = QStandardItem(file_type)
-        type_item.setData(file_type.lower(), Qt.UserRole)
+    def on_load_finished(self, count: int, complete: bool):
+        if complete:
+            self.listing_cache.put(
+                self.current_path, self.loading_mtime, self.loaded_rows
+            )
+            self.measure_folder_sizes(self.loaded_rows)
+        self.loaded_rows = []
+        self.statusBar().showMessage(f"{count} items")
 
-        size_item = QStandardItem(size)
-        size_item.setData(int(size.split()[0]) if size else -1, Qt.UserRole)
+    def measure_folder_sizes(self, rows: list):
+        folder_names = [entry.name for entry in rows if entry.kind == KIND_DIR]
+        self.folder_size_service.measure(self.current_path, folder_names)
 
-        self.model.appendRow([name_item, date_item, type_item, size_item])
+    def on_folder_size_measured(self, path: str, total_bytes: int, item_count: int):
+        directory, name = os.path.split(path)
+        if directory == self.current_path:
+            self.model.set_folder_size(name, total_bytes, item_count)
+
+    def prefetch_index(self, index):
+        source_index = self.proxy_model.mapToSource(index)
+        if not source_index.isValid():
+            return
+
+        row = source_index.row()
+        file_name = self.model.file_name(row)
+        if self.model.is_dir(row) and file_name != "..":
+            self.directory_prefetcher.schedule(
+                os.path.normpath(os.path.join(self.current_path, file_name))
+            )
 
     def on_item_activated(self, index):
         # Convert the proxy model index to the source model index
         source_index = self.proxy_model.mapToSource(index)
-        item = self.model.itemFromIndex(source_index)
-        if item:
-            file_name = item.text()
+        if source_index.isValid():
+            file_name = self.model.file_name(source_index.row())
             if file_name == "..":
                 self.navigation_manager.go_up()
             else:
@@ -386,13 +415,8 @@ class FileExplorerUI(QMainWindow):
             )
 
     def apply_filter(self, filter_text):
-        # Create a case-insensitive regular expression
-        regex = QRegularExpression(
-            QRegularExpression.escape(filter_text),
-            QRegularExpression.CaseInsensitiveOption,
-        )
-        self.proxy_model.setFilterRegularExpression(regex)
-        self.proxy_model.setFilterKeyColumn(0)  # Filter on the first column (Name)
+        # Filtering runs in the model over precomputed casefolded names
+        self.model.set_name_filter(compile_name_filter(filter_text))
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key.Key_Backspace:
@@ -405,15 +429,20 @@ class FileExplorerUI(QMainWindow):
         selected_indexes = self.tree_view.selectedIndexes()
         if selected_indexes:
             source_index = self.proxy_model.mapToSource(selected_indexes[0])
-            item = self.model.itemFromIndex(source_index)
-            if item:
-                self.file_action_manager.rename_item(item, self.current_path)
+            if source_index.isValid():
+                file_name = self.model.file_name(source_index.row())
+                self.file_action_manager.rename_item(file_name, self.current_path)
 
     def update_history_window(self):
         if self.history_window and self.history_window.isVisible():
             self.history_window.update_history()
 
     def closeEvent(self, event: QCloseEvent):
+        self.directory_loader.shutdown()
+        self.directory_watcher.shutdown()
+        self.directory_prefetcher.shutdown()
+        self.folder_size_service.shutdown()
+
         # Close the history window if it's open
         if self.history_window and self.history_window.isVisible():
             self.history_window.close()
@@ -423,6 +452,13 @@ class FileExplorerUI(QMainWindow):
             self.search_window.close()
             self.search_window = None
 
+        if self.duplicates_window:
+            self.duplicates_window.close()
+            self.duplicates_window = None
+
+        if self.quick_open_window:
+            self.quick_open_window.shutdown()
+
         # Call the parent class's closeEvent
         super().closeEvent(event)
 
@@ -433,5 +469,19 @@ class FileExplorerUI(QMainWindow):
         self.search_window.show()
         self.search_window.activateWindow()
 
+    def show_duplicates_window(self):
+        if not self.duplicates_window:
+            self.duplicates_window = DuplicatesWindow(self)
+        # A search that is still running keeps its folder
+        if not self.duplicates_window.finder_thread:
+            self.duplicates_window.set_path_input(self.current_path)
+        self.duplicates_window.show()
+        self.duplicates_window.activateWindow()
+
+    def show_quick_open(self):
+        if not self.quick_open_window:
+            self.quick_open_window = QuickOpenWindow(self)
+        self.quick_open_window.show()
+
     def get_favorite_directories(self):
         return self.favorites_manager.get_favorite_directories()
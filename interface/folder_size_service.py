@@ -0,0 +1,93 @@
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QStandardPaths, QThreadPool, Signal
+
+from interface.constants import settings
+from interface.directory_prefetcher import is_network_path
+from interface.folder_size_store import FolderSizeStore, measure_folder
+
+
+class FolderSizeTask(QRunnable):
+    def __init__(self, service: "FolderSizeService", path: str, generation: int):
+        super().__init__()
+        self.service = service
+        self.path = path
+        self.generation = generation
+
+    def run(self):
+        # Folders that are mount points of another device are not measured
+        try:
+            device = os.stat(os.path.dirname(self.path)).st_dev
+        except OSError:
+            return
+        result = measure_folder(
+            self.service.store,
+            self.path,
+            lambda: self.service.generation != self.generation,
+            device,
+        )
+        if result is not None:
+            self.service.size_measured.emit(self.path, result[0], result[1])
+
+
+class StaleFolderSizesTask(QRunnable):
+    def __init__(self, store: FolderSizeStore, directory: str):
+        super().__init__()
+        self.store = store
+        self.directory = directory
+
+    def run(self):
+        self.store.remove_missing_children(self.directory)
+
+
+class FolderSizeService(QObject):
+    """Computes recursive folder sizes and item counts in the background.
+
+    Results are emitted one folder at a time as (path, bytes, items) and
+    persisted through FolderSizeStore, so re-opening a tree only walks the
+    directories that changed since.
+    """
+
+    size_measured = Signal(str, int, int)
+
+    MAX_CONCURRENT = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        os.makedirs(data_dir, exist_ok=True)
+        self.store = FolderSizeStore(os.path.join(data_dir, "folder_sizes.db"))
+
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(self.MAX_CONCURRENT)
+
+    def measure(self, directory: str, folder_names: list[str]):
+        self.cancel()
+        if not settings.value("folder_sizes_enabled", True, type=bool):
+            return
+        if not settings.value(
+            "folder_sizes_network_mounts", False, type=bool
+        ) and is_network_path(directory):
+            return
+
+        # Rows of folders deleted since the last visit would never be read
+        self.thread_pool.start(StaleFolderSizesTask(self.store, directory))
+        for name in folder_names:
+            self.thread_pool.start(
+                FolderSizeTask(self, os.path.join(directory, name), self.generation)
+            )
+
+    def invalidate(self, directory: str):
+        self.store.invalidate_tree(directory)
+
+    def cancel(self):
+        # Queued tasks are dropped and running ones stop at their next directory
+        self.generation += 1
+        self.thread_pool.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self.thread_pool.waitForDone()
+        self.store.close()
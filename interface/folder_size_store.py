@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+from typing import Callable, NamedTuple, Optional
+
+
+class DirectoryTotals(NamedTuple):
+    """Sizes of the files directly inside one directory, plus the names of
+    its subdirectories, valid for as long as the directory mtime is."""
+
+    mtime_ns: int
+    file_bytes: int
+    file_count: int
+    subdirs: tuple[str, ...]
+
+
+class FolderSizeStore:
+    """Persists per-directory totals in SQLite, keyed by path and mtime.
+
+    Only the files directly inside a directory are summed per row, so a
+    folder's recursive size is rebuilt from its subtree's rows. A subtree
+    whose directories still have the same mtimes is then re-measured with
+    one stat per directory instead of a scandir and a stat per file. Rows
+    of directories that disappeared are dropped as their parents are
+    measured again.
+    """
+
+    def __init__(self, db_path: str):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS directory_totals ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+            "file_bytes INTEGER NOT NULL, file_count INTEGER NOT NULL, "
+            "subdirs TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, path: str, mtime_ns: int) -> Optional[DirectoryTotals]:
+        totals = self.lookup(path)
+        if totals is None or totals.mtime_ns != mtime_ns:
+            return None
+        return totals
+
+    def lookup(self, path: str) -> Optional[DirectoryTotals]:
+        # The stored totals of path, whatever its mtime is now
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime_ns, file_bytes, file_count, subdirs "
+                "FROM directory_totals WHERE path = ?",
+                (path,),
+            ).fetchone()
+        if row is None:
+            return None
+        subdirs = tuple(row[3].split("\n")) if row[3] else ()
+        return DirectoryTotals(row[0], row[1], row[2], subdirs)
+
+    def put_many(self, rows: list[tuple[str, DirectoryTotals]]):
+        if not rows:
+            return
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO directory_totals VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        path,
+                        totals.mtime_ns,
+                        totals.file_bytes,
+                        totals.file_count,
+                        "\n".join(totals.subdirs),
+                    )
+                    for path, totals in rows
+                ],
+            )
+            self.connection.commit()
+
+    def invalidate_tree(self, path: str):
+        # File edits do not change directory mtimes, so a refresh drops the
+        # whole subtree instead of trusting it
+        self.remove_trees([path])
+
+    def remove_trees(self, paths: list[str]):
+        if not paths:
+            return
+        with self.lock:
+            for path in paths:
+                # Every path below path sorts from "path/" up to "path0"
+                prefix = path.rstrip(os.sep)
+                self.connection.execute(
+                    "DELETE FROM directory_totals WHERE path = ? "
+                    "OR (path >= ? AND path < ?)",
+                    (path, prefix + os.sep, prefix + chr(ord(os.sep) + 1)),
+                )
+            self.connection.commit()
+
+    def remove_missing_children(self, path: str):
+        """Drops the rows of directories right below path that no longer
+        exist, with their subtrees."""
+        prefix = path.rstrip(os.sep)
+        start = len(prefix) + 2
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT path FROM directory_totals WHERE path >= ? AND path < ? "
+                "AND instr(substr(path, ?), ?) = 0",
+                (prefix + os.sep, prefix + chr(ord(os.sep) + 1), start, os.sep),
+            ).fetchall()
+        self.remove_trees([row[0] for row in rows if not os.path.isdir(row[0])])
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def scan_directory_totals(path: str, mtime_ns: int) -> DirectoryTotals:
+    file_bytes = 0
+    file_count = 0
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                # Symlinked directories are counted as links, not followed
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                else:
+                    file_bytes += entry.stat(follow_symlinks=False).st_size
+                    file_count += 1
+            except OSError:
+                continue
+    return DirectoryTotals(mtime_ns, file_bytes, file_count, tuple(subdirs))
+
+
+def measure_folder(
+    store: FolderSizeStore,
+    path: str,
+    should_stop: Callable[[], bool] = lambda: False,
+    device: Optional[int] = None,
+) -> Optional[tuple[int, int]]:
+    """Returns (total bytes, item count) of the tree under path, or None if
+    should_stop() turned true before the walk finished.
+
+    Directories on another device than device, by default the one path is
+    on, are neither counted nor descended into, so network shares and
+    /proc mounted below path are never walked. None is returned if path
+    itself is on another device.
+    """
+    try:
+        path_stat = os.stat(path)
+    except OSError:
+        return None
+    if device is None:
+        device = path_stat.st_dev
+    elif path_stat.st_dev != device:
+        return None
+
+    total_bytes = 0
+    total_items = 0
+    scanned = []
+    removed = []
+    pending = [path]
+    while pending:
+        if should_stop():
+            store.put_many(scanned)
+            store.remove_trees(removed)
+            return None
+
+        directory = pending.pop()
+        try:
+            directory_stat = os.stat(directory)
+            if directory_stat.st_dev != device:
+                continue
+            known = store.lookup(directory)
+            totals = known
+            if known is None or known.mtime_ns != directory_stat.st_mtime_ns:
+                totals = scan_directory_totals(directory, directory_stat.st_mtime_ns)
+                scanned.append((directory, totals))
+                if known is not None:
+                    removed.extend(
+                        os.path.join(directory, name)
+                        for name in set(known.subdirs) - set(totals.subdirs)
+                    )
+        except OSError:
+            continue
+
+        total_bytes += totals.file_bytes
+        total_items += totals.file_count + len(totals.subdirs)
+        pending.extend(os.path.join(directory, name) for name in totals.subdirs)
+
+    store.put_many(scanned)
+    store.remove_trees(removed)
+    return total_bytes, total_items
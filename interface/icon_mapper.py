@@ -55,11 +55,24 @@ class IconMapper:
             os.path.join(self.base_dir, "icons", "unknown_file.png")
         )
 
+        # Extension -> icon, filled as extensions are first seen
+        self.extension_icons: dict[str, QIcon] = {}
+
     def get_icon(self, file_path: str):
-        if os.path.isdir(file_path):
+        return self.get_icon_for_name(file_path, os.path.isdir(file_path))
+
+    def get_icon_for_name(self, file_name: str, is_dir: bool):
+        if is_dir:
             return self.folder_icon
 
-        file_extension = os.path.splitext(file_path)[1].lower()
+        file_extension = os.path.splitext(file_name)[1].lower()
+        icon = self.extension_icons.get(file_extension)
+        if icon is None:
+            icon = self.get_extension_icon(file_extension)
+            self.extension_icons[file_extension] = icon
+        return icon
+
+    def get_extension_icon(self, file_extension: str):
         if file_extension in [".txt", ".log", ".md"]:
             return self.text_file_icon
         elif file_extension in [".json"]:
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Rough per-row cost of a (name, mtime, size, kind) tuple on top of the name
+ROW_OVERHEAD_BYTES = 160
+
+
+class ListingCache:
+    """LRU cache of parsed directory listings, validated by directory mtime.
+
+    Safe to use from prefetch threads as well as the GUI thread. The limits
+    come from the listing_cache_max_entries and listing_cache_max_mb
+    settings, read by the caller so this module stays free of Qt.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # path -> (mtime_ns, rows, estimated size in bytes)
+        self.listings: OrderedDict[str, tuple[int, list, int]] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_directory_mtime(self, path: str):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, path: str, mtime_ns: int):
+        with self.lock:
+            cached = self.listings.get(path)
+            if cached is None or mtime_ns is None or cached[0] != mtime_ns:
+                if cached is not None:
+                    self.remove(path)
+                self.misses += 1
+                return None
+
+            self.listings.move_to_end(path)
+            self.hits += 1
+            return cached[1]
+
+    def contains(self, path: str, mtime_ns: int) -> bool:
+        # Unlike get(), this does not count as a hit or miss
+        with self.lock:
+            cached = self.listings.get(path)
+            return cached is not None and cached[0] == mtime_ns
+
+    def put(self, path: str, mtime_ns: int, rows: list):
+        if mtime_ns is None:
+            return
+
+        size = self.estimate_size(rows)
+        with self.lock:
+            self.remove(path)
+            if size > self.max_bytes:
+                return
+
+            self.listings[path] = (mtime_ns, rows, size)
+            self.total_bytes += size
+            self.evict()
+
+    def snapshot(self) -> list[tuple[str, list]]:
+        """(path, rows) of every cached listing, most recently used first."""
+        with self.lock:
+            return [
+                (path, cached[1]) for path, cached in reversed(self.listings.items())
+            ]
+
+    def invalidate(self, path: str):
+        with self.lock:
+            self.remove(path)
+
+    def remove(self, path: str):
+        cached = self.listings.pop(path, None)
+        if cached is not None:
+            self.total_bytes -= cached[2]
+
+    def clear(self):
+        with self.lock:
+            self.listings.clear()
+            self.total_bytes = 0
+
+    def evict(self):
+        while self.listings and (
+            len(self.listings) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self.listings.popitem(last=False)
+            self.total_bytes -= size
+
+    def estimate_size(self, rows: list) -> int:
+        size = sys.getsizeof(rows) + ROW_OVERHEAD_BYTES * len(rows)
+        for row in rows:
+            size += len(row[0])
+        return size
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.listings),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,68 @@
+import fnmatch
+import re
+from typing import Optional
+
+GLOB_CHARACTERS = set("*?[")
+REGEX_PREFIX = "re:"
+
+
+class NameFilter:
+    """A compiled filter-bar expression, matched against casefolded names.
+
+    Plain text matches as a substring, text containing * ? or [ as a glob
+    over the whole name, and text starting with "re:" as a regular
+    expression.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pattern = None
+        self.needle = None
+
+        if text.startswith(REGEX_PREFIX):
+            self.mode = "regex"
+            self.pattern = re.compile(text[len(REGEX_PREFIX) :], re.IGNORECASE)
+        elif GLOB_CHARACTERS & set(text):
+            self.mode = "glob"
+            self.pattern = re.compile(fnmatch.translate(text.casefold()))
+        else:
+            self.mode = "substring"
+            self.needle = text.casefold()
+
+    def matches(self, folded_name: str) -> bool:
+        if self.needle is not None:
+            return self.needle in folded_name
+        if self.mode == "glob":
+            return self.pattern.match(folded_name) is not None
+        return self.pattern.search(folded_name) is not None
+
+    def mask(self, folded_names: list[str]) -> list[bool]:
+        if self.needle is not None:
+            needle = self.needle
+            return [needle in name for name in folded_names]
+        if self.mode == "glob":
+            matches = map(self.pattern.match, folded_names)
+        else:
+            matches = map(self.pattern.search, folded_names)
+        return [match is not None for match in matches]
+
+    def refines(self, previous: Optional["NameFilter"]) -> bool:
+        """True if every name this filter accepts was accepted by previous,
+        so only the previous matches need to be rescanned."""
+        if previous is None:
+            return True
+        if self.mode != previous.mode:
+            return False
+        if self.mode == "substring":
+            return previous.needle in self.needle
+        return self.text == previous.text
+
+
+def compile_name_filter(text: str) -> Optional[NameFilter]:
+    if not text:
+        return None
+    try:
+        return NameFilter(text)
+    except re.error as e:
+        print(f"Invalid filter expression {text!r}: {str(e)}")
+        return None
@@ -0,0 +1,611 @@
+import itertools
+import multiprocessing
+import os
+from functools import partial
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from interface.search.content_scanner import SNIFF_BYTES, START_METHOD
+from interface.search.filename_index import subtree_range
+from interface.search.parallel_walker import ParallelWalker
+
+# Larger files are not indexed and always handed to the scanner
+MAX_INDEXED_FILE_SIZE = 4 * 1024 * 1024
+
+# files.state
+TEXT = 0
+UNINDEXED = 1
+BINARY = 2
+
+# Bumped whenever the tables change; older indexes are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+
+class ContentIndexStats:
+    def __init__(self):
+        self.files = 0
+        self.indexed_files = 0
+        self.removed_files = 0
+        self.bytes_indexed = 0
+        self.seconds = 0.0
+        self.index_bytes = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files ({self.indexed_files} indexed, "
+            f"{self.removed_files} removed), {self.bytes_indexed / 1024**2:.1f} MB "
+            f"read in {self.seconds:.1f}s, index is "
+            f"{self.index_bytes / 1024**2:.1f} MB"
+        )
+
+
+def query_trigrams(text: str) -> list[int]:
+    # Lowered like the indexed bytes; bytes.lower() only folds ASCII, just
+    # like the scanner's case-insensitive bytes pattern
+    data = text.encode("utf-8").lower()
+    return sorted(
+        {int.from_bytes(data[i : i + 3], "big") for i in range(len(data) - 2)}
+    )
+
+
+def extract_trigrams(
+    path: str, max_size: int = MAX_INDEXED_FILE_SIZE
+) -> tuple[int, int, int, set[bytes]]:
+    """Returns (mtime_ns, size, state, distinct trigrams) of path."""
+    try:
+        with open(path, "rb") as f:
+            file_stat = os.fstat(f.fileno())
+            data = b""
+            if file_stat.st_size <= max_size:
+                data = f.read(max_size + 1)
+    except OSError:
+        return 0, 0, UNINDEXED, set()
+
+    state = None
+    if b"\0" in data[:SNIFF_BYTES]:
+        state = BINARY
+    elif file_stat.st_size > max_size or len(data) > max_size:
+        state = UNINDEXED
+    if state is not None:
+        return file_stat.st_mtime_ns, file_stat.st_size, state, set()
+    data = data.lower()
+    trigrams = {data[i : i + 3] for i in range(len(data) - 2)}
+    return file_stat.st_mtime_ns, file_stat.st_size, TEXT, trigrams
+
+
+def encode_ordinals(ordinals: list[int]) -> bytes:
+    # Ascending numbers as varint deltas; dense lists take a byte apiece
+    data = bytearray()
+    previous = 0
+    for ordinal in ordinals:
+        delta = ordinal - previous
+        previous = ordinal
+        while delta >= 0x80:
+            data.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return bytes(data)
+
+
+def decode_ordinals(data: bytes) -> list[int]:
+    if max(data, default=0) < 0x80:
+        # Every delta fits in one byte, so a running sum in C decodes them
+        return list(itertools.accumulate(data))
+    ordinals = []
+    previous = 0
+    delta = 0
+    shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            previous += delta
+            ordinals.append(previous)
+            delta = 0
+            shift = 0
+    return ordinals
+
+
+def index_chunk(
+    paths: list[str], max_size: int = MAX_INDEXED_FILE_SIZE
+) -> tuple[list[tuple], list[tuple[int, bytes]]]:
+    """Runs in the indexer's worker processes. Returns a (path, mtime_ns,
+    size, state) row per path, in order, and the chunk's postings: every
+    trigram with the encoded ordinals of the rows that contain it, sorted
+    by trigram."""
+    rows = []
+    postings: dict[bytes, list[int]] = {}
+    for ordinal, path in enumerate(paths):
+        mtime_ns, size, state, trigrams = extract_trigrams(path, max_size)
+        rows.append((path, mtime_ns, size, state))
+        for trigram in trigrams:
+            ordinals = postings.get(trigram)
+            if ordinals is None:
+                postings[trigram] = [ordinal]
+            else:
+                ordinals.append(ordinal)
+    return rows, [
+        (int.from_bytes(trigram, "big"), encode_ordinals(ordinals))
+        for trigram, ordinals in sorted(postings.items())
+    ]
+
+
+class ContentIndex:
+    """Persistent trigram index of the text files under a set of roots.
+
+    Every distinct three-byte sequence of a file's lowered bytes is posted
+    against the file, so a content query only has to scan the files that
+    contain all of its trigrams. Updates compare each file's mtime and size
+    with the indexed ones and only read files that changed. Files too large
+    to index stay candidates for every query; binary files are never
+    candidates, since the scanner skips them too.
+
+    Files are read in chunks by worker processes, and each chunk becomes a
+    segment: one row per trigram holding the varint deltas of the ordinals
+    of the chunk's files that contain it, so SQLite stores a few bytes per
+    posting instead of a row. File ids are the segment's base plus the
+    ordinal. Removing a file only deletes its files row; its postings are
+    skipped by queries and dropped when its segment is merged, which
+    happens once small segments pile up or half of a segment's files are
+    gone.
+
+    Directory mtimes are stored too, so stale_files() can tell files added
+    since the last update by listing only directories that changed.
+
+    Like FilenameIndex, each thread gets its own connection.
+    """
+
+    MAX_QUERY_TRIGRAMS = 64
+    # Candidates are verified by the scanner, so narrowing stops here
+    ENOUGH_CANDIDATES = 32
+    CHUNK_FILES = 1000
+    # More segments of fewer files than a chunk than this are merged
+    MAX_SMALL_SEGMENTS = 8
+    COMMIT_INTERVAL = 200_000  # Posting rows
+
+    def __init__(
+        self,
+        db_path: str,
+        processes: int = None,
+        max_file_size: int = MAX_INDEXED_FILE_SIZE,
+    ):
+        self.db_path = db_path
+        self.processes = processes or os.cpu_count() or 1
+        self.max_file_size = max_file_size
+        self.local = threading.local()
+        self.create_tables()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def create_tables(self):
+        connection = self.connection
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            # Only a cache of the files on disk, so it is simply rebuilt
+            connection.executescript(
+                """
+                DROP TABLE IF EXISTS roots;
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS segments;
+                DROP TABLE IF EXISTS directories;
+                """
+            )
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS roots (
+                path TEXT PRIMARY KEY, indexed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                state INTEGER NOT NULL,
+                segment INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_segment ON files (segment);
+            CREATE INDEX IF NOT EXISTS files_unindexed ON files (path)
+                WHERE state = 1;
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                base INTEGER NOT NULL,
+                files INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                trigram INTEGER NOT NULL,
+                segment INTEGER NOT NULL,
+                ordinals BLOB NOT NULL,
+                PRIMARY KEY (trigram, segment)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_segment ON postings (segment);
+            """
+        )
+        connection.commit()
+
+    def close(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def get_roots(self) -> list[str]:
+        rows = self.connection.execute("SELECT path FROM roots ORDER BY path")
+        return [row[0] for row in rows]
+
+    def find_root(self, path: str) -> Optional[str]:
+        path = os.path.normpath(path)
+        for root in self.get_roots():
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def size_on_disk(self) -> int:
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(self.db_path + suffix)
+            except OSError:
+                pass
+        return size
+
+    def update(
+        self,
+        root: str,
+        should_stop: Callable[[], bool] = lambda: False,
+        stats: Optional[ContentIndexStats] = None,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+    ) -> bool:
+        """Brings the index of root up to date. Returns False if stopped."""
+        root = os.path.normpath(root)
+        stats = stats or ContentIndexStats()
+        start_time = time.perf_counter()
+        connection = self.connection
+
+        subtree = (root, *subtree_range(root))
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in connection.execute(
+                "SELECT id, path, mtime_ns, size FROM files "
+                "WHERE path >= ? AND path < ?",
+                subtree[1:],
+            )
+        }
+        known_directories = {
+            path
+            for (path,) in connection.execute(
+                "SELECT path FROM directories "
+                "WHERE path = ? OR (path >= ? AND path < ?)",
+                subtree,
+            )
+        }
+        seen = set()
+        changed = []
+        directory_mtimes = []
+        walker = ParallelWalker([root], should_prune=should_prune)
+        for directory, _, files in walker.walk(should_stop):
+            try:
+                directory_mtimes.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                pass
+            for entry in files:
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue
+                seen.add(entry.path)
+                indexed = known.get(entry.path)
+                if indexed is None or indexed[1:] != (
+                    entry_stat.st_mtime_ns,
+                    entry_stat.st_size,
+                ):
+                    changed.append(entry.path)
+        if should_stop():
+            return False
+        stats.files += len(seen)
+
+        # Changed files get new ids, so their old rows go as well
+        removed = known.keys() - seen
+        stats.removed_files += len(removed)
+        connection.executemany(
+            "DELETE FROM files WHERE id = ?",
+            [
+                (known[path][0],)
+                for path in itertools.chain(removed, changed)
+                if path in known
+            ],
+        )
+        connection.executemany(
+            "DELETE FROM directories WHERE path = ?",
+            [(path,) for path in known_directories - set(dict(directory_mtimes))],
+        )
+        connection.commit()
+
+        if not self.index_files(changed, should_stop, stats):
+            connection.commit()
+            return False
+        self.merge_segments()
+
+        # Only stored once the files listed with them are indexed
+        connection.executemany(
+            "INSERT OR REPLACE INTO directories VALUES (?, ?)", directory_mtimes
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO roots VALUES (?, ?)", (root, time.time())
+        )
+        connection.commit()
+        # A full build leaves a WAL about as large as the index itself
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stats.seconds += time.perf_counter() - start_time
+        stats.index_bytes = self.size_on_disk()
+        return True
+
+    def index_files(
+        self,
+        paths: list[str],
+        should_stop: Callable[[], bool],
+        stats: ContentIndexStats,
+    ) -> bool:
+        if not paths:
+            return True
+        connection = self.connection
+        chunks = [
+            paths[start : start + self.CHUNK_FILES]
+            for start in range(0, len(paths), self.CHUNK_FILES)
+        ]
+        context = multiprocessing.get_context(START_METHOD)
+        pool = context.Pool(min(self.processes, len(chunks)))
+        try:
+            pending_writes = 0
+            for rows, postings in pool.imap_unordered(
+                partial(index_chunk, max_size=self.max_file_size), chunks
+            ):
+                if should_stop():
+                    return False
+                self.add_segment(rows, postings)
+                stats.indexed_files += len(rows)
+                stats.bytes_indexed += sum(row[2] for row in rows if row[3] == TEXT)
+
+                pending_writes += len(postings) + len(rows)
+                if pending_writes >= self.COMMIT_INTERVAL:
+                    connection.commit()
+                    pending_writes = 0
+        finally:
+            pool.terminate()
+            pool.join()
+        return True
+
+    def next_file_id(self) -> int:
+        # AUTOINCREMENT never hands out an id again, so postings left behind
+        # by removed files cannot point at newer ones
+        row = self.connection.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'files'"
+        ).fetchone()
+        return (row[0] if row else 0) + 1
+
+    def add_segment(self, rows: list[tuple], postings: list[tuple[int, bytes]]):
+        connection = self.connection
+        base = self.next_file_id()
+        segment = connection.execute(
+            "INSERT INTO segments (base, files) VALUES (?, ?)", (base, len(rows))
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO files (id, path, mtime_ns, size, state, segment) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(base + ordinal, *row, segment) for ordinal, row in enumerate(rows)],
+        )
+        connection.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?)",
+            [(trigram, segment, ordinals) for trigram, ordinals in postings],
+        )
+
+    def merge_segments(self):
+        """Merges the segments of fewer files than a chunk once there are
+        more than MAX_SMALL_SEGMENTS of them, along with any segment that
+        lost half of its files, dropping the postings of removed files."""
+        connection = self.connection
+        segments = connection.execute(
+            "SELECT s.id, s.files, COUNT(f.id) FROM segments s "
+            "LEFT JOIN files f ON f.segment = s.id GROUP BY s.id"
+        ).fetchall()
+        small = [row[0] for row in segments if row[1] < self.CHUNK_FILES]
+        emptied = [row[0] for row in segments if row[2] * 2 < row[1]]
+        if len(small) <= self.MAX_SMALL_SEGMENTS and not emptied:
+            return
+        merged = set(emptied)
+        if len(small) > self.MAX_SMALL_SEGMENTS:
+            merged.update(small)
+
+        placeholders = ", ".join("?" * len(merged))
+        bases = dict(
+            connection.execute(
+                f"SELECT id, base FROM segments WHERE id IN ({placeholders})",
+                list(merged),
+            )
+        )
+        live = {
+            file_id
+            for (file_id,) in connection.execute(
+                f"SELECT id FROM files WHERE segment IN ({placeholders})",
+                list(merged),
+            )
+        }
+        postings: dict[int, list[int]] = {}
+        for trigram, segment, ordinals in connection.execute(
+            "SELECT trigram, segment, ordinals FROM postings "
+            f"WHERE segment IN ({placeholders})",
+            list(merged),
+        ):
+            base = bases[segment]
+            file_ids = [
+                base + ordinal
+                for ordinal in decode_ordinals(ordinals)
+                if base + ordinal in live
+            ]
+            if file_ids:
+                postings.setdefault(trigram, []).extend(file_ids)
+
+        # Ids of the merged segment are the ordinals themselves
+        segment = connection.execute(
+            "INSERT INTO segments (base, files) VALUES (0, ?)", (len(live),)
+        ).lastrowid
+        connection.execute(
+            f"DELETE FROM postings WHERE segment IN ({placeholders})", list(merged)
+        )
+        connection.execute(
+            f"DELETE FROM segments WHERE id IN ({placeholders})", list(merged)
+        )
+        connection.execute(
+            f"UPDATE files SET segment = ? WHERE segment IN ({placeholders})",
+            [segment, *merged],
+        )
+        connection.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?)",
+            [
+                (trigram, segment, encode_ordinals(sorted(file_ids)))
+                for trigram, file_ids in sorted(postings.items())
+            ],
+        )
+        connection.commit()
+
+    def candidates(self, root: str, content_query: str) -> Optional[list[str]]:
+        """Files below root that may contain content_query, or None when the
+        query is too short to narrow anything down."""
+        trigrams = query_trigrams(content_query)
+        if not trigrams:
+            return None
+        connection = self.connection
+        placeholders = ", ".join("?" * len(trigrams))
+        # Rarest first: the posting bytes of each trigram, without reading them
+        posting_bytes = dict(
+            connection.execute(
+                "SELECT trigram, SUM(length(ordinals)) FROM postings "
+                f"WHERE trigram IN ({placeholders}) GROUP BY trigram",
+                trigrams,
+            )
+        )
+        low, high = subtree_range(os.path.normpath(root))
+        paths = [
+            row[0]
+            for row in connection.execute(
+                f"SELECT path FROM files WHERE state = {UNINDEXED} "
+                "AND path >= ? AND path < ?",
+                (low, high),
+            )
+        ]
+        if len(posting_bytes) < len(trigrams):
+            return paths  # Some trigram is in no indexed file
+
+        bases = dict(connection.execute("SELECT id, base FROM segments"))
+        file_ids = None
+        for trigram in sorted(trigrams, key=posting_bytes.get)[
+            : self.MAX_QUERY_TRIGRAMS
+        ]:
+            found = set()
+            for segment, ordinals in connection.execute(
+                "SELECT segment, ordinals FROM postings WHERE trigram = ?",
+                (trigram,),
+            ):
+                base = bases[segment]
+                found.update(base + ordinal for ordinal in decode_ordinals(ordinals))
+            file_ids = found if file_ids is None else file_ids & found
+            if len(file_ids) <= self.ENOUGH_CANDIDATES:
+                break
+
+        file_ids = list(file_ids)
+        # Postings of removed files find no row here
+        for start in range(0, len(file_ids), 500):
+            batch = file_ids[start : start + 500]
+            paths.extend(
+                row[0]
+                for row in connection.execute(
+                    "SELECT path FROM files WHERE id IN "
+                    f"({', '.join('?' * len(batch))}) AND path >= ? AND path < ?",
+                    (*batch, low, high),
+                )
+            )
+        return paths
+
+    def stale_files(
+        self,
+        root: str,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> list[str]:
+        """Files below root added or replaced since the last update.
+
+        Only directories whose mtime changed since are listed, so this
+        costs a stat per directory rather than per file. A file edited in
+        place leaves its directory's mtime alone, though, so such edits
+        are only seen by the next update.
+        """
+        root = os.path.normpath(root)
+        connection = self.connection
+        directories = dict(
+            connection.execute(
+                "SELECT path, mtime_ns FROM directories "
+                "WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, *subtree_range(root)),
+            )
+        )
+        stale = []
+        new_directories = []
+        for directory, mtime_ns in directories.items():
+            if should_stop():
+                return stale
+            try:
+                if os.stat(directory).st_mtime_ns == mtime_ns:
+                    continue
+            except OSError:
+                continue
+
+            low, high = subtree_range(directory)
+            indexed = {
+                path: (file_mtime_ns, size)
+                for path, file_mtime_ns, size in connection.execute(
+                    "SELECT path, mtime_ns, size FROM files "
+                    "WHERE path >= ? AND path < ? AND instr(substr(path, ?), ?) = 0",
+                    (low, high, len(low) + 1, os.sep),
+                )
+            }
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                if entry.path not in directories and not (
+                                    should_prune and should_prune(directory, entry)
+                                ):
+                                    new_directories.append(entry.path)
+                                continue
+                            entry_stat = entry.stat()
+                        except OSError:
+                            continue
+                        if indexed.get(entry.path) != (
+                            entry_stat.st_mtime_ns,
+                            entry_stat.st_size,
+                        ):
+                            stale.append(entry.path)
+            except OSError:
+                continue
+
+        if new_directories:
+            walker = ParallelWalker(new_directories, should_prune=should_prune)
+            for _, _, files in walker.walk(should_stop):
+                stale.extend(entry.path for entry in files)
+        return stale
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import re
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+CHUNK_SIZE = 1024 * 1024
+# A NUL byte in the first block marks the file as binary
+SNIFF_BYTES = 8192
+POLL_INTERVAL = 0.1
+# Worker processes are spawned: a fork of the GUI process would copy locks
+# held by its other threads (Qt's among them) and could deadlock
+START_METHOD = "spawn"
+
+# Set in each worker process by init_worker
+worker_pattern: Optional[re.Pattern] = None
+worker_overlap = 0
+worker_stop_event = None
+
+
+class ScanResult(NamedTuple):
+    path: str
+    matched: bool
+    bytes_scanned: int
+    size: int
+    mtime: float
+
+
+def compile_content_pattern(query: str) -> re.Pattern:
+    # Case-insensitive for ASCII; other characters must match exactly
+    return re.compile(re.escape(query.encode("utf-8")), re.IGNORECASE)
+
+
+def init_worker(query: str, stop_event):
+    global worker_pattern, worker_overlap, worker_stop_event
+    worker_pattern = compile_content_pattern(query)
+    worker_overlap = len(query.encode("utf-8")) - 1
+    worker_stop_event = stop_event
+
+
+def scan_file(path: str) -> ScanResult:
+    return scan_file_with(path, worker_pattern, worker_overlap, worker_stop_event)
+
+
+def scan_file_with(
+    path: str, pattern: re.Pattern, overlap: int, stop_event=None
+) -> ScanResult:
+    """Reads path in fixed-size chunks until pattern is found.
+
+    Chunks overlap by len(query) - 1 bytes so matches spanning two reads
+    are still found. Binary files are skipped after the first chunk.
+    """
+    bytes_scanned = 0
+    try:
+        with open(path, "rb") as f:
+            file_stat = os.fstat(f.fileno())
+            tail = b""
+            first_chunk = True
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                bytes_scanned += len(chunk)
+                if first_chunk and b"\0" in chunk[:SNIFF_BYTES]:
+                    break
+                first_chunk = False
+
+                block = tail + chunk
+                if pattern.search(block):
+                    return ScanResult(
+                        path, True, bytes_scanned, file_stat.st_size, file_stat.st_mtime
+                    )
+                tail = block[-overlap:] if overlap else b""
+    except OSError:
+        return ScanResult(path, False, bytes_scanned, 0, 0.0)
+    return ScanResult(path, False, bytes_scanned, file_stat.st_size, file_stat.st_mtime)
+
+
+class ContentScanner:
+    """Searches file contents across a pool of worker processes.
+
+    Paths are consumed lazily from the caller's iterable while results are
+    yielded in completion order, so matches stream back while the walk that
+    produces the paths is still running. Stopping sets a shared event that
+    workers check between chunks, then terminates the pool.
+    """
+
+    def __init__(self, query: str, processes: int = None):
+        self.query = query
+        self.processes = processes or os.cpu_count() or 1
+        self.bytes_scanned = 0
+        self.files_scanned = 0
+
+    def scan(
+        self,
+        paths: Iterable[str],
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> Iterator[ScanResult]:
+        """Yields a ScanResult for every matching file."""
+        context = multiprocessing.get_context(START_METHOD)
+        stop_event = context.Event()
+        pool = context.Pool(
+            self.processes, initializer=init_worker, initargs=(self.query, stop_event)
+        )
+        try:
+            # chunksize must stay 1: larger chunks return a plain generator
+            # without next(timeout), so stop requests would wait on a result
+            results = pool.imap_unordered(
+                scan_file, self.until_stopped(paths, should_stop)
+            )
+            while not should_stop():
+                try:
+                    result = results.next(timeout=POLL_INTERVAL)
+                except multiprocessing.TimeoutError:
+                    continue
+                except StopIteration:
+                    break
+
+                self.files_scanned += 1
+                self.bytes_scanned += result.bytes_scanned
+                if result.matched:
+                    yield result
+        finally:
+            stop_event.set()
+            pool.terminate()
+            pool.join()
+
+    def until_stopped(
+        self, paths: Iterable[str], should_stop: Callable[[], bool]
+    ) -> Iterator[str]:
+        # Runs on the pool's feeder thread
+        for path in paths:
+            if should_stop():
+                return
+            yield path
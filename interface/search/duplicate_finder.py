@@ -0,0 +1,264 @@
+import hashlib
+import mmap
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from interface.search.content_scanner import START_METHOD
+from interface.search.parallel_walker import ParallelWalker, is_link
+from interface.search.search_stats import format_bytes
+
+# Bytes hashed from each end of a file before hashing it whole
+PARTIAL_HASH_BYTES = 64 * 1024
+POLL_INTERVAL = 0.1
+
+
+class DuplicateGroup(NamedTuple):
+    size: int
+    paths: list[str]
+
+    @property
+    def reclaimable(self) -> int:
+        # Space freed by keeping a single copy
+        return self.size * (len(self.paths) - 1)
+
+
+class DuplicateStats:
+    """Progress of one duplicate search, read by the UI while it runs."""
+
+    def __init__(self):
+        self.stage = "walk"  # "walk", "partial", "full" or "done"
+        self.files = 0
+        self.size_candidates = 0
+        self.partial_candidates = 0
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.groups = 0
+        self.reclaimable = 0
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    def finish(self):
+        self.stage = "done"
+        self.end_time = time.perf_counter()
+
+    def elapsed(self) -> float:
+        end_time = self.end_time or time.perf_counter()
+        return end_time - self.start_time
+
+    def status_text(self) -> str:
+        if self.stage == "walk":
+            return f"Listing files... {self.files} files"
+        if self.stage == "partial":
+            return (
+                f"Comparing file ends... {self.files_hashed} of "
+                f"{self.size_candidates} same-size files"
+            )
+        if self.stage == "full":
+            return (
+                f"Hashing... {self.files_hashed} of {self.partial_candidates} "
+                f"files, {format_bytes(self.bytes_hashed)} read"
+            )
+        return (
+            f"{self.groups} groups of duplicates, "
+            f"{format_bytes(self.reclaimable)} reclaimable "
+            f"({self.files} files in {self.elapsed():.1f}s)"
+        )
+
+
+def hash_partial(path: str, size: int) -> tuple[str, Optional[bytes], int]:
+    """Hashes the first and last PARTIAL_HASH_BYTES of path, which covers
+    the whole file when it is at most twice that size."""
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            head = f.read(PARTIAL_HASH_BYTES)
+            digest.update(head)
+            bytes_read = len(head)
+            if size > PARTIAL_HASH_BYTES:
+                f.seek(max(size - PARTIAL_HASH_BYTES, PARTIAL_HASH_BYTES))
+                tail = f.read(PARTIAL_HASH_BYTES)
+                digest.update(tail)
+                bytes_read += len(tail)
+    except OSError:
+        return path, None, 0
+    return path, digest.digest(), bytes_read
+
+
+def hash_file(path: str) -> tuple[str, Optional[bytes], int]:
+    """Runs in the finder's worker processes. The file is mapped rather
+    than read, so the hash reads straight from the page cache."""
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+    except (OSError, ValueError):
+        return path, None, 0
+    return path, digest.digest(), size
+
+
+def group_by(keyed_paths: Iterable[tuple[object, str]]) -> dict[object, list[str]]:
+    groups: dict[object, list[str]] = {}
+    for key, path in keyed_paths:
+        groups.setdefault(key, []).append(path)
+    return groups
+
+
+class DuplicateFinder:
+    """Finds files with identical contents under a set of roots.
+
+    Each stage only passes on files that still have a possible twin: one
+    walk groups files by size, the first and last PARTIAL_HASH_BYTES of
+    same-size files are hashed on a thread pool, and the files whose ends
+    match are hashed whole across a pool of processes. Files no larger than
+    two partial blocks are fully hashed by the second stage already.
+
+    Hard links to one file are counted once, since deleting a link frees
+    nothing; links to files are not followed.
+    """
+
+    PARTIAL_HASH_THREADS = 8
+
+    def __init__(
+        self,
+        roots: list[str],
+        min_size: int = 1,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+        processes: int = None,
+    ):
+        self.roots = roots
+        self.min_size = max(min_size, 1)
+        self.processes = processes or os.cpu_count() or 1
+        self.walker = ParallelWalker(roots, should_prune=should_prune)
+        self.stats = DuplicateStats()
+
+    def find(
+        self, should_stop: Callable[[], bool] = lambda: False
+    ) -> list[DuplicateGroup]:
+        """Returns the groups of duplicates, most reclaimable space first,
+        or an empty list if stopped."""
+        stats = self.stats
+        try:
+            by_size = self.group_by_size(should_stop)
+            candidates = [
+                (size, path)
+                for size, paths in by_size.items()
+                if len(paths) > 1
+                for path in paths
+            ]
+            stats.size_candidates = len(candidates)
+            if should_stop():
+                return []
+
+            stats.stage = "partial"
+            groups = []
+            large_paths = []
+            sizes = {}
+            for (size, _), paths in self.group_by_partial_hash(
+                candidates, should_stop
+            ).items():
+                if len(paths) < 2:
+                    continue
+                if size <= 2 * PARTIAL_HASH_BYTES:
+                    groups.append(DuplicateGroup(size, sorted(paths)))
+                else:
+                    large_paths.extend(paths)
+                    sizes.update(dict.fromkeys(paths, size))
+            stats.partial_candidates = len(large_paths)
+            if should_stop():
+                return []
+
+            stats.stage = "full"
+            stats.files_hashed = 0
+            for (size, _), paths in self.group_by_full_hash(
+                large_paths, sizes, should_stop
+            ).items():
+                if len(paths) > 1:
+                    groups.append(DuplicateGroup(size, sorted(paths)))
+            if should_stop():
+                return []
+
+            groups.sort(key=lambda group: (-group.reclaimable, group.paths[0]))
+            stats.groups = len(groups)
+            stats.reclaimable = sum(group.reclaimable for group in groups)
+            return groups
+        finally:
+            stats.finish()
+
+    def group_by_size(self, should_stop: Callable[[], bool]) -> dict[int, list[str]]:
+        seen_inodes = set()
+        sizes = []
+        for _, _, files in self.walker.walk(should_stop):
+            for entry in files:
+                if is_link(entry):
+                    continue
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                self.stats.files += 1
+                if entry_stat.st_size < self.min_size:
+                    continue
+                # st_ino is 0 on Windows when it comes from the listing
+                if entry_stat.st_ino:
+                    inode = (entry_stat.st_dev, entry_stat.st_ino)
+                    if inode in seen_inodes:
+                        continue
+                    seen_inodes.add(inode)
+                sizes.append((entry_stat.st_size, entry.path))
+        return group_by(sizes)
+
+    def group_by_partial_hash(
+        self, candidates: list[tuple[int, str]], should_stop: Callable[[], bool]
+    ) -> dict[tuple[int, bytes], list[str]]:
+        keyed_paths = []
+        # Reads are short and release the GIL, so threads overlap them
+        with ThreadPoolExecutor(self.PARTIAL_HASH_THREADS) as executor:
+            results = executor.map(
+                lambda candidate: hash_partial(candidate[1], candidate[0]), candidates
+            )
+            for (size, _), (path, digest, bytes_read) in zip(candidates, results):
+                if should_stop():
+                    executor.shutdown(cancel_futures=True)
+                    return {}
+                self.stats.files_hashed += 1
+                self.stats.bytes_hashed += bytes_read
+                if digest is not None:
+                    keyed_paths.append(((size, digest), path))
+        return group_by(keyed_paths)
+
+    def group_by_full_hash(
+        self,
+        paths: list[str],
+        sizes: dict[str, int],
+        should_stop: Callable[[], bool],
+    ) -> dict[tuple[int, bytes], list[str]]:
+        if not paths:
+            return {}
+        # Largest first, so the longest hashes do not start last
+        paths = sorted(paths, key=sizes.__getitem__, reverse=True)
+        keyed_paths = []
+        context = multiprocessing.get_context(START_METHOD)
+        pool = context.Pool(min(self.processes, len(paths)))
+        try:
+            results = pool.imap_unordered(hash_file, paths)
+            while not should_stop():
+                try:
+                    path, digest, bytes_read = results.next(timeout=POLL_INTERVAL)
+                except multiprocessing.TimeoutError:
+                    continue
+                except StopIteration:
+                    break
+                self.stats.files_hashed += 1
+                self.stats.bytes_hashed += bytes_read
+                if digest is not None:
+                    keyed_paths.append(((sizes[path], digest), path))
+        finally:
+            pool.terminate()
+            pool.join()
+        return group_by(keyed_paths)
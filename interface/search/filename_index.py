@@ -0,0 +1,349 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from interface.search.query import MetadataFilter
+from interface.search.search_result import SearchResult
+
+
+class IndexStats:
+    def __init__(self):
+        self.directories = 0
+        self.rescanned_directories = 0
+        self.entries = 0
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.directories} directories ({self.rescanned_directories} "
+            f"rescanned), {self.entries} entries in {self.seconds:.1f}s"
+        )
+
+
+class IndexedDirectory(NamedTuple):
+    # Stands in for the os.DirEntry of a directory whose parent's listing
+    # is unchanged, so should_prune can be asked without listing it again
+    name: str
+    path: str
+
+
+def escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def subtree_pattern(path: str) -> str:
+    # LIKE pattern (with ESCAPE '\') for every path below path
+    return escape_like(path.rstrip(os.sep) + os.sep) + "%"
+
+
+def subtree_range(path: str) -> tuple[str, str]:
+    # [low, high) bounds of every path below path, so an index on the
+    # column can be used; "/home/" up to "/home0" as "0" follows os.sep
+    prefix = path.rstrip(os.sep)
+    return prefix + os.sep, prefix + chr(ord(os.sep) + 1)
+
+
+class FilenameIndex:
+    """On-disk index of every name under a set of roots, stored in SQLite.
+
+    Names are matched through an FTS5 trigram table when SQLite provides
+    one, so a substring query only visits rows sharing its trigrams; other
+    builds fall back to scanning the name column. Directory mtimes are
+    stored alongside, and an update only re-lists directories whose mtime
+    changed since the last pass.
+
+    Each thread gets its own connection, so searches can read while the
+    indexer writes.
+    """
+
+    MIN_TRIGRAM_TERM = 3
+    COMMIT_INTERVAL = 5000
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.has_trigrams = False
+        self.create_tables()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def create_tables(self):
+        connection = self.connection
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS roots (
+                path TEXT PRIMARY KEY, indexed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                directory TEXT NOT NULL,
+                name TEXT NOT NULL,
+                is_dir INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_directory ON entries (directory);
+            """
+        )
+        try:
+            connection.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entry_names USING fts5 (
+                    name, content='entries', content_rowid='id',
+                    tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+                BEGIN
+                    INSERT INTO entry_names (rowid, name) VALUES (new.id, new.name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+                BEGIN
+                    INSERT INTO entry_names (entry_names, rowid, name)
+                    VALUES ('delete', old.id, old.name);
+                END;
+                """
+            )
+            self.has_trigrams = True
+        except sqlite3.OperationalError as e:
+            print(f"Filename index without trigram search: {str(e)}")
+        connection.commit()
+
+    def close(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def get_roots(self) -> list[str]:
+        rows = self.connection.execute("SELECT path FROM roots ORDER BY path")
+        return [row[0] for row in rows]
+
+    def find_root(self, path: str) -> Optional[str]:
+        # The indexed root that contains path, if any
+        path = os.path.normpath(path)
+        for root in self.get_roots():
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def remove_root(self, root: str):
+        connection = self.connection
+        pattern = subtree_pattern(root)
+        connection.execute("DELETE FROM roots WHERE path = ?", (root,))
+        for table, column in (("entries", "directory"), ("directories", "path")):
+            connection.execute(
+                f"DELETE FROM {table} WHERE {column} = ? "
+                f"OR {column} LIKE ? ESCAPE '\\'",
+                (root, pattern),
+            )
+        connection.commit()
+
+    def update(
+        self,
+        root: str,
+        should_stop: Callable[[], bool] = lambda: False,
+        stats: Optional[IndexStats] = None,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+    ) -> bool:
+        """Brings the index of root up to date. Returns False if stopped.
+
+        Directories should_prune rejects are left out of the index, as the
+        walker leaves them out of a search; should_prune only gets to see
+        the name and path of directories that were not listed again.
+        """
+        root = os.path.normpath(root)
+        stats = stats or IndexStats()
+        start_time = time.perf_counter()
+        connection = self.connection
+
+        known_mtimes = dict(
+            connection.execute(
+                "SELECT path, mtime_ns FROM directories "
+                "WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+                (root, subtree_pattern(root)),
+            )
+        )
+        visited = set()
+        pending = [root]
+        pending_writes = 0
+        while pending:
+            if should_stop():
+                connection.commit()
+                return False
+
+            directory = pending.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            visited.add(directory)
+            stats.directories += 1
+
+            if known_mtimes.get(directory) == mtime_ns:
+                subdirs = [
+                    IndexedDirectory(row[0], os.path.join(directory, row[0]))
+                    for row in connection.execute(
+                        "SELECT name FROM entries WHERE directory = ? AND is_dir = 1",
+                        (directory,),
+                    )
+                ]
+                for subdir in subdirs:
+                    # The rules may have changed since the directory was listed
+                    if should_prune and should_prune(directory, subdir):
+                        connection.execute(
+                            "DELETE FROM entries WHERE directory = ? AND name = ?",
+                            (directory, subdir.name),
+                        )
+                    else:
+                        pending.append(subdir.path)
+                continue
+
+            rows = self.list_directory(directory, should_prune)
+            stats.rescanned_directories += 1
+            stats.entries += len(rows)
+            connection.execute("DELETE FROM entries WHERE directory = ?", (directory,))
+            connection.executemany(
+                "INSERT INTO entries (directory, name, is_dir, size, mtime) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(directory, *row) for row in rows],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO directories VALUES (?, ?)",
+                (directory, mtime_ns),
+            )
+            pending.extend(os.path.join(directory, row[0]) for row in rows if row[1])
+
+            pending_writes += len(rows) + 1
+            if pending_writes >= self.COMMIT_INTERVAL:
+                connection.commit()
+                pending_writes = 0
+
+        # Directories that disappeared since the last pass
+        for directory in known_mtimes.keys() - visited:
+            connection.execute("DELETE FROM entries WHERE directory = ?", (directory,))
+            connection.execute("DELETE FROM directories WHERE path = ?", (directory,))
+
+        connection.execute(
+            "INSERT OR REPLACE INTO roots VALUES (?, ?)", (root, time.time())
+        )
+        connection.commit()
+        stats.seconds += time.perf_counter() - start_time
+        return True
+
+    def list_directory(
+        self,
+        directory: str,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+    ) -> list[tuple]:
+        rows = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        # Symlinked directories are indexed but not descended
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir and should_prune and should_prune(directory, entry):
+                        continue
+                    rows.append(
+                        (
+                            entry.name,
+                            is_dir,
+                            0 if is_dir else entry_stat.st_size,
+                            entry_stat.st_mtime,
+                        )
+                    )
+        except OSError:
+            pass
+        return rows
+
+    def iter_entries(self) -> Iterator[tuple[str, bool]]:
+        """(path, is_dir) of every indexed entry, in no particular order."""
+        for directory, name, is_dir in self.connection.execute(
+            "SELECT directory, name, is_dir FROM entries"
+        ):
+            yield os.path.join(directory, name), bool(is_dir)
+
+    def search(
+        self,
+        root: str,
+        include_terms: list[str],
+        metadata_filter: Optional[MetadataFilter] = None,
+    ) -> Iterator[SearchResult]:
+        """Yields entries below root whose names may contain every term.
+
+        Names are only narrowed by the index, so callers still verify them
+        with their own matcher; metadata predicates are applied exactly.
+        """
+        root = os.path.normpath(root)
+        query = "SELECT e.directory, e.name, e.is_dir, e.size, e.mtime FROM entries e"
+        parameters = []
+        trigram_terms = [
+            term for term in include_terms if len(term) >= self.MIN_TRIGRAM_TERM
+        ]
+        if self.has_trigrams and trigram_terms:
+            query += " JOIN entry_names f ON f.rowid = e.id WHERE entry_names MATCH ?"
+            phrases = ['"' + term.replace('"', '""') + '"' for term in trigram_terms]
+            parameters.append(" AND ".join(phrases))
+        else:
+            query += " WHERE 1"
+        # Without a trigram term, the directory index narrows the rows
+        query += " AND (e.directory = ? OR (e.directory >= ? AND e.directory < ?))"
+        parameters += [root, *subtree_range(root)]
+        if metadata_filter is not None:
+            conditions, filter_parameters = self.filter_conditions(metadata_filter)
+            for condition in conditions:
+                query += f" AND {condition}"
+            parameters += filter_parameters
+
+        for directory, name, is_dir, size, mtime in self.connection.execute(
+            query, parameters
+        ):
+            yield SearchResult(
+                name, os.path.join(directory, name), bool(is_dir), size, mtime
+            )
+
+    def filter_conditions(self, metadata_filter: MetadataFilter) -> tuple[list, list]:
+        conditions = []
+        parameters = []
+        if metadata_filter.files_only():
+            conditions.append("e.is_dir = 0")
+        elif metadata_filter.kind == "dir":
+            conditions.append("e.is_dir = 1")
+        if metadata_filter.extensions:
+            conditions.append(
+                "("
+                + " OR ".join(
+                    ["e.name LIKE ? ESCAPE '\\'"] * len(metadata_filter.extensions)
+                )
+                + ")"
+            )
+            parameters += [
+                "%." + escape_like(extension)
+                for extension in sorted(metadata_filter.extensions)
+            ]
+        for column, operator, value in (
+            ("e.size", ">=", metadata_filter.min_size),
+            ("e.size", "<=", metadata_filter.max_size),
+            ("e.mtime", ">=", metadata_filter.min_mtime),
+            ("e.mtime", "<=", metadata_filter.max_mtime),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        return conditions, parameters
@@ -0,0 +1,234 @@
+import heapq
+import os
+from typing import Iterable, NamedTuple, Optional
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+# Matches at the start of a word, e.g. the "q" in "report_Q3"
+BONUS_BOUNDARY = 8
+# Matches at a lower to upper case or letter to digit change
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+# The bonus of the first query character counts this many times
+FIRST_CHAR_MULTIPLIER = 2
+
+WORD_SEPARATORS = frozenset(" _-.,+()[]")
+
+
+class FuzzyMatch(NamedTuple):
+    score: int
+    name: str
+    path: str
+    is_dir: bool
+
+
+def lower_in_place(name: str) -> str:
+    # str.lower() can lengthen a name, which would shift match positions
+    lowered = name.lower()
+    if len(lowered) == len(name):
+        return lowered
+    return "".join(char.lower()[:1] for char in name)
+
+
+def score_alignment(query: str, name: str, lowered: str, start: int) -> int:
+    # Scores the greedy match of query in name starting at index start
+    score = 0
+    position = start - 1
+    for count, char in enumerate(query):
+        previous_position = position
+        position = lowered.find(char, position + 1)
+        previous = name[position - 1] if position else " "
+        matched = name[position]
+        bonus = 0
+        if previous in WORD_SEPARATORS:
+            bonus = BONUS_BOUNDARY
+        elif (previous.islower() and matched.isupper()) or (
+            matched.isdigit() and not previous.isdigit()
+        ):
+            bonus = BONUS_CAMEL
+        if count == 0:
+            bonus *= FIRST_CHAR_MULTIPLIER
+        elif position == previous_position + 1:
+            bonus = max(bonus, BONUS_CONSECUTIVE)
+        else:
+            gap = position - previous_position - 1
+            score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (gap - 1)
+        score += SCORE_MATCH + bonus
+    return score
+
+
+def match_window(query: str, lowered: str) -> Optional[tuple[int, int]]:
+    """The shortest (start, end) window of lowered holding query in order,
+    found like fzf's fast algorithm: a forward scan for where the leftmost
+    match ends, then a backward scan from there. None if there is none."""
+    end = -1
+    for char in query:
+        end = lowered.find(char, end + 1)
+        if end < 0:
+            return None
+    start = end + 1
+    for char in reversed(query):
+        start = lowered.rfind(char, 0, start)
+    return start, end
+
+
+def score_bound(query_length: int, span: int) -> int:
+    # No alignment scores more: the best bonus on every character, and a
+    # single gap over what the window leaves between them
+    score = SCORE_MATCH * query_length + BONUS_BOUNDARY * (
+        FIRST_CHAR_MULTIPLIER + query_length - 1
+    )
+    gap = span - query_length
+    if gap:
+        score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (gap - 1)
+    return score
+
+
+def fuzzy_score(query: str, name: str) -> Optional[int]:
+    """Scores name against a lowered query, or returns None if the query
+    is not a subsequence of name.
+
+    Both the shortest window and the leftmost match are scored and the
+    better one counts, since the shortest window can miss a word start, as
+    in "rf" in "report_final".
+    """
+    lowered = lower_in_place(name)
+    window = match_window(query, lowered)
+    if window is None:
+        return None
+    return score_window(query, name, lowered, window[0])
+
+
+def score_window(query: str, name: str, lowered: str, start: int) -> int:
+    score = score_alignment(query, name, lowered, start)
+    leftmost = lowered.find(query[0])
+    if leftmost != start:
+        score = max(score, score_alignment(query, name, lowered, leftmost))
+    return score
+
+
+class FuzzyFinder:
+    """Ranks paths by fuzzy subsequence matching of their names, like fzf.
+
+    Which names contain each character is kept as one bitmask per
+    character, a Python int with bit i set for name i. The masks of a
+    query's characters are ANDed in C, so names missing any of them are
+    never looked at in Python, and only the rest are matched and scored.
+    A mask is built from one bytes pass over all names the first time its
+    character is typed, then reused.
+
+    Names are stored shortest first, and the names that pass the masks are
+    matched in that order, up to MAX_SCORED of them, so a broad query
+    still answers within a keystroke on a million paths. Short names leave
+    the least room for gaps, so the best matches are among the first ones
+    and the longest names are the ones left out. A name is only fully
+    scored if the bound its match window allows could still beat the
+    worst of the best matches kept so far, and once not even a perfect
+    score could displace them, the longer names left are skipped.
+    """
+
+    MAX_SCORED = 5000
+
+    def __init__(self, entries: Iterable[tuple[str, bool]]):
+        """entries are (path, is_dir) pairs; earlier ones win ties."""
+        added = []
+        for path, is_dir in entries:
+            name = os.path.basename(path.rstrip(os.sep)) or path
+            if "\n" not in name:
+                added.append((name, path, is_dir))
+        added_order = sorted(range(len(added)), key=lambda rank: len(added[rank][0]))
+        self.names = [added[rank][0] for rank in added_order]
+        self.paths = [added[rank][1] for rank in added_order]
+        self.is_dirs = [added[rank][2] for rank in added_order]
+        self.ranks = added_order
+        self.lowered = [lower_in_place(name) for name in self.names]
+        # Bytes keep every mask pass in C; lines are names, in order
+        self.text = "\n".join(self.lowered).encode("utf-8")
+        self.masks: dict[int, int] = {}
+        self.all_names = (1 << len(self.names)) - 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def char_mask(self, byte: int) -> int:
+        mask = self.masks.get(byte)
+        if mask is not None:
+            return mask
+        newline = ord("\n")
+        # One line per name: "0" for names without byte, "0" followed by
+        # at least one "1" for names with it
+        lines = self.text.translate(
+            None, bytes(other for other in range(256) if other not in (byte, newline))
+        )
+        lines = b"0" + lines.replace(bytes([byte]), b"1").replace(b"\n", b"\n0")
+        while b"11" in lines:
+            lines = lines.replace(b"11", b"1")
+        bits = lines.replace(b"01", b"1").replace(b"\n", b"")
+        # The first name is the lowest bit
+        mask = int(bits[::-1], 2)
+        self.masks[byte] = mask
+        return mask
+
+    def prepare(self, characters: str):
+        """Builds the masks of characters ahead of the first query, e.g. on
+        the thread that collected the paths."""
+        for byte in set(characters.lower().encode("utf-8")):
+            if byte < 128:
+                self.char_mask(byte)
+
+    def candidates(self, query: str, limit: Optional[int] = None) -> list[int]:
+        """Indexes of names holding every character of query, shortest
+        names first, at most limit of them."""
+        mask = self.all_names
+        # Only ASCII characters are masked; others are left to the scorer
+        for byte in set(query.encode("utf-8")):
+            if byte < 128:
+                mask &= self.char_mask(byte)
+                if not mask:
+                    return []
+        bits = bin(mask)[:1:-1]
+        indexes = []
+        index = bits.find("1")
+        while index >= 0 and len(indexes) != limit:
+            indexes.append(index)
+            index = bits.find("1", index + 1)
+        return indexes
+
+    def match(self, query: str, limit: int = 100) -> list[FuzzyMatch]:
+        """The limit best matches of query, best first. Spaces are ignored."""
+        query = lower_in_place("".join(query.split()))
+        if not query or not self.names or limit <= 0:
+            return []
+
+        # A min-heap of the best (score, -name length, -path length, -rank,
+        # index); shorter names, shorter paths, then earlier ones win ties
+        best: list[tuple[int, int, int, int, int]] = []
+        perfect_score = score_bound(len(query), len(query))
+        for index in self.candidates(query, self.MAX_SCORED):
+            name = self.names[index]
+            if len(best) == limit and (perfect_score, -len(name)) < best[0][:2]:
+                break
+            lowered = self.lowered[index]
+            window = match_window(query, lowered)
+            if window is None:
+                continue
+            ties = (-len(name), -len(self.paths[index]), -self.ranks[index], index)
+            if len(best) == limit:
+                span = window[1] - window[0] + 1
+                if (score_bound(len(query), span), *ties) <= best[0]:
+                    continue
+            item = (score_window(query, name, lowered, window[0]), *ties)
+            if len(best) < limit:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        matches = []
+        for score, _, _, _, index in sorted(best, reverse=True):
+            matches.append(
+                FuzzyMatch(
+                    score, self.names[index], self.paths[index], self.is_dirs[index]
+                )
+            )
+        return matches
@@ -0,0 +1,223 @@
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterator
+
+# (directory path, subdirectory entries, file entries), like os.walk but
+# with the os.DirEntry objects so callers can reuse their cached type info
+WalkResult = tuple[str, list[os.DirEntry], list[os.DirEntry]]
+
+DONE = object()
+POLL_INTERVAL = 0.1
+
+
+class WalkStats:
+    def __init__(self):
+        self.directories = 0
+        self.files = 0
+        self.errors = 0
+        self.pruned = 0
+        self.loops = 0
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    def elapsed(self) -> float:
+        end_time = self.end_time or time.perf_counter()
+        return end_time - self.start_time
+
+    def directories_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return self.directories / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.directories} directories, {self.files} files, "
+            f"{self.pruned} pruned in {self.elapsed():.2f}s "
+            f"({self.directories_per_second():.0f} dirs/s)"
+        )
+
+
+def is_link(entry: os.DirEntry) -> bool:
+    # Junctions are not symlinks to os.DirEntry, but can loop just the same
+    return entry.is_symlink() or getattr(entry, "is_junction", lambda: False)()
+
+
+def deduplicate_roots(roots: list[str]) -> list[str]:
+    """Drops roots that repeat or lie inside another root, keeping order."""
+    keys = [
+        os.path.normcase(os.path.normpath(root)).rstrip(os.sep) + os.sep
+        for root in roots
+    ]
+    return [
+        root
+        for i, (root, key) in enumerate(zip(roots, keys))
+        if not any(
+            key.startswith(other) and (other != key or j < i)
+            for j, other in enumerate(keys)
+            if j != i
+        )
+    ]
+
+
+class ParallelWalker:
+    """Walks directory trees with a pool of os.scandir threads.
+
+    Directories go into one shared queue that every worker takes from, so
+    an idle worker picks up whatever is left instead of waiting on a slow
+    subtree; scandir releases the GIL, which lets several slow listings
+    (network mounts, cold disks) overlap. Results come back in completion
+    order, not os.walk order.
+
+    Entry types come from the DirEntry cache. Directory links are only
+    descended with follow_symlinks, and then each one is stat'ed once so
+    loops are detected by (device, inode).
+
+    seed_directories, typically the walked_directories of an earlier walk
+    of the same roots, are queued up front so every worker has work from
+    the start instead of waiting for the tree to fan out.
+    """
+
+    def __init__(
+        self,
+        roots: list[str],
+        workers: int = 8,
+        should_prune: Callable[[str, os.DirEntry], bool] = None,
+        follow_symlinks: bool = False,
+        seed_directories: list[str] = None,
+    ):
+        self.roots = roots
+        self.workers = workers
+        self.should_prune = should_prune
+        self.follow_symlinks = follow_symlinks
+        self.seed_directories = seed_directories or []
+        self.stats = WalkStats()
+        self.lock = threading.Lock()
+        self.walked_directories: list[str] = []
+
+    def walk(
+        self, should_stop: Callable[[], bool] = lambda: False
+    ) -> Iterator[WalkResult]:
+        self.stats = WalkStats()
+        self.work_queue: queue.Queue = queue.Queue()
+        self.results: queue.Queue = queue.Queue()
+        self.pending = 0
+        self.stop_event = threading.Event()
+        self.visited: set[tuple[int, int]] = set()
+        self.queued: set[str] = set()
+        self.walked_directories = []
+
+        for root in self.roots:
+            if self.first_visit(root):
+                self.enqueue(root)
+        if self.pending:
+            for directory in self.seed_directories:
+                self.enqueue(directory)
+        if not self.pending:
+            return
+
+        threads = [
+            threading.Thread(target=self.work, daemon=True) for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while not should_stop():
+                try:
+                    result = self.results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if result is DONE:
+                    break
+                yield result
+        finally:
+            self.stop()
+            for thread in threads:
+                thread.join()
+            self.stats.end_time = time.perf_counter()
+
+    def stop(self):
+        self.stop_event.set()
+        for _ in range(self.workers):
+            self.work_queue.put(None)
+
+    def enqueue(self, path: str):
+        # Seeded directories are also found again by their parents
+        with self.lock:
+            if path in self.queued:
+                return
+            self.queued.add(path)
+            self.pending += 1
+        self.work_queue.put(path)
+
+    def first_visit(self, path: str) -> bool:
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            return False
+        key = (path_stat.st_dev, path_stat.st_ino)
+        with self.lock:
+            if key in self.visited:
+                return False
+            self.visited.add(key)
+            return True
+
+    def work(self):
+        while True:
+            path = self.work_queue.get()
+            if path is None:
+                return
+            if not self.stop_event.is_set():
+                self.scan(path)
+
+            with self.lock:
+                self.pending -= 1
+                finished = self.pending == 0
+            if finished:
+                self.results.put(DONE)
+
+    def scan(self, path: str):
+        dirs = []
+        files = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry)
+        except OSError:
+            with self.lock:
+                self.stats.errors += 1
+            return
+
+        if self.should_prune:
+            kept_dirs = [entry for entry in dirs if not self.should_prune(path, entry)]
+            pruned = len(dirs) - len(kept_dirs)
+            dirs = kept_dirs
+        else:
+            pruned = 0
+
+        descend = []
+        loops = 0
+        for entry in dirs:
+            if not is_link(entry):
+                # Plain directories form a tree, so they cannot loop
+                descend.append(entry.path)
+            elif self.follow_symlinks:
+                if self.first_visit(entry.path):
+                    descend.append(entry.path)
+                else:
+                    loops += 1
+
+        with self.lock:
+            self.walked_directories.append(path)
+            self.stats.directories += 1
+            self.stats.files += len(files)
+            self.stats.pruned += pruned
+            self.stats.loops += loops
+        for subdirectory in descend:
+            self.enqueue(subdirectory)
+        self.results.put((path, dirs, files))
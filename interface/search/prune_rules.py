@@ -0,0 +1,218 @@
+import fnmatch
+import os
+import re
+import threading
+from typing import Optional
+
+DEFAULT_IGNORE_PATTERNS = (
+    "node_modules, .git, .hg, .svn, __pycache__, .venv, .tox, .mypy_cache, "
+    ".pytest_cache"
+)
+
+
+def split_patterns(text: str) -> list[str]:
+    return [pattern.strip() for pattern in text.split(",") if pattern.strip()]
+
+
+def parse_root_overrides(text: str) -> dict[str, list[str]]:
+    """Reads "root = pattern, pattern" lines; an empty pattern list walks
+    that root without any ignore patterns."""
+    overrides = {}
+    for line in text.splitlines():
+        root, separator, patterns = line.partition("=")
+        if separator and root.strip():
+            root = os.path.normcase(os.path.normpath(root.strip()))
+            overrides[root] = split_patterns(patterns)
+    return overrides
+
+
+class PatternMatcher:
+    """Glob patterns against directory names. Plain names are looked up in
+    a set and all wildcard patterns are joined into one regex."""
+
+    def __init__(self, patterns: list[str]):
+        patterns = [os.path.normcase(pattern) for pattern in patterns]
+        self.names = frozenset(
+            pattern for pattern in patterns if not has_wildcards(pattern)
+        )
+        wildcards = [pattern for pattern in patterns if has_wildcards(pattern)]
+        self.wildcard_match = None
+        if wildcards:
+            self.wildcard_match = re.compile(
+                "|".join(fnmatch.translate(pattern) for pattern in wildcards)
+            ).match
+
+    def matches(self, name: str) -> bool:
+        name = os.path.normcase(name)
+        if name in self.names:
+            return True
+        return self.wildcard_match is not None and bool(self.wildcard_match(name))
+
+
+def has_wildcards(pattern: str) -> bool:
+    return any(character in pattern for character in "*?[")
+
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            characters = pattern[i + 1 : end]
+            if characters.startswith("!"):
+                characters = "^" + characters[1:]
+            parts.append("[" + characters + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts) + r"\Z"
+
+
+class GitignoreFile:
+    """The patterns of one .gitignore, as far as they apply to directories.
+
+    Patterns containing a slash are anchored to the directory of the file,
+    others match a name at any depth below it. The last matching pattern
+    decides, so a "!pattern" can re-include a directory.
+    """
+
+    def __init__(self, base: str, lines: list[str]):
+        self.base = base
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if line:
+                regex = re.compile(translate_gitignore_pattern(line))
+                self.rules.append((regex, anchored, negated))
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["GitignoreFile"]:
+        try:
+            path = os.path.join(directory, ".gitignore")
+            with open(path, encoding="utf-8", errors="replace") as file:
+                lines = file.readlines()
+        except OSError:
+            return None
+        gitignore = cls(directory, lines)
+        return gitignore if gitignore.rules else None
+
+    def match(self, path: str, name: str) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no pattern matches."""
+        relative_path = None
+        for regex, anchored, negated in reversed(self.rules):
+            if anchored:
+                if relative_path is None:
+                    relative_path = os.path.relpath(path, self.base).replace(
+                        os.sep, "/"
+                    )
+                matched = regex.match(relative_path)
+            else:
+                matched = regex.match(name)
+            if matched:
+                return not negated
+        return None
+
+
+class PruneRules:
+    """Decides which directories a search walk skips.
+
+    Global ignore patterns apply everywhere unless a root override replaces
+    them for the directories below that root. With use_gitignore, the
+    .gitignore files of each directory and its ancestors up to the top of
+    its git repository are honored too, the nearest one first; outside a
+    repository none are. Gitignore rules prune directories only, so
+    ignored files in walked directories are still searched.
+
+    Called from the walker threads with each listed subdirectory of a
+    directory in turn, so the rules of the last parent are kept per thread.
+    """
+
+    def __init__(
+        self,
+        ignore_patterns: list[str],
+        use_gitignore: bool = False,
+        root_overrides: dict[str, list[str]] = None,
+    ):
+        self.matcher = PatternMatcher(ignore_patterns)
+        self.root_matchers = [
+            (root, PatternMatcher(patterns))
+            for root, patterns in sorted(
+                (root_overrides or {}).items(), key=lambda item: -len(item[0])
+            )
+        ]
+        self.use_gitignore = use_gitignore
+        # Directory -> (its .gitignore, whether it is the top of a repository)
+        self.gitignores: dict[str, tuple[Optional[GitignoreFile], bool]] = {}
+        self.gitignores_lock = threading.Lock()
+        self.local = threading.local()
+
+    def should_prune(self, parent: str, entry: os.DirEntry) -> bool:
+        local = self.local
+        if getattr(local, "parent", None) != parent:
+            local.parent = parent
+            local.matcher = self.matcher_for(parent)
+            local.gitignores = (
+                self.gitignore_chain(parent) if self.use_gitignore else []
+            )
+
+        if local.matcher.matches(entry.name):
+            return True
+        for gitignore in local.gitignores:
+            ignored = gitignore.match(entry.path, entry.name)
+            if ignored is not None:
+                return ignored
+        return False
+
+    def matcher_for(self, parent: str) -> PatternMatcher:
+        parent = os.path.normcase(parent)
+        for root, matcher in self.root_matchers:
+            if parent == root or parent.startswith(root.rstrip(os.sep) + os.sep):
+                return matcher
+        return self.matcher
+
+    def gitignore_chain(self, directory: str) -> list[GitignoreFile]:
+        # Nearest first, up to the top of the repository, or none outside
+        # one, so e.g. a ~/.gitignore does not apply; each directory is
+        # looked at once per walk
+        chain = []
+        while True:
+            with self.gitignores_lock:
+                known = self.gitignores.get(directory)
+            if known is None:
+                known = (
+                    GitignoreFile.load(directory),
+                    os.path.exists(os.path.join(directory, ".git")),
+                )
+                with self.gitignores_lock:
+                    self.gitignores[directory] = known
+            gitignore, is_repository_top = known
+            if gitignore:
+                chain.append(gitignore)
+            if is_repository_top:
+                return chain
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return []
+            directory = parent
@@ -0,0 +1,307 @@
+import re
+import time
+from typing import Callable, Iterable, Optional
+
+
+def parse_query(query: str) -> tuple[list[str], list[str]]:
+    include_terms = []
+    exclude_terms = []
+    current_phrase = []
+    in_quotes = False
+    excluding = False
+    for word in query.lower().split():
+        if word.startswith("-"):
+            excluding = True
+            word = word[1:]  # Remove the leading '-'
+
+        if word.startswith('"') and word.endswith('"'):
+            term = word.strip('"')
+            (exclude_terms if excluding else include_terms).append(term)
+            excluding = False
+        elif word.startswith('"'):
+            in_quotes = True
+            current_phrase = [word.strip('"')]
+        elif word.endswith('"'):
+            in_quotes = False
+            current_phrase.append(word.strip('"'))
+            term = " ".join(current_phrase)
+            (exclude_terms if excluding else include_terms).append(term)
+            current_phrase = []
+            excluding = False
+        elif in_quotes:
+            current_phrase.append(word)
+        else:
+            (exclude_terms if excluding else include_terms).append(word)
+            excluding = False
+
+    if current_phrase:
+        term = " ".join(current_phrase)
+        (exclude_terms if excluding else include_terms).append(term)
+
+    return include_terms, exclude_terms
+
+
+class NameMatcher:
+    """Name matching for a parsed query, compiled once per search.
+
+    A name matches when it contains every include term and no exclude term,
+    ignoring case. All exclude terms are folded into one regex alternation,
+    so they cost a single scan of the name; include terms are tested with
+    str's substring search, longest first since a longer term is more likely
+    to reject the name early. matches is a closure specialised for the shape
+    of the query, so the common cases skip the general loop.
+    """
+
+    def __init__(self, include_terms: list[str], exclude_terms: list[str]):
+        self.include_terms = sorted(set(include_terms), key=len, reverse=True)
+        self.exclude_terms = list(exclude_terms)
+        self.exclude_search = None
+        if exclude_terms:
+            self.exclude_search = re.compile(
+                "|".join(map(re.escape, self.exclude_terms))
+            ).search
+        self.matches: Callable[[str], bool] = self.build_matcher()
+
+    def build_matcher(self) -> Callable[[str], bool]:
+        include_terms = self.include_terms
+        exclude_search = self.exclude_search
+
+        if not include_terms and exclude_search is None:
+            return lambda name: True
+        if exclude_search is None and len(include_terms) == 1:
+            term = include_terms[0]
+            return lambda name: term in name.lower()
+        if exclude_search is None and len(include_terms) == 2:
+            first, second = include_terms
+
+            def match_two(name: str) -> bool:
+                name = name.lower()
+                return first in name and second in name
+
+            return match_two
+
+        def match(name: str) -> bool:
+            name = name.lower()
+            for term in include_terms:
+                if term not in name:
+                    return False
+            return exclude_search is None or exclude_search(name) is None
+
+        return match
+
+    def filter(self, names: Iterable[str]) -> list[str]:
+        return list(filter(self.matches, names))
+
+
+def compile_query(query: str) -> NameMatcher:
+    return NameMatcher(*parse_query(query))
+
+
+PREDICATE_PATTERN = re.compile(r"^(ext|size|modified|type):(.+)$")
+COMPARISON_PATTERN = re.compile(r"^(<=|>=|<|>|=)?(.+)$")
+SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgt]?)b?$")
+AGE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*(s|min|h|d|w|y)$")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+AGE_UNITS = {"s": 1, "min": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+
+
+class MetadataFilter:
+    """The ext:, size:, modified: and type: predicates of a query.
+
+    Checks are split by what they need, so callers can run the free ones
+    (kind, extension) before name matching and the stat-based ones (size,
+    mtime) only for names that matched, or push them into an index query.
+    """
+
+    def __init__(self):
+        self.extensions: set[str] = set()
+        self.kind = None  # "dir", "file" or None for both
+        self.min_size = None
+        self.max_size = None
+        self.min_mtime = None
+        self.max_mtime = None
+
+    def is_empty(self) -> bool:
+        return not self.extensions and self.kind is None and not self.needs_stat()
+
+    def needs_stat(self) -> bool:
+        return (
+            self.min_size is not None
+            or self.max_size is not None
+            or self.min_mtime is not None
+            or self.max_mtime is not None
+        )
+
+    def files_only(self) -> bool:
+        # Extensions and sizes only describe files
+        return (
+            self.kind == "file"
+            or bool(self.extensions)
+            or self.min_size is not None
+            or self.max_size is not None
+        )
+
+    def accepts_kind(self, is_dir: bool) -> bool:
+        if is_dir:
+            return self.kind != "file" and not self.files_only()
+        return self.kind != "dir"
+
+    def accepts_name(self, name: str) -> bool:
+        if not self.extensions:
+            return True
+        return "." in name and name.rpartition(".")[2].lower() in self.extensions
+
+    def accepts_stat(self, size: int, mtime: float) -> bool:
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.min_mtime is not None and mtime < self.min_mtime:
+            return False
+        if self.max_mtime is not None and mtime > self.max_mtime:
+            return False
+        return True
+
+    def accepts(self, name: str, is_dir: bool, size: int, mtime: float) -> bool:
+        return (
+            self.accepts_kind(is_dir)
+            and self.accepts_name(name)
+            and self.accepts_stat(size, mtime)
+        )
+
+    def refines(self, previous: "MetadataFilter") -> bool:
+        """True if everything this filter accepts is accepted by previous."""
+        if previous.kind is not None and self.kind != previous.kind:
+            return False
+        if previous.files_only() and not self.files_only():
+            return False
+        if previous.extensions and not (
+            self.extensions and self.extensions <= previous.extensions
+        ):
+            return False
+        for bound, previous_bound, stricter in (
+            (self.min_size, previous.min_size, max),
+            (self.max_size, previous.max_size, min),
+            (self.min_mtime, previous.min_mtime, max),
+            (self.max_mtime, previous.max_mtime, min),
+        ):
+            if previous_bound is not None and (
+                bound is None or stricter(bound, previous_bound) != bound
+            ):
+                return False
+        return True
+
+    def add_predicate(self, key: str, value: str, now: float):
+        if key == "ext":
+            self.extensions.update(
+                extension.lstrip(".") for extension in value.split(",") if extension
+            )
+        elif key == "type":
+            if value in ("dir", "folder", "directory"):
+                self.kind = "dir"
+            elif value == "file":
+                self.kind = "file"
+            else:
+                raise ValueError(f"Unknown type {value!r}, use type:file or type:dir")
+        elif key == "size":
+            operator, amount = parse_comparison(value)
+            operator = operator or ">="  # size:100MB means at least 100 MB
+            size = parse_size(amount)
+            if operator in ("<", "<=", "="):
+                self.max_size = size - (operator == "<")
+            if operator in (">", ">=", "="):
+                self.min_size = size + (operator == ">")
+        elif key == "modified":
+            operator, amount = parse_comparison(value)
+            if DATE_PATTERN.match(amount):
+                # modified:>2024-01-31 means after that date
+                start = time.mktime(time.strptime(amount, "%Y-%m-%d"))
+                end = start + AGE_UNITS["d"]
+                if operator in (">", ">="):
+                    self.min_mtime = end if operator == ">" else start
+                elif operator in ("<", "<="):
+                    self.max_mtime = start if operator == "<" else end
+                else:  # On that day
+                    self.min_mtime, self.max_mtime = start, end
+            else:
+                # modified:<7d means less than seven days old
+                age = parse_age(amount)
+                if operator in (None, "<", "<=", "="):
+                    self.min_mtime = now - age
+                else:
+                    self.max_mtime = now - age
+
+
+def parse_comparison(value: str) -> tuple[Optional[str], str]:
+    operator, amount = COMPARISON_PATTERN.match(value).groups()
+    return operator, amount
+
+
+def parse_size(value: str) -> int:
+    match = SIZE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid size {value!r}, use e.g. size:>100MB")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_age(value: str) -> float:
+    match = AGE_PATTERN.match(value)
+    if not match:
+        raise ValueError(
+            f"Invalid age {value!r}, use e.g. modified:<7d or modified:>2024-01-31"
+        )
+    return float(match.group(1)) * AGE_UNITS[match.group(2)]
+
+
+class SearchQuery:
+    """A search box query: name terms plus metadata predicates."""
+
+    def __init__(self, text: str, now: float = None):
+        now = time.time() if now is None else now
+        self.text = text
+        self.metadata_filter = MetadataFilter()
+
+        terms = []
+        in_quotes = False
+        for word in text.lower().split():
+            match = None if in_quotes else PREDICATE_PATTERN.match(word)
+            if match:
+                self.metadata_filter.add_predicate(match.group(1), match.group(2), now)
+                continue
+            terms.append(word)
+            if word.count('"') % 2:
+                in_quotes = not in_quotes
+
+        self.include_terms, self.exclude_terms = parse_query(" ".join(terms))
+        self.name_matcher = NameMatcher(self.include_terms, self.exclude_terms)
+
+    def accepts(self, name: str, is_dir: bool, size: int, mtime: float) -> bool:
+        return self.metadata_filter.accepts(
+            name, is_dir, size, mtime
+        ) and self.name_matcher.matches(name)
+
+    def refines(self, previous: "SearchQuery") -> bool:
+        """True if every match of this query is also a match of previous, so
+        previous results can be filtered instead of searching again.
+
+        Each include term of previous must be inside one of ours, and each
+        exclude term of previous must contain one of ours.
+        """
+        return (
+            all(
+                any(term in own_term for own_term in self.include_terms)
+                for term in previous.include_terms
+            )
+            and all(
+                any(own_term in term for own_term in self.exclude_terms)
+                for term in previous.exclude_terms
+            )
+            and self.metadata_filter.refines(previous.metadata_filter)
+        )
+
+
+def compile_search_query(text: str) -> SearchQuery:
+    """Raises ValueError for malformed predicates."""
+    return SearchQuery(text)
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+import os
+import time
+
+from interface.search.search_result import SearchResult
+
+EXACT_SCORE = 100
+PREFIX_SCORE = 50
+# Matches scoring at least this much count towards an early stop
+STRONG_SCORE = PREFIX_SCORE
+DEPTH_PENALTY = 4  # Per directory level below the search root
+MAX_DEPTH_PENALTY = 40
+RECENCY_SCORE = 30  # For a file modified just now, halving every month
+RECENCY_HALF_LIFE = 30 * 86400
+
+
+class RelevanceScorer:
+    """Scores matches of one query.
+
+    A name equal to an include term, with or without its extension, scores
+    highest, then names starting with a term. Shallow and recently modified
+    matches score a little higher, so they break ties between similar names.
+    """
+
+    def __init__(self, include_terms: list[str], now: float = None):
+        self.include_terms = include_terms
+        self.now = time.time() if now is None else now
+
+    def score(self, name: str, path: str, mtime: float, root_path: str) -> float:
+        name = name.lower()
+        stem = name.rpartition(".")[0] or name
+        score = 0.0
+        for term in self.include_terms:
+            if name == term or stem == term:
+                score += EXACT_SCORE
+            elif name.startswith(term):
+                score += PREFIX_SCORE
+
+        depth = path.count(os.sep) - root_path.rstrip(os.sep).count(os.sep) - 1
+        score -= min(depth * DEPTH_PENALTY, MAX_DEPTH_PENALTY)
+
+        age = max(self.now - mtime, 0)
+        score += RECENCY_SCORE * 0.5 ** (age / RECENCY_HALF_LIFE)
+        return score
+
+
+class TopResults:
+    """The k best scored results seen so far, in a bounded min-heap."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.heap: list[tuple[float, int, SearchResult]] = []
+        self.order = itertools.count()  # Earlier results win ties
+        self.strong_matches = 0
+        self.changed = False
+
+    def push(self, score: float, result: SearchResult):
+        if score >= STRONG_SCORE:
+            self.strong_matches += 1
+        item = (score, -next(self.order), result)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+        else:
+            return
+        self.changed = True
+
+    def is_full_of_strong_matches(self) -> bool:
+        return self.strong_matches >= self.k
+
+    def results(self) -> list[SearchResult]:
+        """Best first."""
+        self.changed = False
+        return [result for _, _, result in sorted(self.heap, reverse=True)]
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import threading
+
+from interface.search.content_index import ContentIndex, ContentIndexStats
+from interface.search.filename_index import FilenameIndex
+from interface.search.prune_rules import (
+    DEFAULT_IGNORE_PATTERNS,
+    PruneRules,
+    parse_root_overrides,
+    split_patterns,
+)
+from interface.search.query import compile_search_query
+from interface.search.search_engine import SearchEngine
+from interface.search.search_result import SearchResult
+
+
+def parse_arguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pyfe.py --search",
+        description="Search a folder without opening the file explorer.",
+        epilog="A query starting with - is read as an option; pass it after "
+        "the folder and a --, as in: pyfe.py --search --json ROOT -- -draft",
+    )
+    parser.add_argument("root", help="folder to search")
+    parser.add_argument("query", nargs="?", default="", help="name query")
+    parser.add_argument("--content", default="", help="text the files must contain")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print one JSON object per result and a summary on stderr",
+    )
+    parser.add_argument(
+        "--top", type=int, default=0, help="only print the TOP best matches"
+    )
+    parser.add_argument(
+        "--stop-early",
+        action="store_true",
+        help="with --top, stop once TOP strong matches are found",
+    )
+    parser.add_argument(
+        "--ignore",
+        default=DEFAULT_IGNORE_PATTERNS,
+        help="comma separated folder patterns to skip",
+    )
+    parser.add_argument(
+        "--override",
+        action="append",
+        default=[],
+        metavar="FOLDER=PATTERNS",
+        help="skip PATTERNS instead of --ignore below FOLDER, like the search "
+        "window's per folder overrides; may be repeated",
+    )
+    parser.add_argument(
+        "--gitignore", action="store_true", help="skip folders in .gitignore files"
+    )
+    parser.add_argument(
+        "--index",
+        help="filename index database; folders indexed in it are answered from "
+        "the index, as in the search window",
+    )
+    parser.add_argument(
+        "--content-index", help="content index database to narrow --content with"
+    )
+    parser.add_argument(
+        "--update-content-index",
+        action="store_true",
+        help="index the contents of ROOT into --content-index before searching",
+    )
+    return parser.parse_args(argv)
+
+
+def result_to_json(result: SearchResult) -> str:
+    return json.dumps(result._asdict(), ensure_ascii=False)
+
+
+def main(argv: list[str]) -> int:
+    """Runs the command line search; argv excludes --search itself."""
+    arguments = parse_arguments(argv)
+    root_path = os.path.normpath(os.path.abspath(arguments.root))
+    if not os.path.isdir(root_path):
+        print(f"Not a folder: {arguments.root}", file=sys.stderr)
+        return 2
+    try:
+        search_query = compile_search_query(arguments.query)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    # Relative override folders are taken from the working directory
+    overrides = []
+    for override in arguments.override:
+        folder, _, patterns = override.partition("=")
+        overrides.append(f"{os.path.abspath(folder.strip())}={patterns}")
+    prune_rules = PruneRules(
+        split_patterns(arguments.ignore),
+        arguments.gitignore,
+        parse_root_overrides("\n".join(overrides)),
+    )
+    content_index = None
+    if arguments.content_index:
+        content_index = ContentIndex(arguments.content_index)
+        if arguments.update_content_index:
+            stats = ContentIndexStats()
+            content_index.update(
+                root_path, stats=stats, should_prune=prune_rules.should_prune
+            )
+            print(f"Indexed contents of {root_path}: {stats}", file=sys.stderr)
+
+    output_lock = threading.Lock()
+    format_result = result_to_json if arguments.json else lambda result: result.path
+
+    def write_results(results: list[SearchResult]):
+        # Batches can come from the content scanner's feeder thread too
+        with output_lock:
+            for result in results:
+                sys.stdout.write(format_result(result) + "\n")
+            sys.stdout.flush()
+
+    ranking: list[SearchResult] = []
+
+    def keep_ranking(results: list[SearchResult]):
+        ranking[:] = results
+
+    engine = SearchEngine(
+        [root_path],
+        search_query,
+        arguments.content,
+        FilenameIndex(arguments.index) if arguments.index else None,
+        top_k=arguments.top,
+        stop_early=arguments.stop_early,
+        prune_rules=prune_rules,
+        content_index=content_index,
+        on_results=write_results,
+        on_ranking=keep_ranking,
+    )
+    try:
+        engine.run()
+    except KeyboardInterrupt:
+        engine.stop()
+        return 130
+    except BrokenPipeError:
+        # The reader went away, e.g. piped into head
+        return 0
+
+    write_results(ranking)
+    if arguments.json:
+        print(json.dumps(engine.search_stats.summary()), file=sys.stderr)
+    return 0
@@ -0,0 +1,386 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from interface.search.content_index import ContentIndex
+from interface.search.content_scanner import ContentScanner
+from interface.search.filename_index import FilenameIndex
+from interface.search.parallel_walker import (
+    ParallelWalker,
+    WalkResult,
+    deduplicate_roots,
+)
+from interface.search.prune_rules import PruneRules
+from interface.search.query import SearchQuery
+from interface.search.ranking import RelevanceScorer, TopResults
+from interface.search.search_result import SearchResult
+from interface.search.search_stats import SearchStats
+
+
+class SearchEngine:
+    """Walks, matches and scans for one search, without Qt.
+
+    run() blocks until the search is done or stopped. Results are handed to
+    on_results in batches, or with top_k the current best ones to
+    on_ranking. Content searches also call these from the scanner's feeder
+    thread. The search window runs an engine in a SearchThread, the command
+    line search in the main thread.
+    """
+
+    # Results are sent in batches, at least every RESULT_BATCH_INTERVAL
+    RESULT_BATCH_SIZE = 1000
+    RESULT_BATCH_INTERVAL = 0.05
+    # Ranked results replace the whole table, so they are sent less often
+    RANKING_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        roots: list[str],
+        search_query: SearchQuery,
+        content_query: str,
+        filename_index: FilenameIndex = None,
+        seed_directories: list[str] = None,
+        top_k: int = 0,
+        stop_early: bool = False,
+        prune_rules: PruneRules = None,
+        content_index: ContentIndex = None,
+        on_results: Callable[[list[SearchResult]], None] = None,
+        on_ranking: Callable[[list[SearchResult]], None] = None,
+    ):
+        # Nested roots would be searched twice
+        self.roots = deduplicate_roots(roots)
+        self.search_query = search_query
+        self.content_query = content_query
+        self.include_terms = search_query.include_terms
+        self.exclude_terms = search_query.exclude_terms
+        self.match_query = search_query.name_matcher.matches
+        self.metadata_filter = search_query.metadata_filter
+        self.stop_flag = False
+        self.filename_index = filename_index
+        self.prune_rules = prune_rules
+        self.content_index = content_index
+        # Roots answered by an index are taken out again in run()
+        self.walker = ParallelWalker(
+            list(self.roots),
+            should_prune=self.should_prune,
+            seed_directories=seed_directories,
+        )
+        self.completed = False
+        self.search_stats = SearchStats(self.walker)
+
+        # With top_k, only the best scored matches are kept and sent
+        self.scorer = None
+        self.top_results = None
+        if top_k:
+            self.scorer = RelevanceScorer(self.include_terms)
+            self.top_results = TopResults(top_k)
+        self.stop_early = stop_early
+        self.stopped_early = False
+
+        self.pending_results: list[SearchResult] = []
+        self.results_lock = threading.Lock()
+        self.last_flush = time.perf_counter()
+        self.on_results = on_results or (lambda results: None)
+        self.on_ranking = on_ranking or (lambda results: None)
+
+    def run(self):
+        # Indexed roots are answered from the index, others are walked
+        indexed_roots = [
+            root
+            for root in self.roots
+            if self.filename_index and self.filename_index.find_root(root)
+        ]
+        if self.content_query:
+            self.search_stats.mode = "content"
+            self.search_content(indexed_roots)
+        else:
+            if indexed_roots:
+                self.search_stats.mode = "index"
+            for root in indexed_roots:
+                self.search_index(root)
+            self.set_walk_roots(
+                [root for root in self.roots if root not in indexed_roots]
+            )
+            if self.walker.roots:
+                self.search_stats.mode = "walk"
+                self.search_walk()
+
+        if self.filename_index:
+            self.filename_index.close()
+        if self.content_index:
+            self.content_index.close()
+        self.flush_results(force=True)
+        self.search_stats.finish()
+        self.completed = not self.stop_flag
+
+    def set_walk_roots(self, roots: list[str]):
+        if roots != self.walker.roots:
+            # Seeds may lie below roots that are answered from an index
+            self.walker.roots = roots
+            self.walker.seed_directories = []
+
+    def search_index(self, root: str):
+        search_stats = self.search_stats
+        for entry in self.filename_index.search(
+            root, self.include_terms, self.metadata_filter
+        ):
+            if self.stop_flag or self.stopped_early:
+                break
+            start_time = time.perf_counter()
+            matched = self.match_query(entry.name)
+            search_stats.match_time += time.perf_counter() - start_time
+            if matched:
+                self.emit_result(
+                    entry.name, entry.path, entry.is_dir, entry.size, entry.mtime
+                )
+
+    def search_content(self, indexed_roots: list[str]):
+        # Index lists are read here, since the index connections belong to
+        # this thread and the candidates are consumed on the scanner's
+        # feeder thread
+        candidate_lists = []
+        walk_roots = []
+        for root in self.roots:
+            indexed = None
+            if self.content_index and self.content_index.find_root(root):
+                indexed = self.content_index.candidates(root, self.content_query)
+            if indexed is not None:
+                # Files added or replaced since the last update are scanned too
+                self.search_stats.mode = "content_index"
+                stale = self.content_index.stale_files(
+                    root, self.should_prune, self.should_stop
+                )
+                candidate_lists.append(
+                    self.filter_paths(dict.fromkeys(indexed + stale))
+                )
+            elif root in indexed_roots:
+                candidate_lists.append(
+                    [
+                        entry.path
+                        for entry in self.filename_index.search(
+                            root, self.include_terms, self.metadata_filter
+                        )
+                        if not entry.is_dir and self.match_query(entry.name)
+                    ]
+                )
+            else:
+                walk_roots.append(root)
+
+        self.set_walk_roots(walk_roots)
+        candidates = itertools.chain(*candidate_lists, self.walk_file_candidates())
+
+        # Matches stream back as workers find them, while the walk goes on
+        scanner = ContentScanner(self.content_query)
+        self.search_stats.scanner = scanner
+        for result in scanner.scan(candidates, self.should_stop):
+            self.emit_result(
+                os.path.basename(result.path),
+                result.path,
+                False,
+                result.size,
+                result.mtime,
+            )
+
+    def walk_file_candidates(self) -> Iterator[str]:
+        if not self.metadata_filter.accepts_kind(False):
+            return
+        for _, _, files in self.walk():
+            for entry in self.match_entries(files):
+                # Sizes and dates are checked before any content is read
+                if self.metadata_filter.needs_stat() and not self.accepts_stat(entry):
+                    continue
+                yield entry.path
+
+    def filter_paths(self, paths: Iterable[str]) -> list[str]:
+        # Content index candidates still have to pass the name and metadata
+        # filters the walk would have applied
+        metadata_filter = self.metadata_filter
+        if not metadata_filter.accepts_kind(False):
+            return []
+        candidates = []
+        for path in paths:
+            name = os.path.basename(path)
+            if not (metadata_filter.accepts_name(name) and self.match_query(name)):
+                continue
+            if metadata_filter.needs_stat():
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    continue
+                if not metadata_filter.accepts_stat(
+                    file_stat.st_size, file_stat.st_mtime
+                ):
+                    continue
+            candidates.append(path)
+        return candidates
+
+    def match_entries(self, entries: list[os.DirEntry]) -> list[os.DirEntry]:
+        # Timed on its own, apart from the stats and emits that follow
+        start_time = time.perf_counter()
+        accepts_name = self.metadata_filter.accepts_name
+        match_query = self.match_query
+        matched = [
+            entry
+            for entry in entries
+            if accepts_name(entry.name) and match_query(entry.name)
+        ]
+        self.search_stats.match_time += time.perf_counter() - start_time
+        return matched
+
+    def accepts_stat(self, entry: os.DirEntry) -> bool:
+        entry_stat = self.stat_entry(entry)
+        return entry_stat is not None and self.metadata_filter.accepts_stat(
+            entry_stat.st_size, entry_stat.st_mtime
+        )
+
+    def stat_entry(self, entry: os.DirEntry) -> Optional[os.stat_result]:
+        start_time = time.perf_counter()
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+        finally:
+            self.search_stats.stat_time += time.perf_counter() - start_time
+
+    def walk(self) -> Iterator[WalkResult]:
+        # Time spent waiting here is the disk, the rest is processing
+        search_stats = self.search_stats
+        resumed = time.perf_counter()
+        for result in self.walker.walk(self.should_stop):
+            listed = time.perf_counter()
+            search_stats.wait_time += listed - resumed
+            search_stats.current_directory = result[0]
+            yield result
+            resumed = time.perf_counter()
+            search_stats.process_time += resumed - listed
+
+    def should_stop(self) -> bool:
+        # Polled by the walker and scanner at least every 100 ms, which also
+        # sends results that have waited for a full batch long enough
+        self.flush_results()
+        return self.stop_flag or self.stopped_early
+
+    def should_prune(self, parent: str, entry: os.DirEntry) -> bool:
+        # Skip protected directories only if we're on macOS and at the root level
+        if (
+            sys.platform == "darwin"
+            and parent == "/"
+            and self.is_protected_directory(entry.name)
+        ):
+            return True
+        if self.prune_rules and self.prune_rules.should_prune(parent, entry):
+            return True
+        return False
+
+    def search_walk(self):
+        metadata_filter = self.metadata_filter
+        # Kinds and extensions are checked before the name, sizes and dates
+        # only for names that matched
+        search_dirs = metadata_filter.accepts_kind(True)
+        search_files = metadata_filter.accepts_kind(False)
+        for _, dirs, files in self.walk():
+            for is_dir, entries in ((True, dirs), (False, files)):
+                if not (search_dirs if is_dir else search_files):
+                    continue
+                for entry in self.match_entries(entries):
+                    if self.stop_flag or self.stopped_early:
+                        return
+                    self.emit_entry(entry, is_dir)
+
+    def emit_entry(self, entry: os.DirEntry, is_dir: bool):
+        # The only stat per match; on Windows it comes with the listing
+        entry_stat = self.stat_entry(entry)
+        if entry_stat is None:
+            return
+        if not self.metadata_filter.accepts_stat(
+            entry_stat.st_size, entry_stat.st_mtime
+        ):
+            return
+        self.emit_result(
+            entry.name, entry.path, is_dir, entry_stat.st_size, entry_stat.st_mtime
+        )
+
+    def emit_result(
+        self, name: str, full_path: str, is_dir: bool, size: int, mtime: float
+    ):
+        if self.stop_flag:
+            return
+        self.search_stats.matches += 1
+        result = SearchResult(
+            name, full_path, is_dir, size, mtime, self.root_of(full_path)
+        )
+        if self.top_results:
+            self.rank_result(result)
+            return
+        with self.results_lock:
+            self.pending_results.append(result)
+        self.flush_results()
+
+    def root_of(self, path: str) -> str:
+        if len(self.roots) == 1:
+            return self.roots[0]
+        for root in self.roots:
+            if path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return ""
+
+    def rank_result(self, result: SearchResult):
+        score = self.scorer.score(result.name, result.path, result.mtime, result.root)
+        with self.results_lock:
+            self.top_results.push(score, result)
+            if self.stop_early and self.top_results.is_full_of_strong_matches():
+                self.stopped_early = True
+        self.flush_results()
+
+    def flush_results(self, force: bool = False):
+        if self.top_results:
+            self.flush_ranking(force)
+            return
+        with self.results_lock:
+            if not self.pending_results:
+                return
+            now = time.perf_counter()
+            if (
+                not force
+                and len(self.pending_results) < self.RESULT_BATCH_SIZE
+                and now - self.last_flush < self.RESULT_BATCH_INTERVAL
+            ):
+                return
+            results = self.pending_results
+            self.pending_results = []
+            self.last_flush = now
+        self.on_results(results)
+
+    def flush_ranking(self, force: bool):
+        with self.results_lock:
+            now = time.perf_counter()
+            if not self.top_results.changed or (
+                not force and now - self.last_flush < self.RANKING_INTERVAL
+            ):
+                return
+            results = self.top_results.results()
+            self.last_flush = now
+        self.on_ranking(results)
+
+    def is_protected_directory(self, dirname: str) -> bool:
+        protected_dirs = [
+            "Library",
+            "System",
+            "private",
+            "cores",
+            "etc",
+            "var",
+            "usr",
+            "bin",
+            "sbin",
+            "opt",
+            "Applications",
+        ]
+        return dirname in protected_dirs
+
+    def stop(self):
+        self.stop_flag = True
+
@@ -0,0 +1,12 @@
+from typing import NamedTuple
+
+
+class SearchResult(NamedTuple):
+    """One match, with the raw values the results table formats and sorts."""
+
+    name: str
+    path: str
+    is_dir: bool
+    size: int
+    mtime: float
+    root: str = ""  # The search root it was found under
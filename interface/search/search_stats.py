@@ -0,0 +1,99 @@
+import time
+
+from interface.search.content_scanner import ContentScanner
+from interface.search.parallel_walker import ParallelWalker, WalkStats
+
+
+class SearchStats:
+    """Live throughput of one search, read by the UI while it runs.
+
+    Walk time is split into waiting for directory listings (the disk) and
+    processing the listed entries. Within processing, stat calls and the
+    name and metadata matching are timed on their own; the rest is
+    batching and handing results on, or during content searches handing
+    files to the scanner processes.
+    """
+
+    def __init__(self, walker: ParallelWalker, mode: str = "walk"):
+        self.walker = walker
+        self.mode = mode  # "walk", "index", "content" or "content_index"
+        self.scanner: ContentScanner = None
+        self.current_directory = ""
+        self.matches = 0
+        self.wait_time = 0.0
+        self.process_time = 0.0
+        self.stat_time = 0.0
+        self.match_time = 0.0
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    @property
+    def walk_stats(self) -> WalkStats:
+        # Each walk starts new stats
+        return self.walker.stats
+
+    def finish(self):
+        self.end_time = time.perf_counter()
+
+    def elapsed(self) -> float:
+        end_time = self.end_time or time.perf_counter()
+        return end_time - self.start_time
+
+    def bytes_scanned(self) -> int:
+        return self.scanner.bytes_scanned if self.scanner else 0
+
+    def files_scanned(self) -> int:
+        return self.scanner.files_scanned if self.scanner else 0
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed()
+
+        def per_second(count: float) -> float:
+            return round(count / elapsed, 1) if elapsed > 0 else 0.0
+
+        return {
+            "mode": self.mode,
+            "elapsed": round(elapsed, 3),
+            "matches": self.matches,
+            "directories": self.walk_stats.directories,
+            "files": self.walk_stats.files,
+            "pruned": self.walk_stats.pruned,
+            "errors": self.walk_stats.errors,
+            "directories_per_second": per_second(self.walk_stats.directories),
+            "files_per_second": per_second(self.walk_stats.files),
+            "files_scanned": self.files_scanned(),
+            "bytes_scanned": self.bytes_scanned(),
+            "bytes_per_second": per_second(self.bytes_scanned()),
+            "wait_time": round(self.wait_time, 3),
+            "stat_time": round(self.stat_time, 3),
+            "match_time": round(self.match_time, 3),
+            "process_time": round(self.process_time, 3),
+        }
+
+    def status_text(self) -> str:
+        summary = self.summary()
+        parts = [f"{summary['matches']} results"]
+        if summary["directories"]:
+            parts.append(
+                f"{summary['directories_per_second']:.0f} dirs/s, "
+                f"{summary['files_per_second']:.0f} files/s"
+            )
+        if self.scanner:
+            parts.append(
+                f"{format_bytes(summary['bytes_scanned'])} scanned "
+                f"({format_bytes(summary['bytes_per_second'])}/s)"
+            )
+        if summary["directories"]:
+            parts.append(
+                f"disk {summary['wait_time']:.1f}s, stat {summary['stat_time']:.1f}s, "
+                f"match {summary['match_time']:.1f}s"
+            )
+        return " | ".join(parts)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -8,10 +8,12 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QLabel,
+    QPlainTextEdit,
 )
-from PySide6.QtGui import QAction
+from PySide6.QtGui import QAction, QKeySequence
 
 from interface.constants import settings
+from interface.search.prune_rules import DEFAULT_IGNORE_PATTERNS
 
 from typing import TYPE_CHECKING
 
@@ -78,16 +80,36 @@ class SystemMenuManager:
         chat_window_action.triggered.connect(self.show_chat_window)
         view_menu.addAction(chat_window_action)
 
+        quick_open_action = QAction("Quick Open", self.parent)
+        quick_open_action.setShortcut(QKeySequence("Ctrl+P"))
+        quick_open_action.triggered.connect(self.parent.show_quick_open)
+        view_menu.addAction(quick_open_action)
+
         # Add Search action to View menu
         search_action = QAction("Search Window", self.parent)
         search_action.triggered.connect(self.parent.show_search_window)
         view_menu.addAction(search_action)
 
+        duplicates_action = QAction("Find Duplicates", self.parent)
+        duplicates_action.triggered.connect(self.parent.show_duplicates_window)
+        view_menu.addAction(duplicates_action)
+
         # Add History Explorer action to View menu
         history_explorer_action = QAction("History Explorer", self.parent)
         history_explorer_action.triggered.connect(self.show_history_explorer)
         view_menu.addAction(history_explorer_action)
 
+        view_menu.addSeparator()
+
+        # Sort "file2" before "file10"
+        natural_sort_action = QAction("Natural Sort Order", self.parent)
+        natural_sort_action.setCheckable(True)
+        natural_sort_action.setChecked(
+            bool(settings.value("natural_sort", False, type=bool))
+        )
+        natural_sort_action.toggled.connect(self.set_natural_sort)
+        view_menu.addAction(natural_sort_action)
+
         # Create Options menu
         options_menu = QMenu("Options", self.parent)
         menu_bar.addMenu(options_menu)
@@ -97,6 +119,14 @@ class SystemMenuManager:
         ai_settings_action.triggered.connect(self.show_ai_settings_dialog)
         options_menu.addAction(ai_settings_action)
 
+        search_settings_action = QAction("Search Settings", self.parent)
+        search_settings_action.triggered.connect(self.show_search_settings_dialog)
+        options_menu.addAction(search_settings_action)
+
+    def set_natural_sort(self, enabled: bool):
+        settings.setValue("natural_sort", enabled)
+        self.parent.model.set_natural_sort(enabled)
+
     def show_generate_image_dialog(self):
         self.parent.image_generator.show_generate_image_dialog(
             self.parent, self.parent.current_path
@@ -171,3 +201,53 @@ class SystemMenuManager:
         close_button.clicked.connect(dialog.reject)
 
         dialog.exec()
+
+    def show_search_settings_dialog(self):
+        dialog = QDialog(self.parent)
+        dialog.setWindowTitle("Search Settings")
+        layout = QVBoxLayout()
+
+        # Folders skipped by every search walk
+        layout.addWidget(QLabel("Skip folders (comma separated, * and ? allowed):"))
+        ignore_patterns_input = QLineEdit()
+        ignore_patterns_input.setText(
+            str(settings.value("search_ignore_patterns", DEFAULT_IGNORE_PATTERNS))
+        )
+        layout.addWidget(ignore_patterns_input)
+
+        use_gitignore_checkbox = QCheckBox("Skip folders listed in .gitignore files")
+        use_gitignore_checkbox.setChecked(
+            bool(settings.value("search_use_gitignore", False, type=bool))
+        )
+        layout.addWidget(use_gitignore_checkbox)
+
+        # Per root replacements of the skipped folders
+        layout.addWidget(
+            QLabel('Per folder overrides (one "folder = patterns" per line):')
+        )
+        overrides_input = QPlainTextEdit()
+        overrides_input.setPlainText(str(settings.value("search_prune_overrides", "")))
+        layout.addWidget(overrides_input)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        save_button = QPushButton("Save")
+        close_button = QPushButton("Close")
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        dialog.setLayout(layout)
+
+        def save_settings():
+            settings.setValue("search_ignore_patterns", ignore_patterns_input.text())
+            settings.setValue(
+                "search_use_gitignore", use_gitignore_checkbox.isChecked()
+            )
+            settings.setValue("search_prune_overrides", overrides_input.toPlainText())
+            dialog.accept()
+
+        save_button.clicked.connect(save_settings)
+        close_button.clicked.connect(dialog.reject)
+
+        dialog.exec()
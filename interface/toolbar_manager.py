@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QFileSystemModel,
 )
 from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtCore import QSize, Signal, QObject
+from PySide6.QtCore import QSize, Signal, QObject, QTimer
 import subprocess
 import shlex
 import functools
@@ -30,6 +30,8 @@ class AddressBar(QLineEdit):
 class ToolbarManager(QObject):
     filter_changed = Signal(str)
 
+    FILTER_DEBOUNCE_MS = 150
+
     def __init__(
         self,
         parent: "FileExplorerUI",
@@ -75,8 +77,21 @@ class ToolbarManager(QObject):
         self.filter_bar.setPlaceholderText("Filter")
         self.filter_bar.textChanged.connect(self.on_filter_changed)
 
+        # Typing a word filters once, not once per keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.emit_filter_changed)
+
     def on_filter_changed(self, text):
-        self.filter_changed.emit(text)
+        if text:
+            self.filter_timer.start()
+        else:
+            self.emit_filter_changed()
+
+    def emit_filter_changed(self):
+        self.filter_timer.stop()
+        self.filter_changed.emit(self.filter_bar.text())
 
     def get_filter_text(self) -> str:
         return self.filter_bar.text()
@@ -95,7 +110,7 @@ class ToolbarManager(QObject):
         self.back_btn.clicked.connect(navigation_manager.go_back)
         self.forward_btn.clicked.connect(navigation_manager.go_forward)
         self.up_btn.clicked.connect(navigation_manager.go_up)
-        self.refresh_btn.clicked.connect(self.parent.update_view)
+        self.refresh_btn.clicked.connect(self.parent.refresh_view)
         navigation_manager.path_changed.connect(self.update_address_bar)
 
         handle_address = functools.partial(
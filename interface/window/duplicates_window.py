@@ -0,0 +1,341 @@
+import os
+import uuid
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QItemSelection,
+    QItemSelectionModel,
+    QModelIndex,
+    Qt,
+    QThread,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QCloseEvent, QKeyEvent
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QMainWindow,
+    QMessageBox,
+    QPushButton,
+    QSpinBox,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from interface.constants import settings
+from interface.search.duplicate_finder import DuplicateFinder, DuplicateGroup
+from interface.search.search_stats import format_bytes
+from interface.window.search_window import create_prune_rules, get_prune_settings
+
+
+class DuplicateFinderThread(QThread):
+    groups_found = Signal(list, str)  # DuplicateGroups, search_id
+
+    def __init__(self, root_path: str, min_size: int, search_id: str):
+        super().__init__()
+        self.search_id = search_id
+        self.stop_flag = False
+        self.finder = DuplicateFinder(
+            [root_path],
+            min_size,
+            create_prune_rules(get_prune_settings()).should_prune,
+        )
+
+    def run(self):
+        groups = self.finder.find(lambda: self.stop_flag)
+        self.groups_found.emit(groups, self.search_id)
+
+    def stop(self):
+        self.stop_flag = True
+
+
+class DuplicatesModel(QAbstractTableModel):
+    """One row per duplicate file, grouped, largest reclaimable space first."""
+
+    HEADERS = ["Group", "Name", "Folder", "Size"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.groups: list[DuplicateGroup] = []
+        self.rows: list[tuple[int, str]] = []  # (group number, path)
+
+    def set_groups(self, groups: list[DuplicateGroup]):
+        self.beginResetModel()
+        self.groups = [group for group in groups if len(group.paths) > 1]
+        self.rows = [
+            (number, path)
+            for number, group in enumerate(self.groups)
+            for path in group.paths
+        ]
+        self.endResetModel()
+
+    def remove_paths(self, paths: list[str]):
+        # Groups left with a single copy are no longer duplicates
+        removed = set(paths)
+        self.set_groups(
+            [
+                DuplicateGroup(
+                    group.size, [path for path in group.paths if path not in removed]
+                )
+                for group in self.groups
+            ]
+        )
+
+    def reclaimable(self) -> int:
+        return sum(group.reclaimable for group in self.groups)
+
+    def group_rows(self) -> list[list[int]]:
+        rows: list[list[int]] = [[] for _ in self.groups]
+        for row, (number, _) in enumerate(self.rows):
+            rows[number].append(row)
+        return rows
+
+    def file_path(self, row: int) -> str:
+        return self.rows[row][1]
+
+    def group_number(self, row: int) -> int:
+        return self.rows[row][0]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        number, path = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(number + 1)
+        if column == 1:
+            return os.path.basename(path)
+        if column == 2:
+            return os.path.dirname(path)
+        if column == 3:
+            return format_bytes(self.groups[number].size)
+        return None
+
+
+class DuplicatesWindow(QWidget):
+    def __init__(self, parent: QMainWindow):
+        super().__init__(parent)
+        self.setWindowTitle("Find Duplicates")
+        self.setGeometry(200, 200, 900, 600)
+        self.setWindowFlags(Qt.WindowType.Window)
+
+        layout = QVBoxLayout()
+
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("Path:"))
+        self.path_input = QLineEdit()
+        self.path_input.setReadOnly(True)
+        search_layout.addWidget(self.path_input)
+
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self.browse_directory)
+        search_layout.addWidget(browse_button)
+
+        search_layout.addWidget(QLabel("Min size (KB):"))
+        self.min_size_input = QSpinBox()
+        self.min_size_input.setRange(0, 1024 * 1024)
+        self.min_size_input.setValue(
+            settings.value("duplicates_min_size_kb", 1, type=int)
+        )
+        search_layout.addWidget(self.min_size_input)
+
+        self.find_button = QPushButton("Find")
+        self.find_button.clicked.connect(self.toggle_search)
+        search_layout.addWidget(self.find_button)
+
+        layout.addLayout(search_layout)
+
+        self.model = DuplicatesModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Interactive
+        )
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.doubleClicked.connect(
+            lambda index: self.navigate_to_item(index.row())
+        )
+        self.table.setColumnWidth(0, 60)  # Group column
+        self.table.setColumnWidth(1, 250)  # Name column
+        self.table.setColumnWidth(2, 400)  # Folder column
+        layout.addWidget(self.table)
+
+        actions_layout = QHBoxLayout()
+        select_button = QPushButton("Select Duplicates")
+        select_button.setToolTip("Select every copy but the first of each group")
+        select_button.clicked.connect(self.select_duplicates)
+        actions_layout.addWidget(select_button)
+
+        self.trash_button = QPushButton("Move to Trash")
+        self.trash_button.clicked.connect(self.trash_selected)
+        actions_layout.addWidget(self.trash_button)
+        actions_layout.addStretch()
+        layout.addLayout(actions_layout)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.setLayout(layout)
+
+        self.finder_thread = None
+        self.current_search_id = None
+
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(250)
+        self.status_timer.timeout.connect(self.update_status_label)
+
+    def browse_directory(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Directory")
+        if directory:
+            self.set_path_input(directory)
+
+    def set_path_input(self, path: str):
+        self.path_input.setText(os.path.normpath(path))
+
+    def toggle_search(self):
+        if self.finder_thread and self.finder_thread.isRunning():
+            self.stop_current_search()
+            self.status_label.setText("Stopped")
+            return
+        self.start_search()
+
+    def start_search(self):
+        root_path = self.path_input.text()
+        if not os.path.isdir(root_path):
+            self.status_label.setText(f"Not a folder: {root_path}")
+            return
+
+        self.stop_current_search()
+        settings.setValue("duplicates_min_size_kb", self.min_size_input.value())
+        self.model.set_groups([])
+
+        self.current_search_id = str(uuid.uuid4())
+        self.finder_thread = DuplicateFinderThread(
+            root_path, self.min_size_input.value() * 1024, self.current_search_id
+        )
+        self.finder_thread.groups_found.connect(self.show_groups)
+        self.finder_thread.start()
+        self.find_button.setText("Stop")
+        self.status_timer.start()
+        self.update_status_label()
+
+    def stop_current_search(self):
+        if self.finder_thread and self.finder_thread.isRunning():
+            self.finder_thread.stop()
+            self.finder_thread.wait()
+        self.finder_thread = None
+        self.current_search_id = None
+        self.status_timer.stop()
+        self.find_button.setText("Find")
+
+    def update_status_label(self):
+        if self.finder_thread:
+            self.status_label.setText(self.finder_thread.finder.stats.status_text())
+
+    def show_groups(self, groups: list[DuplicateGroup], search_id: str):
+        if search_id != self.current_search_id:
+            return  # Ignore results from stopped searches
+
+        # run() ends with the emit, so this returns at once
+        self.finder_thread.wait()
+        stats = self.finder_thread.finder.stats
+        print(
+            f"Duplicates: {stats.status_text()}, "
+            f"{format_bytes(stats.bytes_hashed)} hashed"
+        )
+        self.status_timer.stop()
+        self.finder_thread = None
+        self.find_button.setText("Find")
+        self.model.set_groups(groups)
+        self.status_label.setText(stats.status_text())
+
+    def select_duplicates(self):
+        selection = QItemSelection()
+        last_column = self.model.columnCount() - 1
+        for rows in self.model.group_rows():
+            for row in rows[1:]:
+                selection.select(
+                    self.model.index(row, 0), self.model.index(row, last_column)
+                )
+        self.table.selectionModel().select(
+            selection, QItemSelectionModel.SelectionFlag.ClearAndSelect
+        )
+
+    def trash_selected(self):
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        if not rows:
+            return
+
+        # Trashing every copy of a file would not free anything up
+        selected_counts: dict[int, int] = {}
+        for row in rows:
+            number = self.model.group_number(row)
+            selected_counts[number] = selected_counts.get(number, 0) + 1
+        for number, count in selected_counts.items():
+            if count == len(self.model.groups[number].paths):
+                QMessageBox.warning(
+                    self,
+                    "Move to Trash",
+                    f"Every copy in group {number + 1} is selected. "
+                    "Keep at least one of them.",
+                )
+                return
+
+        file_explorer: any = self.parent()
+        paths = [self.model.file_path(row) for row in rows]
+        files_deleted = file_explorer.file_action_manager.delete_files(
+            paths, self.path_input.text()
+        )
+        if not files_deleted:
+            return
+
+        self.model.remove_paths(files_deleted)
+        self.status_label.setText(
+            f"Moved {len(files_deleted)} files to the trash. "
+            f"{len(self.model.groups)} groups left, "
+            f"{format_bytes(self.model.reclaimable())} reclaimable"
+        )
+        # Only files in the folder on display change its rows
+        file_explorer.refresh_entries(files_deleted)
+
+    def navigate_to_item(self, row: int):
+        file_explorer: any = self.parent()
+        file_explorer.navigation_manager.navigate_to(
+            os.path.dirname(self.model.file_path(row))
+        )
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        if event.key() == Qt.Key.Key_Delete:
+            self.trash_selected()
+        else:
+            super().keyPressEvent(event)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.stop_current_search()
+        super().closeEvent(event)
@@ -0,0 +1,198 @@
+import os
+import string
+import time
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtGui import QKeyEvent, QShowEvent
+from PySide6.QtWidgets import (
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QMainWindow,
+    QVBoxLayout,
+    QWidget,
+)
+
+from interface.directory_listing import KIND_DIR
+from interface.search.filename_index import FilenameIndex
+from interface.search.fuzzy_finder import FuzzyFinder
+from interface.window.search_window import get_filename_index_path
+
+# Masks built while loading, so typing them is instant right away
+PREPARED_CHARACTERS = string.ascii_lowercase + string.digits
+
+
+class CandidateLoaderThread(QThread):
+    loaded = Signal(object, float)  # FuzzyFinder, seconds
+
+    def __init__(
+        self,
+        recent_directories: list[str],
+        listings: list[tuple[str, list]],
+        index_path: str,
+    ):
+        super().__init__()
+        self.recent_directories = recent_directories
+        self.listings = listings
+        self.index_path = index_path
+        self.stop_flag = False
+
+    def run(self):
+        start_time = time.perf_counter()
+        finder = FuzzyFinder(self.candidates())
+        if self.stop_flag:
+            return
+        finder.prepare(PREPARED_CHARACTERS)
+        self.loaded.emit(finder, time.perf_counter() - start_time)
+
+    def stop(self):
+        self.stop_flag = True
+
+    def candidates(self):
+        # Recently visited folders first, then recently listed entries, then
+        # everything indexed; earlier ones win ties between equal matches
+        seen = set()
+        recent = [(path, True) for path in self.recent_directories]
+        for directory, rows in self.listings:
+            recent.extend(
+                (os.path.join(directory, row[0]), row[3] == KIND_DIR) for row in rows
+            )
+        for path, is_dir in recent:
+            if path not in seen:
+                seen.add(path)
+                yield path, is_dir
+
+        filename_index = FilenameIndex(self.index_path)
+        try:
+            for path, is_dir in filename_index.iter_entries():
+                if self.stop_flag:
+                    return
+                if path not in seen:
+                    yield path, is_dir
+        finally:
+            filename_index.close()
+
+
+class QuickOpenWindow(QWidget):
+    """Ctrl+P palette that jumps to a file or folder by a fuzzy name."""
+
+    MAX_RESULTS = 50
+
+    def __init__(self, parent: QMainWindow):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.WindowType.Popup)
+        self.resize(600, 400)
+
+        layout = QVBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Go to file or folder...")
+        self.query_input.textEdited.connect(lambda _: self.update_matches())
+        self.query_input.returnPressed.connect(self.open_selected)
+        layout.addWidget(self.query_input)
+
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(self.open_item)
+        layout.addWidget(self.results_list)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        # Kept between openings and refreshed in the background each time
+        self.finder = None
+        self.loader_thread = None
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        file_explorer: any = self.parent()
+        parent_geometry = file_explorer.geometry()
+        self.move(
+            parent_geometry.center().x() - self.width() // 2,
+            parent_geometry.top() + 80,
+        )
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+        self.load_candidates()
+
+    def load_candidates(self):
+        if self.loader_thread and self.loader_thread.isRunning():
+            return
+        file_explorer: any = self.parent()
+        recent_directories = [
+            path for path, _ in file_explorer.navigation_manager.get_history()
+        ]
+        recent_directories += file_explorer.get_favorite_directories()
+        self.loader_thread = CandidateLoaderThread(
+            recent_directories,
+            file_explorer.listing_cache.snapshot(),
+            get_filename_index_path(),
+        )
+        self.loader_thread.loaded.connect(self.on_candidates_loaded)
+        self.loader_thread.start()
+        if self.finder is None:
+            self.status_label.setText("Loading paths...")
+
+    def on_candidates_loaded(self, finder: FuzzyFinder, seconds: float):
+        print(f"Quick open: {len(finder)} paths loaded in {seconds:.2f}s")
+        self.finder = finder
+        self.update_matches()
+
+    def update_matches(self):
+        if self.finder is None:
+            return
+        query = self.query_input.text()
+        start_time = time.perf_counter()
+        matches = self.finder.match(query, self.MAX_RESULTS)
+        milliseconds = (time.perf_counter() - start_time) * 1000
+
+        file_explorer: any = self.parent()
+        self.results_list.clear()
+        for match in matches:
+            item = QListWidgetItem(
+                file_explorer.icon_mapper.get_icon_for_name(match.name, match.is_dir),
+                f"{match.name}    {os.path.dirname(match.path)}",
+            )
+            item.setData(Qt.UserRole, match.path)
+            item.setToolTip(match.path)
+            self.results_list.addItem(item)
+        if matches:
+            self.results_list.setCurrentRow(0)
+
+        if query.strip():
+            self.status_label.setText(
+                f"{len(matches)} of {len(self.finder)} paths ({milliseconds:.0f} ms)"
+            )
+        else:
+            self.status_label.setText(f"{len(self.finder)} paths")
+
+    def open_selected(self):
+        item = self.results_list.currentItem()
+        if item:
+            self.open_item(item)
+
+    def open_item(self, item: QListWidgetItem):
+        path = item.data(Qt.UserRole)
+        file_explorer: any = self.parent()
+        if os.path.isdir(path):
+            file_explorer.navigation_manager.navigate_to(path)
+        else:
+            file_explorer.navigation_manager.navigate_to(os.path.dirname(path))
+        self.close()
+
+    def shutdown(self):
+        if self.loader_thread and self.loader_thread.isRunning():
+            self.loader_thread.stop()
+            self.loader_thread.wait()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        # The query keeps focus, so the list is moved from here
+        if event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up):
+            step = 1 if event.key() == Qt.Key.Key_Down else -1
+            row = self.results_list.currentRow() + step
+            if 0 <= row < self.results_list.count():
+                self.results_list.setCurrentRow(row)
+        elif event.key() == Qt.Key.Key_Escape:
+            self.close()
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,221 @@
+from array import array
+import math
+from typing import Callable
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+from interface.directory_listing import KIND_DIR, KIND_FILE, format_mtime
+from interface.directory_model import get_file_type
+from interface.search.search_result import SearchResult
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """Append-only table of search results stored column by column.
+
+    Rows keep their raw size and mtime; the displayed strings are formatted
+    only for the cells the view paints, and sorting uses the raw values.
+    """
+
+    HEADERS = ["Name", "Path", "Date Modified", "Type", "Size", "Root"]
+    ROOT_COLUMN = 5
+
+    # Results arriving while sorted are merged by one coalesced re-sort
+    RESORT_DELAY_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.clear_columns()
+
+        self.resort_timer = QTimer(self)
+        self.resort_timer.setSingleShot(True)
+        self.resort_timer.setInterval(self.RESORT_DELAY_MS)
+        self.resort_timer.timeout.connect(self.resort)
+
+    def clear_columns(self):
+        self.names: list[str] = []
+        self.paths: list[str] = []
+        self.is_dirs = array("b")
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.roots: list[str] = []
+
+    def extend_columns(self, results: list[SearchResult]):
+        names, paths, is_dirs, sizes, mtimes, roots = zip(*results)
+        self.names.extend(names)
+        self.paths.extend(paths)
+        self.is_dirs.extend(is_dirs)
+        self.sizes.extend(sizes)
+        self.mtimes.extend(mtimes)
+        self.roots.extend(roots)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.names[row]
+            if column == 1:
+                return self.paths[row]
+            if column == 2:
+                return format_mtime(self.mtimes[row])
+            if column == 3:
+                return self.file_type(row)
+            if column == 4:
+                if self.is_dirs[row]:
+                    return ""
+                return f"{math.ceil(self.sizes[row] / 1024)} KB"
+            if column == 5:
+                return self.roots[row]
+
+        elif role == Qt.UserRole:
+            if column == 0:
+                return self.paths[row]
+            return self.sort_key(row, column)
+
+        return None
+
+    def file_type(self, row: int) -> str:
+        kind = KIND_DIR if self.is_dirs[row] else KIND_FILE
+        return get_file_type(self.names[row], kind)
+
+    def file_path(self, row: int) -> str:
+        return self.paths[row]
+
+    def get_result(self, row: int) -> SearchResult:
+        return SearchResult(
+            self.names[row],
+            self.paths[row],
+            bool(self.is_dirs[row]),
+            self.sizes[row],
+            self.mtimes[row],
+            self.roots[row],
+        )
+
+    def sort_key(self, row: int, column: int):
+        if column == 0:
+            return self.names[row].casefold()
+        if column == 1:
+            return self.paths[row].casefold()
+        if column == 2:
+            return self.mtimes[row]
+        if column == 3:
+            return self.file_type(row).lower()
+        if column == 4:
+            return -1 if self.is_dirs[row] else self.sizes[row]
+        if column == 5:
+            return self.roots[row].casefold()
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.resort_timer.stop()
+        self.clear_columns()
+        self.endResetModel()
+
+    def set_results(self, results: list[SearchResult]):
+        self.beginResetModel()
+        self.clear_columns()
+        if results:
+            self.extend_columns(results)
+        self.endResetModel()
+        if self.sort_column >= 0:
+            self.resort()
+
+    def retain(self, keep: Callable[[str, bool, int, float], bool]) -> int:
+        """Drops the rows keep rejects, in place and in order; returns the
+        number of rows left."""
+        rows = [
+            row
+            for row in range(len(self.names))
+            if keep(
+                self.names[row],
+                bool(self.is_dirs[row]),
+                self.sizes[row],
+                self.mtimes[row],
+            )
+        ]
+        if len(rows) == len(self.names):
+            return len(rows)
+
+        self.beginResetModel()
+        self.names = [self.names[row] for row in rows]
+        self.paths = [self.paths[row] for row in rows]
+        self.is_dirs = array("b", [self.is_dirs[row] for row in rows])
+        self.sizes = array("q", [self.sizes[row] for row in rows])
+        self.mtimes = array("d", [self.mtimes[row] for row in rows])
+        self.roots = [self.roots[row] for row in rows]
+        self.endResetModel()
+        return len(rows)
+
+    def append_results(self, results: list[SearchResult]):
+        if not results:
+            return
+
+        first = len(self.names)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self.extend_columns(results)
+        self.endInsertRows()
+
+        if self.sort_column >= 0 and not self.resort_timer.isActive():
+            self.resort_timer.start()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        # Column -1 keeps the order results were found in
+        self.sort_column = column
+        self.sort_order = order
+        self.resort()
+
+    def resort(self):
+        self.resort_timer.stop()
+        if self.sort_column < 0 or not self.names:
+            return
+
+        column = self.sort_column
+        keys = [self.sort_key(row, column) for row in range(len(self.names))]
+        new_order = sorted(
+            range(len(keys)),
+            key=keys.__getitem__,
+            reverse=self.sort_order == Qt.DescendingOrder,
+        )
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        new_rows = [0] * len(new_order)
+        for new_row, old_row in enumerate(new_order):
+            new_rows[old_row] = new_row
+        self.changePersistentIndexList(
+            old_indexes,
+            [
+                self.index(new_rows[index.row()], index.column())
+                for index in old_indexes
+            ],
+        )
+
+        self.names = [self.names[row] for row in new_order]
+        self.paths = [self.paths[row] for row in new_order]
+        self.is_dirs = array("b", [self.is_dirs[row] for row in new_order])
+        self.sizes = array("q", [self.sizes[row] for row in new_order])
+        self.mtimes = array("d", [self.mtimes[row] for row in new_order])
+        self.roots = [self.roots[row] for row in new_order]
+        self.layoutChanged.emit()
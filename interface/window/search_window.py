@@ -1,8 +1,7 @@
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QLabel,
     QAbstractItemView,
@@ -10,145 +9,163 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QFileDialog,
+    QCheckBox,
 )
-from PySide6.QtCore import Qt, QThread, Signal, QFileInfo
+from PySide6.QtCore import Qt, QThread, Signal, QStandardPaths, QTimer
 from PySide6.QtWidgets import QMainWindow
+import json
 import os
-import sys
-import math
 import uuid  # Add this import
 
 from PySide6.QtGui import QShowEvent, QCloseEvent, QKeyEvent
+from interface.constants import settings
+from interface.search.content_index import ContentIndex, ContentIndexStats
+from interface.search.filename_index import FilenameIndex, IndexStats
+from interface.search.parallel_walker import deduplicate_roots
+from interface.search.prune_rules import (
+    DEFAULT_IGNORE_PATTERNS,
+    PruneRules,
+    parse_root_overrides,
+    split_patterns,
+)
+from interface.search.query import SearchQuery, compile_search_query
+from interface.search.search_engine import SearchEngine
+from interface.search.search_result import SearchResult
+from interface.window.search_results_model import SearchResultsModel
 
 
-class SearchThread(QThread):
-    result_found = Signal(str, str, str, str, str, str)  # Add search_id to the signal
-    finished = Signal(str)  # Add search_id to the finished signal
+def get_filename_index_path() -> str:
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, "filename_index.db")
+
+
+def get_content_index_path() -> str:
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, "content_index.db")
+
+
+def get_prune_settings() -> tuple[str, bool, str]:
+    return (
+        settings.value("search_ignore_patterns", DEFAULT_IGNORE_PATTERNS),
+        settings.value("search_use_gitignore", False, type=bool),
+        settings.value("search_prune_overrides", ""),
+    )
+
+
+def create_prune_rules(prune_settings: tuple[str, bool, str]) -> PruneRules:
+    ignore_patterns, use_gitignore, root_overrides = prune_settings
+    return PruneRules(
+        split_patterns(ignore_patterns),
+        use_gitignore,
+        parse_root_overrides(root_overrides),
+    )
+
+
+class IndexerThread(QThread):
+    root_indexed = Signal(str, str)  # root, stats
+    contents_indexed = Signal(str, str)  # root, stats
 
     def __init__(
-        self, root_path: str, name_query: str, content_query: str, search_id: str
+        self,
+        filename_index: FilenameIndex,
+        roots: list[str],
+        content_index: ContentIndex = None,
+        content_roots: list[str] = None,
+        prune_rules: PruneRules = None,
     ):
         super().__init__()
-        self.root_path = root_path
-        self.content_query = content_query
-        self.include_terms, self.exclude_terms = self.parse_query(name_query)
+        self.filename_index = filename_index
+        self.roots = roots
+        self.content_index = content_index
+        self.content_roots = content_roots or []
+        self.prune_rules = prune_rules
         self.stop_flag = False
-        self.search_id = search_id  # Store the search_id
-
-    def parse_query(self, query: str) -> tuple[list[str], list[str]]:
-        include_terms = []
-        exclude_terms = []
-        current_phrase = []
-        in_quotes = False
-        excluding = False
-        for word in query.lower().split():
-            if word.startswith("-"):
-                excluding = True
-                word = word[1:]  # Remove the leading '-'
-
-            if word.startswith('"') and word.endswith('"'):
-                term = word.strip('"')
-                (exclude_terms if excluding else include_terms).append(term)
-                excluding = False
-            elif word.startswith('"'):
-                in_quotes = True
-                current_phrase = [word.strip('"')]
-            elif word.endswith('"'):
-                in_quotes = False
-                current_phrase.append(word.strip('"'))
-                term = " ".join(current_phrase)
-                (exclude_terms if excluding else include_terms).append(term)
-                current_phrase = []
-                excluding = False
-            elif in_quotes:
-                current_phrase.append(word)
-            else:
-                (exclude_terms if excluding else include_terms).append(word)
-                excluding = False
-
-        if current_phrase:
-            term = " ".join(current_phrase)
-            (exclude_terms if excluding else include_terms).append(term)
-
-        return include_terms, exclude_terms
-
-    def match_query(self, name: str) -> bool:
-        name_lower = name.lower()
-
-        # Check exclude terms first
-        for term in self.exclude_terms:
-            if term in name_lower:
-                return False
-
-        # Then check include terms
-        for term in self.include_terms:
-            if " " in term:
-                # Quoted phrase: must match exactly
-                if term not in name_lower:
-                    return False
-            else:
-                # Single word: must exist somewhere in the name
-                if term not in name_lower:
-                    return False
-
-        return True
 
     def run(self):
-        for root, dirs, files in os.walk(self.root_path, topdown=True):
+        for root in self.roots:
+            stats = IndexStats()
+            completed = self.filename_index.update(
+                root,
+                lambda: self.stop_flag,
+                stats,
+                self.prune_rules.should_prune if self.prune_rules else None,
+            )
+            if not completed:
+                break
+            self.root_indexed.emit(root, str(stats))
+        self.filename_index.close()
+
+        # Contents go second, since they take much longer to read
+        for root in self.content_roots:
             if self.stop_flag:
                 break
+            stats = ContentIndexStats()
+            completed = self.content_index.update(
+                root,
+                lambda: self.stop_flag,
+                stats,
+                self.prune_rules.should_prune if self.prune_rules else None,
+            )
+            if not completed:
+                break
+            self.contents_indexed.emit(root, str(stats))
+        if self.content_index:
+            self.content_index.close()
 
-            # Skip protected directories only if we're on macOS and at the root level
-            if sys.platform == "darwin" and root == "/":
-                dirs[:] = [d for d in dirs if not self.is_protected_directory(d)]
-
-            for name in dirs + files:
-                if self.stop_flag:
-                    break
-                if self.match_query(name):
-                    full_path = os.path.join(root, name)
-                    file_info = QFileInfo(full_path)
-                    date_modified = file_info.lastModified().toString(
-                        "yyyy-MM-dd HH:mm:ss"
-                    )
-                    file_type = (
-                        "File folder" if file_info.isDir() else file_info.suffix()
-                    )
-                    size_kb = math.ceil(file_info.size() / 1024)
-                    size = f"{size_kb} KB" if file_info.isFile() else ""
-                    if not self.stop_flag:
-                        self.result_found.emit(
-                            name,
-                            full_path,
-                            date_modified,
-                            file_type,
-                            size,
-                            self.search_id,
-                        )
+    def stop(self):
+        self.stop_flag = True
 
-        self.finished.emit(self.search_id)
 
-    def is_protected_directory(self, dirname: str) -> bool:
-        protected_dirs = [
-            "Library",
-            "System",
-            "private",
-            "cores",
-            "etc",
-            "var",
-            "usr",
-            "bin",
-            "sbin",
-            "opt",
-            "Applications",
-        ]
-        return dirname in protected_dirs
+class SearchThread(QThread):
+    results_found = Signal(list, str)  # Batch of SearchResult, search_id
+    ranking_changed = Signal(list, str)  # Best SearchResults so far, search_id
+    finished = Signal(str)  # Add search_id to the finished signal
+
+    def __init__(
+        self,
+        roots: list[str],
+        search_query: SearchQuery,
+        content_query: str,
+        search_id: str,
+        filename_index: FilenameIndex = None,
+        seed_directories: list[str] = None,
+        top_k: int = 0,
+        stop_early: bool = False,
+        prune_rules: PruneRules = None,
+        content_index: ContentIndex = None,
+    ):
+        super().__init__()
+        self.search_id = search_id  # Store the search_id
+        self.engine = SearchEngine(
+            roots,
+            search_query,
+            content_query,
+            filename_index,
+            seed_directories,
+            top_k,
+            stop_early,
+            prune_rules,
+            content_index,
+            on_results=lambda results: self.results_found.emit(results, search_id),
+            on_ranking=lambda results: self.ranking_changed.emit(results, search_id),
+        )
+
+    def run(self):
+        self.engine.run()
+        self.finished.emit(self.search_id)
 
     def stop(self):
-        self.stop_flag = True
+        self.engine.stop()
 
 
 class SearchWindow(QWidget):
+    LIVE_SEARCH_DELAY_MS = 300
+    # Shorter names match most of the tree, so only Enter searches for them
+    MIN_LIVE_SEARCH_LENGTH = 2
+    TOP_K = 100
+
     def __init__(self, parent: QMainWindow):
         super().__init__(parent)
         self.setWindowTitle("Search Results")
@@ -173,26 +190,72 @@ class SearchWindow(QWidget):
         self.browse_button.clicked.connect(self.browse_directory)
         search_layout.addWidget(self.browse_button)
 
+        self.index_button = QPushButton("Index")
+        self.index_button.setToolTip("Keep an index of this folder for instant search")
+        self.index_button.clicked.connect(self.index_current_path)
+        search_layout.addWidget(self.index_button)
+
+        self.index_contents_button = QPushButton("Index Contents")
+        self.index_contents_button.setToolTip(
+            "Keep an index of the text in this folder for fast content search"
+        )
+        self.index_contents_button.clicked.connect(self.index_current_path_contents)
+        search_layout.addWidget(self.index_contents_button)
+
+        self.favorites_checkbox = QCheckBox("All favorites")
+        self.favorites_checkbox.setToolTip(
+            "Search every favorite folder at once instead of the path"
+        )
+        self.favorites_checkbox.toggled.connect(self.on_favorites_toggled)
+        search_layout.addWidget(self.favorites_checkbox)
+
         search_layout.addWidget(QLabel("Content:"))
         self.content_input = QLineEdit()
         search_layout.addWidget(self.content_input)
 
-        layout.addLayout(search_layout)
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self.start_search_from_input)
+        search_layout.addWidget(self.search_button)
+
+        self.ranked_checkbox = QCheckBox("Best matches")
+        self.ranked_checkbox.setToolTip(
+            f"Show the {self.TOP_K} most relevant results instead of all of them"
+        )
+        self.ranked_checkbox.setChecked(
+            settings.value("search_ranked", False, type=bool)
+        )
+        search_layout.addWidget(self.ranked_checkbox)
 
-        # Existing table widget setup
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(
-            ["Name", "Path", "Date Modified", "Type", "Size"]
+        self.stop_early_checkbox = QCheckBox("Stop early")
+        self.stop_early_checkbox.setToolTip(
+            f"Stop searching once {self.TOP_K} strong matches are found"
+        )
+        self.stop_early_checkbox.setChecked(
+            settings.value("search_stop_early", True, type=bool)
         )
+        self.stop_early_checkbox.setEnabled(self.ranked_checkbox.isChecked())
+        search_layout.addWidget(self.stop_early_checkbox)
+
+        self.ranked_checkbox.toggled.connect(self.on_ranking_options_changed)
+        self.stop_early_checkbox.toggled.connect(self.on_ranking_options_changed)
+
+        layout.addLayout(search_layout)
+
+        self.results_model = SearchResultsModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.results_model)
         self.table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Interactive
         )
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.verticalHeader().setVisible(False)
+        # Fixed row heights keep scrolling cheap with many rows
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table.cellDoubleClicked.connect(self.navigate_to_item)
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.table.doubleClicked.connect(
+            lambda index: self.navigate_to_item(index.row(), index.column())
+        )
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
 
         # Set column widths similar to the file explorer
@@ -201,8 +264,12 @@ class SearchWindow(QWidget):
         self.table.setColumnWidth(2, 150)  # Date Modified column
         self.table.setColumnWidth(3, 100)  # Type column
         self.table.setColumnWidth(4, 100)  # Size column
+        # Only shown when searching several roots
+        self.table.setColumnHidden(SearchResultsModel.ROOT_COLUMN, True)
 
-        self.table.setSortingEnabled(False)
+        # Results stay in the order they were found until a header is clicked
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
 
         layout.addWidget(self.table)
 
@@ -215,9 +282,34 @@ class SearchWindow(QWidget):
         self.search_thread = None
         self.result_count = 0
         self.current_search_id = None
+        self.current_prune_settings = None
+
+        # Live search metrics, four times a second while a search runs
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(250)
+        self.status_timer.timeout.connect(self.update_status_label)
+        # SearchStats.summary() of the last finished search
+        self.last_search_summary = None
+
+        # Searches follow typing once it pauses
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(self.LIVE_SEARCH_DELAY_MS)
+        self.live_search_timer.timeout.connect(self.start_search_from_input)
+
+        # The last completed search, refined in memory while the query narrows
+        self.last_search = None  # (roots, search_query, content_query)
+        # Directories of the last walk, seeding the next walk of the same root
+        # with the same prune settings
+        self.last_walk = None  # (roots, prune_settings, walked_directories)
+
+        self.filename_index = FilenameIndex(get_filename_index_path())
+        self.content_index = ContentIndex(get_content_index_path())
+        self.indexer_thread = None
 
         # Connect input fields to search function
         self.name_input.returnPressed.connect(self.start_search_from_input)
+        self.name_input.textEdited.connect(self.on_name_edited)
         self.content_input.returnPressed.connect(self.start_search_from_input)
 
     def browse_directory(self):
@@ -228,23 +320,113 @@ class SearchWindow(QWidget):
             self.path_input.setText(directory)
             self.start_search_from_input()
 
+    def index_current_path(self):
+        path = self.path_input.text()
+        if os.path.isdir(path):
+            self.start_indexer([os.path.normpath(path)])
+
+    def index_current_path_contents(self):
+        path = self.path_input.text()
+        if os.path.isdir(path):
+            self.start_indexer([], [os.path.normpath(path)])
+
+    def start_indexer(self, roots: list[str], content_roots: list[str] = ()):
+        if not roots and not content_roots:
+            return
+        if self.indexer_thread and self.indexer_thread.isRunning():
+            roots = self.indexer_thread.roots + [
+                root for root in roots if root not in self.indexer_thread.roots
+            ]
+            content_roots = self.indexer_thread.content_roots + [
+                root
+                for root in content_roots
+                if root not in self.indexer_thread.content_roots
+            ]
+            self.stop_indexer()
+
+        self.indexer_thread = IndexerThread(
+            self.filename_index,
+            roots,
+            self.content_index,
+            list(content_roots),
+            create_prune_rules(get_prune_settings()),
+        )
+        self.indexer_thread.root_indexed.connect(self.on_root_indexed)
+        self.indexer_thread.contents_indexed.connect(self.on_contents_indexed)
+        self.indexer_thread.start()
+
+    def stop_indexer(self):
+        if self.indexer_thread and self.indexer_thread.isRunning():
+            self.indexer_thread.stop()
+            self.indexer_thread.wait()
+            self.indexer_thread.deleteLater()
+            self.indexer_thread = None
+
+    def on_root_indexed(self, root: str, stats: str):
+        print(f"Indexed {root}: {stats}")
+        if not self.search_thread or not self.search_thread.isRunning():
+            self.status_label.setText(f"Indexed {root}")
+
+    def on_contents_indexed(self, root: str, stats: str):
+        print(f"Indexed contents of {root}: {stats}")
+        if not self.search_thread or not self.search_thread.isRunning():
+            self.status_label.setText(f"Indexed contents of {root}: {stats}")
+
     def start_search(self, root_path: str, name_query: str, content_query: str):
+        self.live_search_timer.stop()
         self.stop_current_search()
-        self.table.setRowCount(0)
-        self.table.clearContents()  # Clear all items from the table
-        self.result_count = 0
-        self.status_label.setText("Searching...")
+        self.status_timer.stop()
 
         if not os.path.isdir(root_path):
             root_path = os.path.expanduser("~")
+        roots = (root_path,)
+        if self.favorites_checkbox.isChecked():
+            file_explorer: any = self.parent()
+            roots = tuple(deduplicate_roots(file_explorer.get_favorite_directories()))
+        self.table.setColumnHidden(SearchResultsModel.ROOT_COLUMN, len(roots) < 2)
+
+        try:
+            search_query = compile_search_query(name_query)
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+
+        if self.refine_last_search(roots, search_query, content_query):
+            return
+
+        self.results_model.clear()
+        self.result_count = 0
+        self.last_search = None
+        if len(roots) > 1:
+            self.status_label.setText(f"Searching {len(roots)} folders...")
+        else:
+            self.status_label.setText("Searching...")
+
+        ranked = self.ranked_checkbox.isChecked()
+        prune_settings = get_prune_settings()
+        self.current_prune_settings = prune_settings
+        seed_directories = None
+        if self.last_walk and self.last_walk[:2] == (roots, prune_settings):
+            seed_directories = self.last_walk[2]
 
         self.current_search_id = str(uuid.uuid4())  # Generate a new search ID
         self.search_thread = SearchThread(
-            root_path, name_query, content_query, self.current_search_id
+            list(roots),
+            search_query,
+            content_query,
+            self.current_search_id,
+            self.filename_index,
+            seed_directories,
+            self.TOP_K if ranked else 0,
+            ranked and self.stop_early_checkbox.isChecked(),
+            create_prune_rules(prune_settings),
+            self.content_index,
         )
-        self.search_thread.result_found.connect(self.add_result)
+        self.search_thread.results_found.connect(self.add_results)
+        self.search_thread.ranking_changed.connect(self.show_ranking)
         self.search_thread.finished.connect(self.search_finished)
         self.search_thread.start()
+        self.status_timer.start()
 
         # Ensure the window is visible and in focus
         self.show()
@@ -252,54 +434,125 @@ class SearchWindow(QWidget):
         self.raise_()
         self.setFocus(Qt.FocusReason.OtherFocusReason)
 
+    def refine_last_search(
+        self, roots: tuple[str, ...], search_query: SearchQuery, content_query: str
+    ) -> bool:
+        # A narrower query only matches a subset of the last results, so
+        # those are filtered instead of walking the tree again
+        if not self.last_search:
+            return False
+        last_roots, last_query, last_content = self.last_search
+        if (
+            roots != last_roots
+            or content_query != last_content
+            or not search_query.refines(last_query)
+        ):
+            return False
+
+        self.current_search_id = None
+        self.result_count = self.results_model.retain(search_query.accepts)
+        self.last_search = (roots, search_query, content_query)
+        self.status_label.setText(f"Refined to {self.result_count} results")
+        return True
+
     def stop_current_search(self):
         if self.search_thread and self.search_thread.isRunning():
+            self.status_timer.stop()
             self.search_thread.stop()
             self.search_thread.wait()
             self.search_thread.deleteLater()
             self.search_thread = None
 
-    def add_result(
-        self,
-        name: str,
-        full_path: str,
-        date_modified: str,
-        file_type: str,
-        size: str,
-        search_id: str,
-    ):
+    def add_results(self, results: list[SearchResult], search_id: str):
         if search_id != self.current_search_id:
             return  # Ignore results from old searches
 
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(name))
-        self.table.setItem(row, 1, QTableWidgetItem(full_path))
-        self.table.setItem(row, 2, QTableWidgetItem(date_modified))
-        self.table.setItem(row, 3, QTableWidgetItem(file_type))
-        self.table.setItem(row, 4, QTableWidgetItem(size))
-        # Set the full path as item data for later use
-        self.table.item(row, 0).setData(Qt.ItemDataRole.UserRole, full_path)
+        self.results_model.append_results(results)
+        self.result_count += len(results)
+
+    def show_ranking(self, results: list[SearchResult], search_id: str):
+        if search_id != self.current_search_id:
+            return
+
+        self.results_model.set_results(results)
+        self.result_count = len(results)
 
-        # Set custom sort role data for the size column
-        size_item = self.table.item(row, 4)
-        size_value = int(size.split()[0]) if size else -1
-        size_item.setData(Qt.ItemDataRole.UserRole, size_value)
+    def on_favorites_toggled(self, checked: bool):
+        self.path_input.setEnabled(not checked)
+        self.browse_button.setEnabled(not checked)
+        if self.name_input.text() or self.content_input.text():
+            self.start_search_from_input()
 
-        self.result_count += 1
-        self.update_status_label()
+    def on_ranking_options_changed(self):
+        settings.setValue("search_ranked", self.ranked_checkbox.isChecked())
+        settings.setValue("search_stop_early", self.stop_early_checkbox.isChecked())
+        self.stop_early_checkbox.setEnabled(self.ranked_checkbox.isChecked())
+        self.last_search = None
+        if self.name_input.text():
+            self.start_search_from_input()
 
     def update_status_label(self):
-        self.status_label.setText(f"Found {self.result_count} results")
+        if not self.search_thread:
+            return
+        search_stats = self.search_thread.engine.search_stats
+        status = f"Searching... {search_stats.status_text()}"
+        if search_stats.current_directory:
+            status += f" | {search_stats.current_directory}"
+        # Long paths are shortened rather than widening the window
+        self.status_label.setText(
+            self.status_label.fontMetrics().elidedText(
+                status, Qt.TextElideMode.ElideMiddle, self.status_label.width()
+            )
+        )
 
     def search_finished(self, search_id: str):
         if search_id != self.current_search_id:
             return  # Ignore finished signal from old searches
 
-        self.status_label.setText(f"Search complete. Found {self.result_count} results")
+        self.status_timer.stop()
+        status = f"Search complete. Found {self.result_count} results"
+        if not self.search_thread:
+            self.status_label.setText(status)
+            return
+
+        engine = self.search_thread.engine
+        # A refined query can rank results that were not kept
+        if engine.completed and not engine.top_results:
+            self.last_search = (
+                tuple(engine.roots),
+                engine.search_query,
+                engine.content_query,
+            )
+        if engine.walker.walked_directories:
+            self.last_walk = (
+                tuple(engine.roots),
+                self.current_prune_settings,
+                engine.walker.walked_directories,
+            )
+
+        if engine.top_results:
+            status = f"Search complete. Showing the {self.result_count} best results"
+            if engine.stopped_early:
+                status += ", stopped early"
+        walk_stats = engine.walker.stats
+        if walk_stats.directories:
+            status += f" ({walk_stats.directories_per_second():.0f} directories/s"
+            if walk_stats.pruned:
+                status += f", {walk_stats.pruned} folders skipped"
+            status += ")"
+            print(f"Search walk: {walk_stats}")
+
+        self.last_search_summary = engine.search_stats.summary()
+        print(f"Search summary: {json.dumps(self.last_search_summary)}")
+        self.status_label.setToolTip(
+            "\n".join(
+                f"{key}: {value}" for key, value in self.last_search_summary.items()
+            )
+        )
+        self.status_label.setText(status)
 
     def navigate_to_item(self, row: int, _: int):
-        path = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        path = self.results_model.file_path(row)
         file_explorer: any = self.parent()
 
         if os.path.isdir(path):
@@ -307,7 +560,7 @@ class SearchWindow(QWidget):
         else:
             file_explorer.navigation_manager.navigate_to(os.path.dirname(path))
 
-    def on_selection_changed(self):
+    def on_selection_changed(self, *_):
         # Enable key press events when an item is selected
         self.setFocus()
 
@@ -336,10 +589,30 @@ class SearchWindow(QWidget):
         self.position_window()
         self.raise_()
 
+        # Indexed roots are refreshed from directory mtimes whenever shown,
+        # indexed contents from file mtimes
+        if not self.indexer_thread or not self.indexer_thread.isRunning():
+            self.start_indexer(
+                self.filename_index.get_roots(), self.content_index.get_roots()
+            )
+
     def closeEvent(self, event: QCloseEvent) -> None:
         self.stop_current_search()
+        self.stop_indexer()
         super().closeEvent(event)
 
+    def on_name_edited(self, query: str):
+        if len(query.strip()) >= self.MIN_LIVE_SEARCH_LENGTH:
+            self.live_search_timer.start()
+            return
+        self.live_search_timer.stop()
+        self.stop_current_search()
+        self.current_search_id = None
+        self.results_model.clear()
+        self.result_count = 0
+        self.last_search = None
+        self.status_label.setText("")
+
     def start_search_from_input(self):
         query = self.name_input.text()
         path = self.path_input.text()
@@ -1,9 +1,19 @@
+import multiprocessing
 import os
 import sys
-from PySide6.QtWidgets import QApplication
-from interface.file_explorer_ui import FileExplorerUI
 
 if __name__ == "__main__":
+    # Search workers are spawned, which re-runs this module in frozen builds
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "--search":
+        # Headless, so Qt is never imported
+        from interface.search.search_cli import main
+
+        sys.exit(main(sys.argv[2:]))
+
+    from PySide6.QtWidgets import QApplication
+    from interface.file_explorer_ui import FileExplorerUI
+
     app = QApplication(sys.argv)
     base_dir = os.path.dirname(os.path.abspath(__file__))
     explorer = FileExplorerUI(base_dir)
@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+
+from interface.search.query import compile_query, parse_query
+
+WORDS = [
+    "report",
+    "final",
+    "draft",
+    "IMG",
+    "data",
+    "backup",
+    "node",
+    "test",
+    "log",
+    "config",
+    "Q3",
+    "2024",
+    "v2",
+    "copy",
+]
+EXTENSIONS = [".txt", ".py", ".jpg", ".xlsx", ".log", ".json", ".md", ""]
+QUERIES = ["report", "report q3", "report q3 -draft -copy", '"final report" -v2']
+
+
+def generate_names(count: int, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "_".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        + str(rng.randint(0, 999))
+        + rng.choice(EXTENSIONS)
+        for _ in range(count)
+    ]
+
+
+def legacy_matcher(query: str):
+    # SearchThread.match_query as it was before terms were compiled
+    include_terms, exclude_terms = parse_query(query)
+
+    def match_query(name: str) -> bool:
+        name_lower = name.lower()
+        for term in exclude_terms:
+            if term in name_lower:
+                return False
+        for term in include_terms:
+            if term not in name_lower:
+                return False
+        return True
+
+    return match_query
+
+
+def time_matcher(match, names: list[str]) -> tuple[float, int]:
+    start_time = time.perf_counter()
+    matched = sum(1 for name in names if match(name))
+    return time.perf_counter() - start_time, matched
+
+
+def run(count: int):
+    names = generate_names(count)
+    print(f"{count} names")
+    for query in QUERIES:
+        legacy_time, legacy_matched = time_matcher(legacy_matcher(query), names)
+        compiled_time, compiled_matched = time_matcher(
+            compile_query(query).matches, names
+        )
+        assert legacy_matched == compiled_matched
+
+        print(
+            f"{query!r:28} {legacy_matched:8} matches  "
+            f"before {count / legacy_time / 1e6:5.2f}M names/s  "
+            f"after {count / compiled_time / 1e6:5.2f}M names/s  "
+            f"({legacy_time / compiled_time:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search name matcher benchmark")
+    parser.add_argument("--names", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.names)
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import time
+import unittest
+
+from interface.search.content_index import (
+    ContentIndex,
+    ContentIndexStats,
+    decode_ordinals,
+    encode_ordinals,
+)
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_content_index
+
+
+class TestContentIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "root")
+        os.makedirs(os.path.join(self.root, "src"))
+        self.write("src/main.py", "def Parse_Config():\n    pass\n")
+        self.write("src/util.py", "def helper():\n    return 1\n")
+        self.write("image.bin", "parse_config\0")
+        self.index = ContentIndex(os.path.join(self.temp_dir.name, "index.db"), 2)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def write(self, path: str, text: str):
+        with open(os.path.join(self.root, path), "w") as file:
+            file.write(text)
+
+    def candidates(self, query: str) -> list[str]:
+        paths = self.index.candidates(self.root, query)
+        return sorted(os.path.relpath(path, self.root) for path in paths)
+
+    def test_candidates(self):
+        stats = ContentIndexStats()
+        self.assertTrue(self.index.update(self.root, stats=stats))
+        self.assertEqual(stats.files, 3)
+        self.assertGreater(stats.index_bytes, 0)
+
+        self.assertEqual(
+            self.candidates("parse_config"), [os.path.join("src", "main.py")]
+        )
+        self.assertEqual(
+            self.candidates("def"),
+            [os.path.join("src", "main.py"), os.path.join("src", "util.py")],
+        )
+        self.assertEqual(self.candidates("missing"), [])
+        self.assertIsNone(self.index.candidates(self.root, "de"))
+
+    def test_incremental_update(self):
+        self.index.update(self.root)
+        self.write("src/util.py", "def parse_config_later():\n    pass\n")
+        future = time.time() + 10
+        os.utime(os.path.join(self.root, "src", "util.py"), (future, future))
+        os.remove(os.path.join(self.root, "src", "main.py"))
+
+        stats = ContentIndexStats()
+        self.index.update(self.root, stats=stats)
+
+        self.assertEqual((stats.indexed_files, stats.removed_files), (1, 1))
+        self.assertEqual(
+            self.candidates("parse_config"), [os.path.join("src", "util.py")]
+        )
+
+    def test_large_files_are_always_candidates(self):
+        self.index.max_file_size = 10
+        self.index.update(self.root)
+
+        self.assertIn(os.path.join("src", "util.py"), self.candidates("anything"))
+
+    def test_ordinals_round_trip(self):
+        for ordinals in ([], [0, 1, 2, 200], [5, 130, 70_000, 2**40]):
+            self.assertEqual(decode_ordinals(encode_ordinals(ordinals)), ordinals)
+
+    def test_small_segments_are_merged(self):
+        self.index.update(self.root)
+        for number in range(ContentIndex.MAX_SMALL_SEGMENTS + 1):
+            self.write(f"note{number}.txt", f"parse_config {number}\n")
+            self.index.update(self.root)
+        os.remove(os.path.join(self.root, "note0.txt"))
+        self.index.update(self.root)
+
+        segments = self.index.connection.execute("SELECT COUNT(*) FROM segments")
+        self.assertLessEqual(segments.fetchone()[0], ContentIndex.MAX_SMALL_SEGMENTS)
+        notes = [f"note{number}.txt" for number in range(1, number + 1)]
+        self.assertEqual(
+            self.candidates("parse_config"), notes + [os.path.join("src", "main.py")]
+        )
+
+    def test_stale_files(self):
+        self.index.update(self.root)
+        self.assertEqual(self.index.stale_files(self.root), [])
+
+        self.write("src/new.py", "new\n")
+        os.makedirs(os.path.join(self.root, "docs"))
+        self.write("docs/readme.txt", "read me\n")
+
+        stale = self.index.stale_files(self.root)
+        self.assertEqual(
+            sorted(os.path.relpath(path, self.root) for path in stale),
+            [os.path.join("docs", "readme.txt"), os.path.join("src", "new.py")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
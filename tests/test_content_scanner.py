@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from interface.search import content_scanner
+from interface.search.content_scanner import (
+    ContentScanner,
+    compile_content_pattern,
+    scan_file_with,
+)
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_content_scanner
+
+
+class TestContentScanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def scan(self, path: str, query: str):
+        overlap = len(query.encode("utf-8")) - 1
+        return scan_file_with(path, compile_content_pattern(query), overlap)
+
+    def test_match_is_case_insensitive(self):
+        path = self.write_file("a.txt", b"first line\nSome NEEDLE here\n")
+        self.assertTrue(self.scan(path, "needle").matched)
+        self.assertFalse(self.scan(path, "haystack").matched)
+
+    def test_match_across_chunk_boundary(self):
+        content = b"x" * (content_scanner.CHUNK_SIZE - 3) + b"needle"
+        path = self.write_file("big.log", content)
+        self.assertTrue(self.scan(path, "needle").matched)
+
+    def test_binary_files_are_skipped(self):
+        path = self.write_file("image.bin", b"\x89PNG\0\0needle")
+        self.assertFalse(self.scan(path, "needle").matched)
+
+    def test_pool_streams_matches(self):
+        paths = [
+            self.write_file("match.txt", b"needle"),
+            self.write_file("other.txt", b"nothing"),
+        ]
+        scanner = ContentScanner("needle", processes=2)
+        matches = [result.path for result in scanner.scan(paths)]
+
+        self.assertEqual(matches, [paths[0]])
+        self.assertEqual(scanner.files_scanned, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from interface.directory_listing import (
+    KIND_DIR,
+    KIND_FILE,
+    KIND_PARENT,
+    format_mtime,
+    sorted_rows,
+    sorts_before,
+)
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_directory_listing
+
+ROWS = [
+    ("b.txt", KIND_FILE),
+    ("src", KIND_DIR),
+    ("..", KIND_PARENT),
+    ("a.txt", KIND_FILE),
+    ("docs", KIND_DIR),
+    ("c.txt", KIND_FILE),
+]
+
+
+class TestDirectorySort(unittest.TestCase):
+    def order(self, descending: bool) -> list[str]:
+        kinds = [kind for _, kind in ROWS]
+        keys = [name for name, _ in ROWS]
+        return [ROWS[row][0] for row in sorted_rows(kinds, keys, descending)]
+
+    def test_ascending_keeps_folders_first(self):
+        self.assertEqual(
+            self.order(False), ["..", "docs", "src", "a.txt", "b.txt", "c.txt"]
+        )
+
+    def test_descending_keeps_folders_first(self):
+        self.assertEqual(
+            self.order(True), ["..", "src", "docs", "c.txt", "b.txt", "a.txt"]
+        )
+
+    def test_sorts_before_agrees_with_sorted_rows(self):
+        # Inserting one row at a time must give the order a full sort gives
+        for descending in (False, True):
+            rows = []
+            for name, kind in ROWS:
+                position = 0
+                while position < len(rows) and not sorts_before(
+                    kind, name, rows[position][1], rows[position][0], descending
+                ):
+                    position += 1
+                rows.insert(position, (name, kind))
+            self.assertEqual([name for name, _ in rows], self.order(descending))
+
+
+class TestFormatMtime(unittest.TestCase):
+    def test_format_mtime(self):
+        self.assertRegex(format_mtime(0), r"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d$")
+
+    def test_out_of_range_mtimes_show_no_date(self):
+        for mtime in (1e300, -1e300, float("nan")):
+            self.assertEqual(format_mtime(mtime), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from interface.search.duplicate_finder import (
+    PARTIAL_HASH_BYTES,
+    DuplicateFinder,
+    hash_file,
+    hash_partial,
+)
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_duplicate_finder
+
+
+class TestDuplicateFinder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        os.makedirs(os.path.join(self.root, "a", "b"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path: str, data: bytes) -> str:
+        path = os.path.join(self.root, path)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def find(self) -> list[list[str]]:
+        groups = DuplicateFinder([self.root], processes=2).find()
+        return [
+            [os.path.relpath(path, self.root) for path in group.paths]
+            for group in groups
+        ]
+
+    def test_small_and_large_duplicates(self):
+        large = os.urandom(3 * PARTIAL_HASH_BYTES)
+        # Same size and ends, but a different middle
+        changed = large[:PARTIAL_HASH_BYTES] + b"x" * PARTIAL_HASH_BYTES
+        changed += large[2 * PARTIAL_HASH_BYTES :]
+        self.write("large", large)
+        self.write(os.path.join("a", "b", "large copy"), large)
+        self.write(os.path.join("a", "changed"), changed)
+        self.write("small", b"hello")
+        self.write(os.path.join("a", "small copy"), b"hello")
+        self.write("other", b"hellO")
+        self.write("empty", b"")
+        self.write(os.path.join("a", "empty"), b"")
+
+        self.assertEqual(
+            self.find(),
+            [
+                [os.path.join("a", "b", "large copy"), "large"],
+                [os.path.join("a", "small copy"), "small"],
+            ],
+        )
+
+    def test_hard_links_are_not_duplicates(self):
+        path = self.write("original", b"data")
+        try:
+            os.link(path, os.path.join(self.root, "link"))
+        except OSError:
+            self.skipTest("hard links are not supported here")
+        self.assertEqual(self.find(), [])
+
+    def test_partial_hash_covers_small_files(self):
+        path = self.write("file", os.urandom(PARTIAL_HASH_BYTES + 10))
+        size = os.path.getsize(path)
+        self.assertEqual(hash_partial(path, size)[1], hash_file(path)[1])
+        self.assertEqual(hash_partial(path, size)[2], size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from interface.search.filename_index import FilenameIndex, IndexStats
+from interface.search.prune_rules import PruneRules
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_filename_index
+
+
+class TestFilenameIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "root")
+        os.makedirs(os.path.join(self.root, "docs", "old"))
+        for path in ("Report_Q3.xlsx", "docs/notes.md", "docs/old/report.txt"):
+            open(os.path.join(self.root, path), "w").close()
+        self.index = FilenameIndex(os.path.join(self.temp_dir.name, "index.db"))
+        self.index.update(self.root)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def search_names(self, root: str, terms: list[str]) -> set[str]:
+        return {entry.name for entry in self.index.search(root, terms)}
+
+    def test_search_by_substring(self):
+        self.assertEqual(
+            self.search_names(self.root, ["report"]),
+            {"Report_Q3.xlsx", "report.txt"},
+        )
+
+    def test_search_below_subdirectory(self):
+        docs = os.path.join(self.root, "docs")
+        self.assertEqual(self.search_names(docs, []), {"old", "notes.md", "report.txt"})
+        self.assertEqual(self.index.find_root(docs), self.root)
+
+    def test_search_skips_sibling_with_same_prefix(self):
+        # "docs-2024" sorts between "docs/" and "docs0" only by its prefix
+        os.makedirs(os.path.join(self.root, "docs-2024"))
+        open(os.path.join(self.root, "docs-2024", "draft.md"), "w").close()
+        self.index.update(self.root)
+        docs = os.path.join(self.root, "docs")
+        self.assertNotIn("draft.md", self.search_names(docs, []))
+        self.assertIn("draft.md", self.search_names(self.root, []))
+
+    def test_update_only_rescans_changed_directories(self):
+        os.remove(os.path.join(self.root, "docs", "notes.md"))
+        stats = IndexStats()
+        self.index.update(self.root, stats=stats)
+
+        self.assertEqual(stats.directories, 3)
+        self.assertEqual(stats.rescanned_directories, 1)
+        self.assertEqual(self.search_names(self.root, ["notes"]), set())
+
+    def test_update_skips_pruned_directories(self):
+        should_prune = PruneRules(["old"]).should_prune
+        # docs is unchanged, so old is pruned from its stored listing
+        self.index.update(self.root, should_prune=should_prune)
+        self.assertEqual(self.search_names(self.root, ["report"]), {"Report_Q3.xlsx"})
+        self.assertNotIn("old", self.search_names(self.root, []))
+
+        # and left out when docs is listed again
+        open(os.path.join(self.root, "docs", "todo.md"), "w").close()
+        stats = IndexStats()
+        self.index.update(self.root, stats=stats, should_prune=should_prune)
+        self.assertEqual(stats.rescanned_directories, 1)
+        self.assertEqual(
+            self.search_names(os.path.join(self.root, "docs"), []),
+            {"notes.md", "todo.md"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from interface import folder_size_store
+from interface.folder_size_store import FolderSizeStore, measure_folder
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_folder_size_store
+
+
+class TestFolderSizeStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "root")
+        os.makedirs(os.path.join(self.root, "a", "b"))
+        self.write_file(os.path.join(self.root, "top.txt"), 10)
+        self.write_file(os.path.join(self.root, "a", "middle.txt"), 20)
+        self.write_file(os.path.join(self.root, "a", "b", "bottom.txt"), 30)
+        self.store = FolderSizeStore(os.path.join(self.temp_dir.name, "sizes.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def write_file(self, path: str, size: int):
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+
+    def test_measures_recursive_size_and_items(self):
+        # 3 files and 2 folders below the root
+        self.assertEqual(measure_folder(self.store, self.root), (60, 5))
+
+    def test_unchanged_subtrees_are_not_rescanned(self):
+        measure_folder(self.store, self.root)
+        with mock.patch.object(
+            folder_size_store,
+            "scan_directory_totals",
+            wraps=folder_size_store.scan_directory_totals,
+        ) as scan:
+            self.assertEqual(measure_folder(self.store, self.root), (60, 5))
+            scan.assert_not_called()
+
+            # A new file changes only its own directory's mtime
+            self.write_file(os.path.join(self.root, "a", "new.txt"), 5)
+            self.assertEqual(measure_folder(self.store, self.root), (65, 6))
+            self.assertEqual(
+                [call.args[0] for call in scan.call_args_list],
+                [os.path.join(self.root, "a")],
+            )
+
+    def test_invalidate_tree_forces_rescan(self):
+        measure_folder(self.store, self.root)
+        self.store.invalidate_tree(os.path.join(self.root, "a"))
+        root_mtime = os.stat(self.root).st_mtime_ns
+        nested = os.path.join(self.root, "a", "b")
+
+        self.assertIsNotNone(self.store.get(self.root, root_mtime))
+        self.assertIsNone(self.store.get(nested, os.stat(nested).st_mtime_ns))
+
+    def test_other_devices_are_not_walked(self):
+        device = os.stat(self.root).st_dev
+        self.assertIsNone(measure_folder(self.store, self.root, device=device + 1))
+
+        nested = os.path.join(self.root, "a", "b")
+        real_stat = os.stat
+
+        def stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if path == nested:
+                # Like a share mounted on a/b
+                fields = list(result)
+                fields[2] = device + 1
+                return os.stat_result(fields)
+            return result
+
+        with mock.patch.object(folder_size_store.os, "stat", stat):
+            # b is still an item of a, but its file is not counted
+            self.assertEqual(measure_folder(self.store, self.root), (30, 4))
+
+    def test_rows_of_deleted_directories_are_dropped(self):
+        measure_folder(self.store, self.root)
+        nested = os.path.join(self.root, "a", "b")
+        nested_mtime = os.stat(nested).st_mtime_ns
+        shutil.rmtree(nested)
+
+        self.assertEqual(measure_folder(self.store, self.root), (30, 3))
+        self.assertIsNone(self.store.lookup(nested))
+        self.assertIsNone(self.store.get(nested, nested_mtime))
+
+        # Folders removed right below the folder on display
+        measure_folder(self.store, os.path.join(self.root, "a"))
+        shutil.rmtree(os.path.join(self.root, "a"))
+        self.store.remove_missing_children(self.root)
+        self.assertIsNone(self.store.lookup(os.path.join(self.root, "a")))
+        self.assertIsNotNone(self.store.lookup(self.root))
+
+    def test_stop_returns_none(self):
+        self.assertIsNone(measure_folder(self.store, self.root, lambda: True))
+
+
+if __name__ == "__main__":
+    unittest.main()
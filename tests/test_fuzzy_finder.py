@@ -0,0 +1,89 @@
+import os
+import time
+import unittest
+
+from interface.search.fuzzy_finder import FuzzyFinder, fuzzy_score
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_fuzzy_finder
+
+
+class TestFuzzyFinder(unittest.TestCase):
+    def setUp(self):
+        self.root = os.path.join(os.sep, "home", "user")
+        names = [
+            "report_Q3_final.xlsx",
+            "Reports",
+            "prototype.txt",
+            "q3_report.md",
+            "readme.txt",
+        ]
+        self.finder = FuzzyFinder(
+            (os.path.join(self.root, name), name == "Reports") for name in names
+        )
+
+    def names(self, query: str) -> list[str]:
+        return [match.name for match in self.finder.match(query)]
+
+    def test_abbreviations_match_in_order(self):
+        self.assertEqual(self.names("rptq3"), ["report_Q3_final.xlsx"])
+        self.assertEqual(self.names("RPT Q3"), ["report_Q3_final.xlsx"])
+        self.assertEqual(self.names("zz"), [])
+        self.assertEqual(self.names(""), [])
+
+    def test_word_starts_rank_higher(self):
+        self.assertEqual(self.names("q3")[0], "q3_report.md")
+        self.assertEqual(self.names("rep")[0], "Reports")
+        self.assertGreater(fuzzy_score("rf", "report_final"), fuzzy_score("rf", "rif"))
+
+    def test_candidates_need_every_character(self):
+        self.assertEqual(
+            [self.finder.names[index] for index in self.finder.candidates("x")],
+            ["readme.txt", "prototype.txt", "report_Q3_final.xlsx"],
+        )
+        self.assertEqual(
+            [self.finder.names[index] for index in self.finder.candidates("xq")],
+            ["report_Q3_final.xlsx"],
+        )
+        match = self.finder.match("reports")[0]
+        self.assertTrue(match.is_dir)
+        self.assertEqual(match.path, os.path.join(self.root, "Reports"))
+
+    def test_best_match_added_last_is_found(self):
+        paths = [
+            os.path.join(self.root, f"zzz_report{number}.txt")
+            for number in range(20_000)
+        ]
+        paths.append(os.path.join(self.root, "report.txt"))
+        finder = FuzzyFinder((path, False) for path in paths)
+
+        matches = finder.match("report", 10)
+        self.assertEqual(matches[0].name, "report.txt")
+        self.assertEqual(len(matches), 10)
+        # The rest tie on score, so the shortest names come first
+        self.assertEqual(matches[1].name, "zzz_report0.txt")
+
+    def test_broad_queries_answer_quickly_on_a_million_names(self):
+        words = ["report", "final", "draft", "config", "main", "notes", "2024"]
+        paths = [
+            os.path.join(
+                self.root,
+                f"d{number % 5000}",
+                f"{words[number % 7]}_{words[number // 7 % 7]}{number}.txt",
+            )
+            for number in range(1_000_000)
+        ]
+        finder = FuzzyFinder((path, False) for path in paths)
+        finder.prepare("rptfile")
+
+        for query in ("rpt", "file", "r"):
+            start_time = time.perf_counter()
+            matches = finder.match(query)
+            seconds = time.perf_counter() - start_time
+            self.assertEqual(len(matches), 100)
+            # A keystroke's latency; scoring every candidate took seconds
+            self.assertLess(seconds, 0.25, query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+import unittest
+
+from interface.directory_listing import KIND_FILE, DirectoryEntry
+from interface.listing_cache import ListingCache
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_listing_cache
+
+
+def make_rows(count: int) -> list[DirectoryEntry]:
+    return [DirectoryEntry(f"file{i}.txt", 0.0, 1, KIND_FILE) for i in range(count)]
+
+
+class TestListingCache(unittest.TestCase):
+    def test_listing_is_validated_by_directory_mtime(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = ListingCache(8, 1024 * 1024)
+            mtime_ns = cache.get_directory_mtime(path)
+            rows = make_rows(2)
+            cache.put(path, mtime_ns, rows)
+            self.assertIs(cache.get(path, cache.get_directory_mtime(path)), rows)
+            self.assertTrue(cache.contains(path, mtime_ns))
+
+            open(os.path.join(path, "new.txt"), "w").close()
+            future = time.time() + 10
+            os.utime(path, (future, future))
+            self.assertIsNone(cache.get(path, cache.get_directory_mtime(path)))
+            # A stale listing is dropped, not kept for the old mtime
+            self.assertFalse(cache.contains(path, mtime_ns))
+            self.assertEqual(cache.get_stats()["hits"], 1)
+            self.assertEqual(cache.get_stats()["misses"], 1)
+
+    def test_missing_directory_is_never_cached(self):
+        cache = ListingCache(8, 1024 * 1024)
+        mtime_ns = cache.get_directory_mtime("/no/such/directory")
+        self.assertIsNone(mtime_ns)
+        cache.put("/no/such/directory", mtime_ns, make_rows(1))
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    def test_least_recently_used_listing_is_evicted_at_max_entries(self):
+        cache = ListingCache(2, 1024 * 1024)
+        cache.put("a", 1, make_rows(1))
+        cache.put("b", 1, make_rows(1))
+        cache.get("a", 1)
+        cache.put("c", 1, make_rows(1))
+
+        self.assertEqual([path for path, _ in cache.snapshot()], ["c", "a"])
+        self.assertIsNone(cache.get("b", 1))
+
+    def test_listings_are_evicted_at_max_bytes(self):
+        rows = make_rows(100)
+        size = ListingCache(1, 1).estimate_size(rows)
+        cache = ListingCache(100, size * 2)
+        for path in ("a", "b", "c"):
+            cache.put(path, 1, list(rows))
+
+        self.assertEqual([path for path, _ in cache.snapshot()], ["c", "b"])
+        self.assertLessEqual(cache.get_stats()["bytes"], size * 2)
+
+        # A listing larger than the whole cache is not stored at all
+        cache.put("huge", 1, make_rows(1000))
+        self.assertFalse(cache.contains("huge", 1))
+        self.assertEqual(len(cache.snapshot()), 2)
+
+    def test_replacing_a_listing_keeps_the_byte_count(self):
+        cache = ListingCache(8, 1024 * 1024)
+        cache.put("a", 1, make_rows(10))
+        cache.put("a", 2, make_rows(1))
+        cache.invalidate("missing")
+
+        self.assertEqual(cache.get_stats()["bytes"], cache.estimate_size(make_rows(1)))
+        cache.invalidate("a")
+        self.assertEqual(cache.get_stats()["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from interface.name_filter import NameFilter, compile_name_filter
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_name_filter
+
+NAMES = ["report.txt", "annual report.pdf", "notes.md", "report_old.txt"]
+
+
+class TestNameFilter(unittest.TestCase):
+    def mask(self, text: str) -> list[bool]:
+        return NameFilter(text).mask(NAMES)
+
+    def test_substring(self):
+        name_filter = NameFilter("REPORT")
+        self.assertEqual(name_filter.mode, "substring")
+        self.assertEqual(self.mask("REPORT"), [True, True, False, True])
+        self.assertTrue(name_filter.matches("my report.txt"))
+
+    def test_glob_matches_the_whole_name(self):
+        name_filter = NameFilter("*.TXT")
+        self.assertEqual(name_filter.mode, "glob")
+        self.assertEqual(self.mask("*.TXT"), [True, False, False, True])
+        self.assertEqual(self.mask("report?txt"), [True, False, False, False])
+        self.assertEqual(self.mask("[an]*"), [False, True, True, False])
+
+    def test_regex_searches_anywhere(self):
+        self.assertEqual(NameFilter("re:^rep").mode, "regex")
+        self.assertEqual(self.mask("re:^rep"), [True, False, False, True])
+        self.assertEqual(self.mask(r"re:\.(TXT|md)$"), [True, False, True, True])
+
+    def test_mask_agrees_with_matches(self):
+        for text in ("rep", "*.txt", "re:o.d"):
+            name_filter = NameFilter(text)
+            self.assertEqual(
+                name_filter.mask(NAMES), [name_filter.matches(n) for n in NAMES]
+            )
+
+    def test_invalid_regex(self):
+        self.assertIsNone(compile_name_filter("re:("))
+        self.assertIsNone(compile_name_filter(""))
+
+    def test_refines(self):
+        self.assertTrue(NameFilter("rep").refines(None))
+        # Typing more of a substring only narrows the previous matches
+        self.assertTrue(NameFilter("report").refines(NameFilter("rep")))
+        self.assertTrue(NameFilter("port_o").refines(NameFilter("port")))
+        self.assertFalse(NameFilter("rep").refines(NameFilter("report")))
+        self.assertFalse(NameFilter("note").refines(NameFilter("rep")))
+        # Globs and regexes can widen as they grow, so only reuse when equal
+        self.assertFalse(NameFilter("*.txt*").refines(NameFilter("*.txt")))
+        self.assertTrue(NameFilter("*.txt").refines(NameFilter("*.txt")))
+        self.assertFalse(NameFilter("re:a|b").refines(NameFilter("re:a")))
+        self.assertFalse(NameFilter("*.txt").refines(NameFilter(".txt")))
+
+    def test_refined_mask_of_previous_matches_equals_full_mask(self):
+        previous = NameFilter("rep")
+        current = NameFilter("report_")
+        self.assertTrue(current.refines(previous))
+        kept = [name for name in NAMES if previous.matches(name)]
+        self.assertEqual(
+            [name for name, hit in zip(kept, current.mask(kept)) if hit],
+            [name for name, hit in zip(NAMES, current.mask(NAMES)) if hit],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
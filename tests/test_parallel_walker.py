@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from interface.search.parallel_walker import ParallelWalker
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_parallel_walker
+
+
+class TestParallelWalker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        for directory in ("a/b/c", "a/node_modules/pkg", "d"):
+            os.makedirs(os.path.join(self.root, directory))
+        for path in ("top.txt", "a/b/c/deep.txt", "a/node_modules/pkg/index.js"):
+            open(os.path.join(self.root, path), "w").close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def walk_files(self, walker: ParallelWalker) -> set[str]:
+        return {
+            os.path.relpath(entry.path, self.root)
+            for _, _, files in walker.walk()
+            for entry in files
+        }
+
+    def test_matches_os_walk(self):
+        expected = {
+            os.path.relpath(os.path.join(root, name), self.root)
+            for root, _, files in os.walk(self.root)
+            for name in files
+        }
+        walker = ParallelWalker([self.root], workers=4)
+
+        self.assertEqual(self.walk_files(walker), expected)
+        self.assertEqual(walker.stats.directories, 7)
+
+    def test_prune(self):
+        walker = ParallelWalker(
+            [self.root], should_prune=lambda _, entry: entry.name == "node_modules"
+        )
+
+        self.assertNotIn(
+            os.path.join("a", "node_modules", "pkg", "index.js"),
+            self.walk_files(walker),
+        )
+        self.assertEqual(walker.stats.pruned, 1)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_loop_is_walked_once(self):
+        try:
+            os.symlink(self.root, os.path.join(self.root, "d", "loop"))
+        except OSError:
+            self.skipTest("symlinks not permitted")
+        walker = ParallelWalker([self.root], follow_symlinks=True)
+
+        self.assertIn("top.txt", self.walk_files(walker))
+        self.assertEqual(walker.stats.loops, 1)
+
+    def test_seeded_walk_visits_each_directory_once(self):
+        first = ParallelWalker([self.root])
+        files = self.walk_files(first)
+        walker = ParallelWalker([self.root], seed_directories=first.walked_directories)
+
+        self.assertEqual(self.walk_files(walker), files)
+        self.assertEqual(walker.stats.directories, 7)
+
+    def test_stop(self):
+        walker = ParallelWalker([self.root])
+        results = list(walker.walk(lambda: True))
+        self.assertEqual(results, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from interface.search.parallel_walker import ParallelWalker
+from interface.search.prune_rules import (
+    PruneRules,
+    parse_root_overrides,
+    split_patterns,
+)
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_prune_rules
+
+
+class TestPruneRules(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        for directory in (
+            "repo/.git",
+            "repo/src/node_modules/pkg",
+            "repo/src/build",
+            "repo/dist",
+            "repo/docs/dist",
+            "repo/keep.cache",
+            "other/x.cache",
+        ):
+            os.makedirs(os.path.join(self.root, directory))
+        with open(os.path.join(self.root, "repo", ".gitignore"), "w") as file:
+            file.write("# output\nbuild/\n/dist\n*.cache\n!keep.cache\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def walk(self, prune_rules: PruneRules) -> tuple[set[str], int]:
+        walker = ParallelWalker([self.root], should_prune=prune_rules.should_prune)
+        walked = {
+            os.path.relpath(path, self.root).replace(os.sep, "/")
+            for path, _, _ in walker.walk()
+        }
+        return walked, walker.stats.pruned
+
+    def test_ignore_patterns(self):
+        walked, pruned = self.walk(PruneRules(split_patterns("node_modules, *.cache")))
+
+        self.assertNotIn("repo/src/node_modules", walked)
+        self.assertNotIn("other/x.cache", walked)
+        self.assertIn("repo/src/build", walked)
+        self.assertEqual(pruned, 3)
+
+    def test_gitignore(self):
+        walked, _ = self.walk(PruneRules(split_patterns(".git"), use_gitignore=True))
+
+        self.assertNotIn("repo/src/build", walked)
+        self.assertNotIn("repo/dist", walked)
+        self.assertIn("repo/docs/dist", walked)  # /dist is anchored
+        self.assertIn("repo/keep.cache", walked)  # Re-included
+        self.assertIn("other/x.cache", walked)  # Outside the repository
+
+    def test_gitignore_outside_repository(self):
+        # Like a ~/.gitignore above the searched folders
+        with open(os.path.join(self.root, ".gitignore"), "w") as file:
+            file.write("other\n")
+        walked, _ = self.walk(PruneRules([], use_gitignore=True))
+
+        self.assertIn("other/x.cache", walked)
+        self.assertNotIn("repo/src/build", walked)
+
+    def test_root_override(self):
+        overrides = parse_root_overrides(f"{os.path.join(self.root, 'repo')} =")
+        prune_rules = PruneRules(split_patterns("node_modules"), False, overrides)
+        walked, _ = self.walk(prune_rules)
+
+        self.assertIn("repo/src/node_modules", walked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+from interface.search.ranking import RelevanceScorer, TopResults
+from interface.search.search_result import SearchResult
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_ranking
+
+
+class TestRanking(unittest.TestCase):
+    def setUp(self):
+        self.now = 1_000_000_000
+        self.root = os.path.join(os.sep, "home", "user")
+        self.scorer = RelevanceScorer(["report"], self.now)
+
+    def score(self, *parts: str, age: float = 0) -> float:
+        path = os.path.join(self.root, *parts)
+        return self.scorer.score(parts[-1], path, self.now - age, self.root)
+
+    def test_exact_before_prefix_before_substring(self):
+        exact = self.score("Report.pdf")
+        prefix = self.score("report_2024.pdf")
+        substring = self.score("annual_report.pdf")
+
+        self.assertGreater(exact, prefix)
+        self.assertGreater(prefix, substring)
+
+    def test_shallow_and_recent_break_ties(self):
+        self.assertGreater(self.score("report.pdf"), self.score("a", "b", "report.pdf"))
+        self.assertGreater(
+            self.score("report.pdf"), self.score("report.pdf", age=365 * 86400)
+        )
+
+    def test_top_results_keeps_best(self):
+        top_results = TopResults(2)
+        for score, name in ((10, "a"), (60, "b"), (30, "c"), (5, "d")):
+            top_results.push(score, SearchResult(name, name, False, 0, 0))
+
+        self.assertEqual([result.name for result in top_results.results()], ["b", "c"])
+        self.assertFalse(top_results.is_full_of_strong_matches())
+        top_results.push(70, SearchResult("e", "e", False, 0, 0))
+        self.assertTrue(top_results.is_full_of_strong_matches())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import time
+import unittest
+
+from interface.search.content_index import ContentIndex
+from interface.search.query import SearchQuery
+from interface.search.search_engine import SearchEngine
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_search_engine
+
+
+class TestSearchEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        os.makedirs(os.path.join(self.root, "reports", "old"))
+        for path in ("report.txt", "reports/q3_report.md", "reports/old/notes.txt"):
+            with open(os.path.join(self.root, path), "w") as file:
+                file.write("quarterly numbers\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def search(self, query: str, content_query: str = "", **options) -> list[str]:
+        found = []
+        engine = SearchEngine(
+            [self.root],
+            SearchQuery(query),
+            content_query,
+            on_results=lambda results: found.extend(results),
+            on_ranking=lambda results: found.__setitem__(slice(None), results),
+            **options,
+        )
+        engine.run()
+        self.assertTrue(engine.completed)
+        return [os.path.relpath(result.path, self.root) for result in found]
+
+    def test_name_search(self):
+        self.assertEqual(
+            sorted(self.search("report")),
+            sorted(["report.txt", "reports", os.path.join("reports", "q3_report.md")]),
+        )
+        self.assertEqual(
+            self.search("report type:file ext:md"),
+            [os.path.join("reports", "q3_report.md")],
+        )
+
+    def test_match_time_is_part_of_processing(self):
+        engine = SearchEngine([self.root], SearchQuery("report"), "")
+        engine.run()
+
+        search_stats = engine.search_stats
+        self.assertEqual(search_stats.matches, 3)
+        self.assertGreater(search_stats.match_time, 0)
+        self.assertLessEqual(search_stats.match_time, search_stats.process_time)
+
+    def test_new_files_below_old_directories_are_found(self):
+        # Adding old/sub/new_report.txt does not change old's mtime
+        sub = os.path.join(self.root, "reports", "old", "sub")
+        os.makedirs(sub)
+        open(os.path.join(sub, "new_report.txt"), "w").close()
+        month_ago = time.time() - 30 * 86400
+        old = os.path.join(self.root, "reports", "old")
+        os.utime(old, (month_ago, month_ago))
+        os.utime(os.path.join(old, "notes.txt"), (month_ago, month_ago))
+
+        self.assertIn(
+            os.path.join("reports", "old", "sub", "new_report.txt"),
+            self.search("report modified:<7d"),
+        )
+
+    def test_nested_roots_are_searched_once(self):
+        found = []
+        engine = SearchEngine(
+            [os.path.join(self.root, "reports"), self.root],
+            SearchQuery("report"),
+            "",
+            on_results=found.extend,
+        )
+        engine.run()
+
+        self.assertEqual(engine.roots, [self.root])
+        self.assertEqual(len(found), 3)
+        self.assertEqual({result.root for result in found}, {self.root})
+
+    def test_ranked_search(self):
+        self.assertEqual(self.search("report", top_k=1), ["report.txt"])
+
+    def test_content_search(self):
+        self.assertEqual(
+            sorted(self.search("ext:txt", "quarterly")),
+            sorted(["report.txt", os.path.join("reports", "old", "notes.txt")]),
+        )
+
+    def test_content_index_misses_no_new_or_changed_files(self):
+        with tempfile.TemporaryDirectory() as index_dir:
+            content_index = ContentIndex(os.path.join(index_dir, "index.db"), 1)
+            content_index.update(self.root)
+            with open(os.path.join(self.root, "new.txt"), "w") as file:
+                file.write("quarterly too\n")
+            with open(os.path.join(self.root, "report.txt"), "w") as file:
+                file.write("annual numbers\n")
+
+            found = self.search("ext:txt", "quarterly", content_index=content_index)
+
+        self.assertEqual(
+            sorted(found),
+            sorted(["new.txt", os.path.join("reports", "old", "notes.txt")]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from interface.search.query import SearchQuery, compile_query, parse_query
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_search_query
+
+
+class TestSearchQuery(unittest.TestCase):
+    def test_parse_query(self):
+        self.assertEqual(
+            parse_query('Report "final draft" -copy -"old version"'),
+            (["report", "final draft"], ["copy", "old version"]),
+        )
+
+    def test_matcher(self):
+        cases = {
+            "": ["anything.txt"],
+            "report": ["Report_Q3.xlsx", "annual-report.pdf"],
+            "report q3": ["q3_REPORT.txt"],
+            "report q3 -draft": ["report_q3.txt"],
+            "-tmp -bak": ["notes.md"],
+        }
+        rejected = {
+            "report": ["summary.txt"],
+            "report q3": ["report_q4.txt"],
+            "report q3 -draft": ["report_q3_DRAFT.txt"],
+            "-tmp -bak": ["notes.tmp", "notes.bak"],
+        }
+        for query, names in cases.items():
+            matcher = compile_query(query)
+            for name in names:
+                self.assertTrue(matcher.matches(name), (query, name))
+        for query, names in rejected.items():
+            matcher = compile_query(query)
+            for name in names:
+                self.assertFalse(matcher.matches(name), (query, name))
+
+    def test_exclude_terms_are_literal(self):
+        matcher = compile_query("-a.b")
+        self.assertTrue(matcher.matches("axb"))
+        self.assertFalse(matcher.matches("a.b"))
+
+    def test_predicates(self):
+        now = 1_000_000_000
+        query = SearchQuery("big log size:>100MB modified:<7d ext:log,txt", now)
+        metadata_filter = query.metadata_filter
+
+        self.assertEqual(query.include_terms, ["big", "log"])
+        self.assertEqual(metadata_filter.extensions, {"log", "txt"})
+        self.assertEqual(metadata_filter.min_size, 100 * 1024**2 + 1)
+        self.assertEqual(metadata_filter.min_mtime, now - 7 * 86400)
+        self.assertTrue(metadata_filter.accepts("a.LOG", False, 200 * 1024**2, now))
+        self.assertFalse(metadata_filter.accepts("a.log", False, 1024, now))
+        self.assertFalse(metadata_filter.accepts("a.log", True, 200 * 1024**2, now))
+        self.assertFalse(metadata_filter.accepts("a.csv", False, 200 * 1024**2, now))
+
+    def test_type_predicate(self):
+        metadata_filter = SearchQuery("type:dir").metadata_filter
+        self.assertTrue(metadata_filter.accepts_kind(True))
+        self.assertFalse(metadata_filter.accepts_kind(False))
+
+    def test_predicates_inside_quotes_are_terms(self):
+        query = SearchQuery('"notes size:big" ext:md')
+        self.assertEqual(query.include_terms, ["notes size:big"])
+
+    def test_refines(self):
+        def refines(query, previous):
+            return SearchQuery(query, 0).refines(SearchQuery(previous, 0))
+
+        self.assertTrue(refines("report", "rep"))
+        self.assertTrue(refines("report q3", "report"))
+        self.assertTrue(refines("report -draft", "report -drafts"))
+        self.assertTrue(refines("report ext:pdf", "report ext:pdf,txt"))
+        self.assertTrue(refines("log size:>10MB", "log size:>1MB"))
+        self.assertFalse(refines("rep", "report"))
+        self.assertFalse(refines("report", "report -draft"))
+        self.assertFalse(refines("report ext:pdf,txt", "report ext:pdf"))
+        self.assertFalse(refines("log size:>1MB", "log size:>10MB"))
+
+    def test_invalid_predicate(self):
+        with self.assertRaises(ValueError):
+            SearchQuery("size:huge")
+
+
+if __name__ == "__main__":
+    unittest.main()
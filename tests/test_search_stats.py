@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from interface.search.parallel_walker import ParallelWalker
+from interface.search.search_stats import SearchStats, format_bytes
+
+# HOW TO RUN TESTS:
+# python -m unittest tests.test_search_stats
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_summary(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "a"))
+            open(os.path.join(root, "a", "file.txt"), "w").close()
+            walker = ParallelWalker([root])
+            search_stats = SearchStats(walker)
+            for _ in walker.walk():
+                search_stats.matches += 1
+            search_stats.finish()
+
+        summary = search_stats.summary()
+        self.assertEqual(summary["mode"], "walk")
+        self.assertEqual(summary["directories"], 2)
+        self.assertEqual(summary["files"], 1)
+        self.assertEqual(summary["bytes_scanned"], 0)
+        self.assertIn("2 results", search_stats.status_text())
+
+    def test_format_bytes(self):
+        self.assertEqual(format_bytes(512), "512 B")
+        self.assertEqual(format_bytes(1536), "1.5 KB")
+        self.assertEqual(format_bytes(3 * 1024**3), "3.0 GB")
+
+
+if __name__ == "__main__":
+    unittest.main()